@@ -0,0 +1,158 @@
+"""Measure how a flooding terminal delays its quiet siblings.
+
+Runs one Terminal fed a continuous coloured-text flood alongside several
+quiet terminals that each receive a short line every 50 ms, all on one
+event loop. Reports how long the quiet terminals take from output arriving
+to the frame being rendered, the worst 1 ms ticker stall, and the flood
+throughput, once with ``turn_budget=None`` and once with the
+``DEFAULT_TURN_BUDGET`` deficit round-robin budget. The noisy terminal's turn statistics are
+printed for tuning.
+
+Usage: python scripts/bench_fairness.py [--seconds 3] [--quiet 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Coroutine
+from pathlib import Path
+from typing import Any
+
+import pyte
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from textual_term._config import TerminalConfig  # noqa: E402
+from textual_term._queue import OutputQueue  # noqa: E402
+from textual_term._scheduler import DEFAULT_TURN_BUDGET  # noqa: E402
+from textual_term._screen import ResponsiveScreen  # noqa: E402
+from textual_term._widget import Terminal  # noqa: E402
+
+CHUNK = b"".join(
+    f"\x1b[3{i % 8}mline {i:05d} ".encode() + b"x" * 60 + b"\x1b[0m\r\n" for i in range(800)
+)
+
+
+class QueueEmulator:
+    """Stand-in for PtyEmulator that only exposes an output queue."""
+
+    def __init__(self, budget: int) -> None:
+        self.output_queue = OutputQueue(budget)
+
+    def write_to_pty(self, data: str) -> None:
+        """Discard DSR responses."""
+
+
+def build_terminal(
+    config: TerminalConfig,
+) -> tuple[Terminal, QueueEmulator, Coroutine[Any, Any, None]]:
+    """Wire a Terminal to a queue emulator the way its connection does, with its pump loop."""
+    emulator = QueueEmulator(config.output_budget)
+    terminal = Terminal(command="/bin/true", config=config)
+    terminal.refresh = lambda *args, **kwargs: terminal  # type: ignore[method-assign]
+    screen = ResponsiveScreen(120, 40, write_callback=emulator.write_to_pty)
+    loop = terminal._pump.run(emulator, pyte.ByteStream(screen), screen)  # type: ignore[arg-type]
+    return terminal, emulator, loop
+
+
+async def flood(emulator: QueueEmulator, seconds: float) -> int:
+    """Keep the noisy terminal's queue at its budget. Returns bytes sent."""
+    sent = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if emulator.output_queue.over_budget:
+            await asyncio.sleep(0.001)
+            continue
+        emulator.output_queue.put_nowait(["stdout", CHUNK])
+        sent += len(CHUNK)
+    emulator.output_queue.put_nowait(["disconnect", 1])
+    return sent
+
+
+async def trickle(
+    terminal: Terminal, emulator: QueueEmulator, seconds: float, latencies: list[float]
+) -> None:
+    """Send a line every 50 ms and record how long each takes to be rendered."""
+    rendered = asyncio.Event()
+    render = terminal._pump.render_frame
+
+    def render_and_signal(screen: ResponsiveScreen) -> None:
+        render(screen)
+        rendered.set()
+
+    terminal._pump.render_frame = render_and_signal  # type: ignore[method-assign]
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        rendered.clear()
+        sent = time.perf_counter()
+        emulator.output_queue.put_nowait(["stdout", b"tick\r\n"])
+        await rendered.wait()
+        latencies.append((time.perf_counter() - sent) * 1000)
+        await asyncio.sleep(0.05)
+    emulator.output_queue.put_nowait(["disconnect", 1])
+
+
+async def tick(stalls: list[float], stop: asyncio.Event) -> None:
+    """Record how late a 1 ms sleep wakes up."""
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append((time.perf_counter() - before - 0.001) * 1000)
+
+
+async def run(turn_budget: float | None, seconds: float, quiet: int) -> None:
+    config = TerminalConfig(turn_budget=turn_budget)
+    noisy, noisy_emulator, noisy_loop = build_terminal(config)
+    quiet_terminals = [build_terminal(config) for _ in range(quiet)]
+    latencies: list[float] = []
+    stalls: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(tick(stalls, stop))
+    loops = [asyncio.create_task(loop) for _, _, loop in quiet_terminals]
+    loops.append(asyncio.create_task(noisy_loop))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        flood(noisy_emulator, seconds),
+        *(
+            trickle(terminal, emulator, seconds, latencies)
+            for terminal, emulator, _ in quiet_terminals
+        ),
+    )
+    await asyncio.gather(*loops)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    p99 = (
+        statistics.quantiles(latencies, n=100, method="inclusive")[98]
+        if len(latencies) > 1
+        else 0.0
+    )
+    label = "off" if turn_budget is None else f"{turn_budget * 1000:g} ms"
+    print(
+        f"turn budget {label:<7} flood {results[0] / elapsed / 1e6:>6.1f} MB/s"
+        f"  quiet render p50 {statistics.median(latencies):>7.1f} ms  p99 {p99:>7.1f} ms"
+        f"  max stall {max(stalls, default=0.0):>7.1f} ms"
+    )
+    stats = noisy.turn_stats
+    if stats is not None:
+        print(
+            f"  noisy: {stats.turns} turns, {stats.busy_seconds:.2f} s busy,"
+            f" {stats.wait_seconds:.2f} s waiting (max {stats.max_wait_seconds * 1000:.1f} ms)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--quiet", type=int, default=4)
+    args = parser.parse_args()
+    for turn_budget in (None, DEFAULT_TURN_BUDGET):
+        asyncio.run(run(turn_budget, args.seconds, args.quiet))
+
+
+if __name__ == "__main__":
+    main()
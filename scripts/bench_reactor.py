@@ -0,0 +1,123 @@
+"""Measure how whole terminals scale with their number, per fd and on the shared reactor.
+
+Starts N terminal connections whose child prints 80-column lines at a fixed
+rate (4 KB/s by default), and once every child is printing, parses and
+renders their output into a headless pump for a few seconds. It runs once
+with every PTY registered on the event loop and a pump task per terminal,
+and once on the shared ``PtyReactor``, where output is handed on from the
+reactor's callbacks. For each terminal count it prints the bytes parsed
+per second, the process CPU time as a share of wall time, the tasks the
+terminals added to the loop, and the worst and 99th percentile delay of a
+1 ms ticker task.
+
+Usage: python scripts/bench_reactor.py [--seconds 3] [--terminals 1 10 40 80] [--rate-kb 4]
+                                         [--max-fps 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from textual_term._config import DEFAULT_MAX_FPS, TerminalConfig  # noqa: E402
+from textual_term._connection import TerminalConnection  # noqa: E402
+from textual_term._metrics import TerminalMetrics  # noqa: E402
+from textual_term._pump import OutputPump  # noqa: E402
+from textual_term._scrollback import Scrollback  # noqa: E402
+
+PRODUCER = """#!{python}
+import os, time
+line = b"x" * 79 + b"\\n"
+interval = len(line) / {rate}
+due = time.monotonic()
+while True:
+    os.write(1, line)
+    due += interval
+    time.sleep(max(0.0, due - time.monotonic()))
+"""
+
+
+def producer(rate: float) -> str:
+    """Write an executable that prints lines at rate bytes per second and return its path."""
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as script:
+        script.write(PRODUCER.format(python=sys.executable, rate=rate))
+    os.chmod(script.name, 0o755)
+    return script.name
+
+
+async def tick(stalls: list[float], stop: asyncio.Event) -> None:
+    """Record how late a 1 ms sleep wakes up."""
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append((time.perf_counter() - before - 0.001) * 1000)
+
+
+def connect(command: str, config: TerminalConfig) -> tuple[TerminalConnection, TerminalMetrics]:
+    """Start a connection running command whose frames are rendered and dropped."""
+    metrics = TerminalMetrics()
+    pump = OutputPump(config, metrics, lambda _lines, _cursor: None, object())
+    connection = TerminalConnection(command, 24, 80, config, Scrollback(1000), pump)
+    connection.start()
+    return connection, metrics
+
+
+async def run(command: str, count: int, shared: bool, seconds: float, max_fps: float) -> None:
+    config = TerminalConfig(
+        shared_reactor=shared, compact_screen=True, turn_budget=None, max_fps=max_fps
+    )
+    baseline = len(asyncio.all_tasks())
+    terminals = [connect(command, config) for _ in range(count)]
+    tasks = len(asyncio.all_tasks()) - baseline
+    while not all(metrics.bytes_parsed for _connection, metrics in terminals):
+        await asyncio.sleep(0.1)
+    parsed = sum(metrics.bytes_parsed for _connection, metrics in terminals)
+    frames = sum(metrics.frames_rendered for _connection, metrics in terminals)
+    stalls: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(tick(stalls, stop))
+    start, cpu = time.perf_counter(), time.process_time()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    busy = (time.process_time() - cpu) / elapsed
+    parsed = sum(metrics.bytes_parsed for _connection, metrics in terminals) - parsed
+    frames = sum(metrics.frames_rendered for _connection, metrics in terminals) - frames
+    stop.set()
+    await ticker
+    for connection, _metrics in terminals:
+        connection.stop()
+    p99 = statistics.quantiles(stalls, n=100, method="inclusive")[98] if len(stalls) > 1 else 0.0
+    mode = "reactor" if shared else "per-fd"
+    print(
+        f"{count:>4} x {mode:<8} {parsed / elapsed / 1e6:>6.2f} MB/s parsed"
+        f"  {frames / count / elapsed:>5.1f} fps/term  CPU {busy:>4.0%}  {tasks:>3} tasks"
+        f"  max stall {max(stalls, default=0.0):>7.1f} ms  p99 {p99:>6.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--terminals", type=int, nargs="+", default=[1, 10, 40, 80])
+    parser.add_argument("--rate-kb", type=float, default=4.0, help="output per terminal, KB/s")
+    parser.add_argument("--max-fps", type=float, default=DEFAULT_MAX_FPS)
+    args = parser.parse_args()
+    command = producer(args.rate_kb * 1024)
+    try:
+        for count in args.terminals:
+            for shared in (False, True):
+                asyncio.run(run(command, count, shared, args.seconds, args.max_fps))
+    finally:
+        os.unlink(command)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark run-length span coalescing in the screen renderer.
+
+Feeds synthetic ``ls --color`` and ``git log --graph`` output into a pyte
+screen, then renders every line both one segment per cell (the previous
+renderer) and with coalesced runs (``_render_line``). Prints segment counts
+and milliseconds per full-screen frame for each corpus.
+
+Usage: python scripts/bench_render.py [--columns 200] [--lines 60] [--frames 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pyte
+from rich.segment import Segment
+from textual.strip import Strip
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from textual_term._renderer import _char_to_style, _render_line  # noqa: E402
+
+LS_COLORS = ("\x1b[01;34m", "\x1b[01;32m", "\x1b[01;36m", "\x1b[0m", "\x1b[01;31m", "\x1b[01;35m")
+GRAPH_COLORS = ("\x1b[31m", "\x1b[32m", "\x1b[33m", "\x1b[34m", "\x1b[35m", "\x1b[36m")
+REF_DECORATION_RATE = 0.1  # share of git log lines decorated with a ref name
+
+
+def ls_color_corpus(lines: int, columns: int) -> str:
+    """Return synthetic ``ls --color`` output filling the screen."""
+    rng = random.Random(1)
+    rows = []
+    for _ in range(lines):
+        row = []
+        width = 0
+        while width + 20 < columns:
+            name = "".join(rng.choice("abcdefghijklmnop_.") for _ in range(rng.randint(4, 16)))
+            row.append(f"{rng.choice(LS_COLORS)}{name}\x1b[0m".ljust(len(name) + 18))
+            width += 20
+        rows.append("  ".join(row))
+    return "\r\n".join(rows)
+
+
+def git_graph_corpus(lines: int, columns: int) -> str:
+    """Return synthetic ``git log --graph --oneline --decorate`` output."""
+    rng = random.Random(2)
+    rows = []
+    for _ in range(lines):
+        graph = " ".join(
+            f"{rng.choice(GRAPH_COLORS)}{rng.choice('*|/')}\x1b[m" for _ in range(rng.randint(1, 4))
+        )
+        sha = "".join(rng.choice("0123456789abcdef") for _ in range(7))
+        ref = (
+            "\x1b[33m(\x1b[1;36mHEAD -> \x1b[1;32mmain\x1b[33m)\x1b[m "
+            if rng.random() < REF_DECORATION_RATE
+            else ""
+        )
+        subject = " ".join(
+            rng.choice(("fix", "add", "render", "screen", "pty", "cache")) for _ in range(8)
+        )
+        rows.append(f"{graph} \x1b[33m{sha}\x1b[m {ref}{subject}"[: columns * 2])
+    return "\r\n".join(rows)
+
+
+def render_line_per_cell(line: dict, columns: int) -> Strip:
+    """Reference renderer that emits one segment per cell."""
+    segments = []
+    for x in range(columns):
+        char = line.get(x)
+        segments.append(Segment(" ") if char is None else Segment(char.data, _char_to_style(char)))
+    return Strip(segments)
+
+
+def measure(screen: pyte.Screen, render: Callable[..., Strip], frames: int) -> tuple[int, float]:
+    """Return (segments per frame, milliseconds per frame) for a full-screen render."""
+    segments = sum(len(list(render(screen.buffer[y], screen.columns))) for y in range(screen.lines))
+    start = time.perf_counter()
+    for _ in range(frames):
+        for y in range(screen.lines):
+            render(screen.buffer[y], screen.columns)
+    elapsed = time.perf_counter() - start
+    return segments, elapsed * 1000 / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=60)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    corpora = {"ls --color": ls_color_corpus, "git log --graph": git_graph_corpus}
+    print(f"{'corpus':<16} {'renderer':<10} {'segments/frame':>15} {'ms/frame':>10}")
+    for label, build in corpora.items():
+        screen = pyte.Screen(args.columns, args.lines)
+        pyte.Stream(screen).feed(build(args.lines, args.columns))
+        for name, render in (("per-cell", render_line_per_cell), ("coalesced", _render_line)):
+            segments, ms = measure(screen, render, args.frames)
+            print(f"{label:<16} {name:<10} {segments:>15} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure replay throughput and keyframe seek latency.
+
+Replays a recording as fast as possible, then times random seeks with
+keyframes and without (every seek re-parsing from the start). Uses the
+given asciicast file, or a synthetic recording of coloured log lines at
+about 55 lines a second.
+
+Usage: python scripts/bench_replay.py [--cast session.cast] [--minutes 10] [--seeks 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from textual_term._replay import Recording, ReplayEngine, load_cast  # noqa: E402
+
+
+def synthetic(minutes: float) -> Recording:
+    """One coloured log line every 18 ms on a 120x40 screen."""
+    recording = Recording(120, 40)
+    count = int(minutes * 60 / 0.018)
+    for index in range(count):
+        recording.times.append(index * 0.018)
+        recording.events.append(
+            f"\x1b[3{index % 8}m{index:07d}\x1b[0m ".encode() + b"x" * 60 + b"\r\n"
+        )
+    return recording
+
+
+def time_seeks(engine: ReplayEngine, targets: list[float]) -> list[float]:
+    """Return the milliseconds each seek took."""
+    times = []
+    for target in targets:
+        start = time.perf_counter()
+        engine.seek(target)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cast")
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--seeks", type=int, default=10)
+    args = parser.parse_args()
+    recording = load_cast(args.cast) if args.cast else synthetic(args.minutes)
+    size = sum(len(event) for event in recording.events if isinstance(event, bytes))
+    print(f"recording: {recording.duration / 60:.1f} min, {size / 1e6:.1f} MB")
+
+    engine = ReplayEngine(recording)
+    start = time.perf_counter()
+    engine.build_keyframes()
+    elapsed = time.perf_counter() - start
+    print(
+        f"full replay + keyframes {elapsed:>7.2f} s  {size / elapsed / 1e6:>6.1f} MB/s"
+        f"  {recording.duration / elapsed:>7.0f}x realtime  {engine.keyframe_count} keyframes"
+    )
+
+    rng = random.Random(0)
+    targets = [rng.uniform(0, recording.duration) for _ in range(args.seeks)]
+    for label, interval in (("keyframes", engine.keyframes.interval), ("from start", math.inf)):
+        seeker = (
+            engine if interval != math.inf else ReplayEngine(recording, keyframe_interval=interval)
+        )
+        times = time_seeks(seeker, targets)
+        print(
+            f"seek {label:<10} median {statistics.median(times):>9.1f} ms  max {max(times):>9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
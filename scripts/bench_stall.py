@@ -0,0 +1,122 @@
+"""Measure event-loop stall time while a Terminal ingests an output flood.
+
+Drives a Terminal's output pump with a synthetic producer writing coloured
+text at a target rate (100 MB/s by default) and a 1 ms ticker task that
+records how late each tick fires. Runs once with parsing on the event loop
+and once with the threaded parser worker, and prints the worst and 99th
+percentile stall plus the throughput actually achieved.
+
+Usage: python scripts/bench_stall.py [--seconds 3] [--rate-mb 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Coroutine
+from pathlib import Path
+from typing import Any
+
+import pyte
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from textual_term._config import TerminalConfig  # noqa: E402
+from textual_term._connection import forward  # noqa: E402
+from textual_term._emulator import DEFAULT_OUTPUT_BUDGET  # noqa: E402
+from textual_term._queue import OutputQueue  # noqa: E402
+from textual_term._screen import ResponsiveScreen  # noqa: E402
+from textual_term._widget import Terminal  # noqa: E402
+from textual_term._worker import ParserWorker  # noqa: E402
+
+CHUNK = b"".join(
+    f"\x1b[3{i % 8}mline {i:05d} ".encode() + b"x" * 60 + b"\x1b[0m\r\n" for i in range(800)
+)
+
+
+class FloodEmulator:
+    """Stand-in for PtyEmulator that only exposes an output queue."""
+
+    def __init__(self) -> None:
+        self.output_queue = OutputQueue(DEFAULT_OUTPUT_BUDGET)
+
+    def write_to_pty(self, data: str) -> None:
+        """Discard DSR responses."""
+
+
+def build_terminal(
+    threaded: bool, emulator: FloodEmulator
+) -> tuple[Coroutine[Any, Any, None], ParserWorker | None]:
+    """Wire a Terminal to the flood emulator the way its connection does.
+
+    Returns the coroutine that pumps the output, and the parser worker when threaded.
+    """
+    terminal = Terminal(command="/bin/true", config=TerminalConfig(threaded=threaded))
+    terminal.refresh = lambda *args, **kwargs: terminal  # type: ignore[method-assign]
+    screen = ResponsiveScreen(200, 60, write_callback=emulator.write_to_pty)
+    stream = pyte.ByteStream(screen)
+    if not threaded:
+        return terminal._pump.run(emulator, stream, screen), None  # type: ignore[arg-type]
+    worker = terminal._pump.start_worker(stream, screen)
+    return forward(emulator.output_queue, worker, DEFAULT_OUTPUT_BUDGET), worker
+
+
+async def produce(emulator: FloodEmulator, seconds: float, rate: float) -> int:
+    """Queue CHUNK at the target rate, honouring the output budget. Returns bytes sent."""
+    sent = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        if emulator.output_queue.over_budget or sent > elapsed * rate:
+            await asyncio.sleep(0.001)
+            continue
+        emulator.output_queue.put_nowait(["stdout", CHUNK])
+        sent += len(CHUNK)
+    emulator.output_queue.put_nowait(["disconnect", 1])
+    return sent
+
+
+async def tick(stalls: list[float], stop: asyncio.Event) -> None:
+    """Record how late a 1 ms sleep wakes up."""
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append((time.perf_counter() - before - 0.001) * 1000)
+
+
+async def run(threaded: bool, seconds: float, rate: float) -> None:
+    emulator = FloodEmulator()
+    pump, worker = build_terminal(threaded, emulator)
+    stalls: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(tick(stalls, stop))
+    recv = asyncio.create_task(pump)
+    start = time.perf_counter()
+    sent = await produce(emulator, seconds, rate)
+    await recv
+    if worker is not None:
+        await worker.backlog.wait(0)
+        worker.stop()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    p99 = statistics.quantiles(stalls, n=100, method="inclusive")[98] if len(stalls) > 1 else 0.0
+    mode = "threaded" if threaded else "inline"
+    print(
+        f"{mode:<9} {sent / elapsed / 1e6:>8.1f} MB/s  max stall {max(stalls, default=0.0):>7.1f} ms  p99 {p99:>6.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rate-mb", type=float, default=100.0)
+    args = parser.parse_args()
+    for threaded in (False, True):
+        asyncio.run(run(threaded, args.seconds, args.rate_mb * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Reproducible throughput and latency benchmarks with JSON output.
+
+Builds deterministic synthetic VT corpora (plain ``cat`` text, 256-colour
+and truecolor art, ``htop``-style full redraws and a cursor-heavy editor
+session) plus any asciicast recordings given with ``--cast``, and measures:
+
+- parse: bytes per second fed through ``ResponsiveScreen`` and ``CompactScreen``;
+- render: milliseconds per full ``render_screen`` frame at several screen sizes;
+- latency: bytes-to-paint time through a ``Terminal`` running ``cat`` in a
+  headless Textual app, from writing a marker to the PTY until Textual
+  paints the row that shows it;
+- peak RSS of the process after each section.
+
+Results are printed as a table and, with ``--json``, written as one JSON
+document (with interpreter and library versions) for comparing releases.
+
+Usage: python scripts/bench_suite.py [--json results.json] [--size-kb 512] [--cast FILE ...] [--quick]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from importlib import metadata
+from pathlib import Path
+
+import pyte
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from textual_term._renderer import render_screen  # noqa: E402
+from textual_term._replay import load_cast  # noqa: E402
+from textual_term._screen import CompactScreen, ResponsiveScreen  # noqa: E402
+
+SCREEN_SIZES = ((80, 24), (120, 40), (200, 60), (300, 100))
+LATENCY_TIMEOUT = 2.0
+WORDS = (
+    "the quick brown fox jumps over lazy dog lorem ipsum dolor sit amet build test error".split()
+)
+
+
+def cat_corpus(size: int, rng: random.Random) -> bytes:
+    """Plain text lines of words, as from ``cat`` of a log file."""
+    lines = []
+    total = 0
+    while total < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 16))) + "\r\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines).encode()
+
+
+def color256_corpus(size: int, rng: random.Random) -> bytes:
+    """Half-block art with a 256-colour foreground and background per cell."""
+    parts = []
+    total = 0
+    while total < size:
+        row = "".join(
+            f"\x1b[38;5;{rng.randrange(256)};48;5;{rng.randrange(256)}m▀" for _ in range(100)
+        )
+        line = row + "\x1b[0m\r\n"
+        parts.append(line)
+        total += len(line.encode())
+    return "".join(parts).encode()
+
+
+def truecolor_corpus(size: int, rng: random.Random) -> bytes:
+    """Gradient art with a 24-bit colour per cell."""
+    parts = []
+    total = 0
+    row_index = 0
+    while total < size:
+        shift = rng.randrange(256)
+        cells = []
+        for column in range(100):
+            red, green, blue = (
+                (column * 2 + shift) % 256,
+                (row_index * 3) % 256,
+                (shift + 128) % 256,
+            )
+            cells.append(f"\x1b[38;2;{red};{green};{blue}m█")
+        line = "".join(cells) + "\x1b[0m\r\n"
+        parts.append(line)
+        total += len(line.encode())
+        row_index += 1
+    return "".join(parts).encode()
+
+
+def htop_corpus(size: int, rng: random.Random) -> bytes:
+    """Full-screen redraws of meters and a process table, as ``htop`` emits them."""
+    frames = []
+    total = 0
+    while total < size:
+        rows = ["\x1b[H"]
+        for cpu in range(4):
+            used = rng.randrange(40)
+            rows.append(
+                f"\x1b[{cpu + 1};1H\x1b[36m{cpu:>3}\x1b[0m[\x1b[32m{'|' * used}\x1b[0m"
+                f"{' ' * (40 - used)}{used * 2.5:5.1f}%]\x1b[K"
+            )
+        rows.append(
+            "\x1b[6;1H\x1b[30;46m  PID USER      PRI  NI  VIRT   RES  S CPU% MEM%  Command\x1b[K\x1b[0m"
+        )
+        for line in range(7, 24):
+            pid = rng.randrange(1, 99999)
+            rows.append(
+                f"\x1b[{line};1H{pid:>5} \x1b[33mroot\x1b[0m      20   0 {rng.randrange(999):>4}M"
+                f" {rng.randrange(999):>4}M S {rng.random() * 100:4.1f} {rng.random() * 10:4.1f}"
+                f"  \x1b[1m{rng.choice(WORDS)}\x1b[0m --{rng.choice(WORDS)}\x1b[K"
+            )
+        frame = "".join(rows).encode()
+        frames.append(frame)
+        total += len(frame)
+    return b"".join(frames)
+
+
+def editor_corpus(size: int, rng: random.Random) -> bytes:
+    """Cursor-heavy editing: positioning, insert/delete line, scroll regions, short writes."""
+    parts = ["\x1b[?1049h\x1b[2J\x1b[2;23r"]
+    total = 0
+    while total < size:
+        row, column = rng.randint(2, 23), rng.randint(1, 70)
+        word = rng.choice(WORDS)
+        part = rng.choice(
+            (
+                f"\x1b[{row};{column}H{word}",
+                f"\x1b[{row};1H\x1b[L\x1b[34m{rng.randrange(999):>4}\x1b[0m {word}",
+                f"\x1b[{row};1H\x1b[M",
+                f"\x1b[{row};{column}H\x1b[K",
+                f"\x1b[24;1H\x1b[7m-- INSERT -- {row},{column}\x1b[0m\x1b[K\x1b[{row};{column}H",
+                f"\x1b[{row};{column}H\x1b[1;31m{word}\x1b[0m\x1b[{column}G",
+            )
+        )
+        parts.append(part)
+        total += len(part)
+    parts.append("\x1b[r\x1b[?1049l")
+    return "".join(parts).encode()
+
+
+SYNTHETIC: dict[str, Callable[[int, random.Random], bytes]] = {
+    "cat": cat_corpus,
+    "color256": color256_corpus,
+    "truecolor": truecolor_corpus,
+    "htop": htop_corpus,
+    "editor": editor_corpus,
+}
+
+
+def build_corpora(size: int, casts: list[str]) -> dict[str, bytes]:
+    """Return every corpus by name; recordings are joined output events."""
+    corpora = {
+        name: build(size, random.Random(index))
+        for index, (name, build) in enumerate(SYNTHETIC.items())
+    }
+    for path in casts:
+        recording = load_cast(path)
+        corpora[f"cast:{Path(path).name}"] = b"".join(
+            event for event in recording.events if isinstance(event, bytes)
+        )
+    return corpora
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KiB on Linux)."""
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+
+
+def bench_parse(corpora: dict[str, bytes]) -> list[dict[str, object]]:
+    """Feed each corpus through both screen types in 4 KiB reads."""
+    results = []
+    for screen_class in (ResponsiveScreen, CompactScreen):
+        for name, data in corpora.items():
+            screen = screen_class(120, 40, write_callback=lambda _data: None)
+            stream = pyte.ByteStream(screen)
+            start = time.perf_counter()
+            for offset in range(0, len(data), 4096):
+                stream.feed(data[offset : offset + 4096])
+            elapsed = time.perf_counter() - start
+            results.append(
+                {
+                    "corpus": name,
+                    "screen": screen_class.__name__,
+                    "bytes": len(data),
+                    "seconds": elapsed,
+                    "mb_per_s": len(data) / elapsed / 1e6,
+                }
+            )
+    return results
+
+
+def bench_render(corpora: dict[str, bytes], frames: int) -> list[dict[str, object]]:
+    """Time full-screen render_screen frames of each corpus's final screen at each size."""
+    results = []
+    for columns, lines in SCREEN_SIZES:
+        for name, data in corpora.items():
+            screen = ResponsiveScreen(columns, lines, write_callback=lambda _data: None)
+            pyte.ByteStream(screen).feed(data[-256 * 1024 :])
+            start = time.perf_counter()
+            for _ in range(frames):
+                render_screen(screen, show_cursor=True)
+            elapsed = time.perf_counter() - start
+            results.append(
+                {
+                    "corpus": name,
+                    "size": f"{columns}x{lines}",
+                    "ms_per_frame": elapsed / frames * 1000,
+                }
+            )
+    return results
+
+
+async def bench_latency(samples: int) -> dict[str, object]:
+    """Measure PTY-write-to-paint latency of a Terminal running ``cat`` in a headless app."""
+    from textual.app import App, ComposeResult  # noqa: PLC0415
+
+    from textual_term._widget import Terminal  # noqa: PLC0415
+
+    painted: dict[str, float] = {}
+
+    class TimedTerminal(Terminal):
+        def render_line(self, y: int):  # noqa: ANN202
+            strip = super().render_line(y)
+            text = strip.text
+            if "MARK" in text:
+                for token in text.split():
+                    painted.setdefault(token, time.perf_counter())
+            return strip
+
+    class LatencyApp(App[None]):
+        def compose(self) -> ComposeResult:
+            yield TimedTerminal(command="cat")
+
+    latencies = []
+    app = LatencyApp()
+    async with app.run_test(size=(100, 30)) as pilot:
+        terminal = app.query_one(TimedTerminal)
+        if terminal._connection is None:
+            terminal.start()
+        await pilot.pause(0.3)
+        connection = terminal._connection
+        assert connection is not None
+        emulator = connection.emulator
+        for sample in range(samples):
+            marker = f"MARK{sample:04d}"
+            sent = time.perf_counter()
+            emulator.write_to_pty(marker + "\n")
+            while marker not in painted and time.perf_counter() - sent < LATENCY_TIMEOUT:
+                await asyncio.sleep(0.0005)
+            if marker in painted:
+                latencies.append((painted[marker] - sent) * 1000)
+            await asyncio.sleep(0.02)
+        terminal.stop()
+    latencies.sort()
+    return {
+        "samples": len(latencies),
+        "p50_ms": statistics.median(latencies) if latencies else None,
+        "p99_ms": (
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else None
+        ),
+        "max_ms": latencies[-1] if latencies else None,
+    }
+
+
+def environment() -> dict[str, object]:
+    """Interpreter, platform and library versions the results were taken with."""
+    versions = {}
+    for package in ("pyte", "textual", "rich"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        **versions,
+    }
+
+
+def format_ms(value: object) -> str:
+    """Format a latency in milliseconds, or "n/a" when no sample arrived."""
+    return "n/a" if value is None else f"{value:.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--size-kb", type=int, default=512, help="size of each synthetic corpus")
+    parser.add_argument(
+        "--cast", nargs="*", default=[], help="asciicast recordings to add as corpora"
+    )
+    parser.add_argument("--frames", type=int, default=20, help="render frames per corpus and size")
+    parser.add_argument("--samples", type=int, default=50, help="latency samples")
+    parser.add_argument("--quick", action="store_true", help="small corpora and few samples")
+    args = parser.parse_args()
+    if args.quick:
+        args.size_kb, args.frames, args.samples = 64, 3, 10
+
+    corpora = build_corpora(args.size_kb * 1024, args.cast)
+    results: dict[str, object] = {"environment": environment(), "peak_rss_mb": {}}
+    rss = results["peak_rss_mb"]
+    assert isinstance(rss, dict)
+    rss["corpora"] = peak_rss_mb()
+
+    results["parse"] = parse = bench_parse(corpora)
+    rss["parse"] = peak_rss_mb()
+    for row in parse:
+        print(f"parse   {row['screen']:<16} {row['corpus']:<12} {row['mb_per_s']:>7.2f} MB/s")
+
+    results["render"] = render = bench_render(corpora, args.frames)
+    rss["render"] = peak_rss_mb()
+    for row in render:
+        print(f"render  {row['size']:<16} {row['corpus']:<12} {row['ms_per_frame']:>7.2f} ms/frame")
+
+    results["latency"] = latency = asyncio.run(bench_latency(args.samples))
+    rss["latency"] = peak_rss_mb()
+    print(
+        f"latency bytes-to-paint p50 {format_ms(latency['p50_ms'])}"
+        f"  p99 {format_ms(latency['p99_ms'])}"
+        f"  ({latency['samples']} samples)"
+    )
+    print(f"peak RSS {rss['latency']:.1f} MB")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
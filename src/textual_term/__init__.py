@@ -1,5 +1,17 @@
 """Terminal emulator widget for Textual with DSR support."""
 
+from textual_term._config import TerminalConfig
+from textual_term._replay import ReplayEngine, load_cast
+from textual_term._session import TerminalSession
+from textual_term._trace import dump_trace, enable_tracing
 from textual_term._widget import Terminal
 
-__all__ = ["Terminal"]
+__all__ = [
+    "ReplayEngine",
+    "Terminal",
+    "TerminalConfig",
+    "TerminalSession",
+    "dump_trace",
+    "enable_tracing",
+    "load_cast",
+]
@@ -0,0 +1,73 @@
+"""Catch-up policy for output backlogs: skip stale frames and overwritten output."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyte
+
+CATCHUP_MAX_FRAME_AGE = 1.0
+
+# A full-screen clear (with the cursor-home that usually precedes it) or a
+# switch to the alternate screen makes all earlier output invisible.
+_OVERWRITE_PATTERN = re.compile(rb"(?:\x1b\[[0-9;]*H)?\x1b\[2J|\x1b\[\?(?:1049|1047|47)h")
+
+
+class CatchUpPolicy:
+    """Decides how a batch of backlogged output is fed and whether to render it.
+
+    A batch larger than ``threshold`` bytes puts the terminal in catch-up
+    mode: frames are deferred while more output is already waiting, until a
+    batch below the threshold is fed or the displayed frame is older than
+    ``max_frame_age`` seconds, so an endless flood still shows progress.
+    With ``skip_overwritten`` set, output before the last full-screen clear
+    or alternate-screen switch in the batch is not parsed at all.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        skip_overwritten: bool = False,
+        max_frame_age: float = CATCHUP_MAX_FRAME_AGE,
+    ) -> None:
+        self.threshold = threshold
+        self.skip_overwritten = skip_overwritten
+        self.max_frame_age = max_frame_age
+        self.active = False
+        self.skipped_bytes = 0
+
+    def prepare(self, stream: pyte.ByteStream, chunks: list[bytes]) -> list[bytes]:
+        """Update catch-up state for a batch and return the chunks to feed."""
+        self.active = sum(len(chunk) for chunk in chunks) > self.threshold
+        if not (self.active and self.skip_overwritten and _at_sequence_boundary(stream)):
+            return chunks
+        data = b"".join(chunks)
+        cut = _last_overwrite(data)
+        if cut <= 0:
+            return chunks
+        self.skipped_bytes += cut
+        return [data[cut:]]
+
+    def defer_frame(self, backlog_waiting: bool, last_frame: float, now: float) -> bool:
+        """Return True if rendering should be skipped because the terminal is behind."""
+        return self.active and backlog_waiting and now - last_frame < self.max_frame_age
+
+
+def _last_overwrite(data: bytes) -> int:
+    """Return the offset of the last screen-overwriting sequence, or -1."""
+    start = -1
+    for match in _OVERWRITE_PATTERN.finditer(data):
+        start = match.start()
+    return start
+
+
+def _at_sequence_boundary(stream: pyte.ByteStream) -> bool:
+    """True when the stream is not inside an escape sequence or a UTF-8 character.
+
+    Dropping output is only safe from this state; otherwise the skipped bytes
+    would have completed a sequence the parser has already started.
+    """
+    pending_bytes, _flag = stream.utf8_decoder.getstate()
+    return bool(stream._taking_plain_text) and not pending_bytes
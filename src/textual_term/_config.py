@@ -0,0 +1,86 @@
+"""Tuning options for the Terminal widget."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from textual_term._emulator import DEFAULT_OUTPUT_BUDGET
+from textual_term._scrollback import DEFAULT_SCROLLBACK_LINES
+
+DEFAULT_MAX_FPS = 30
+DEFAULT_CATCHUP_THRESHOLD = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TerminalConfig:
+    """Rendering and flow-control options for a Terminal.
+
+    - ``max_fps`` caps how often the screen is rendered.
+    - ``output_budget`` is the number of unconsumed output bytes allowed
+      before the PTY stops being read.
+    - ``threaded`` parses and renders in a worker thread instead of the
+      event loop.
+    - ``catchup_threshold`` is the backlog in bytes above which rendering of
+      intermediate frames is skipped until the terminal has caught up.
+    - ``skip_overwritten`` additionally drops backlog output that a later
+      full-screen clear or alternate-screen switch overwrites. It is lossy:
+      attributes and modes set in the dropped output are not applied.
+    - ``compact_screen`` stores the screen in typed arrays (about six bytes
+      per cell) instead of pyte's dicts of Char tuples.
+    - ``scrollback_lines`` is the number of lines kept after they scroll off
+      the top; 0 disables scrollback.
+    - ``scrollback_bytes`` optionally also bounds scrollback by its
+      approximate size; the oldest lines are evicted first.
+    - ``scrollback_spill`` writes lines evicted from memory to a temporary
+      file (in ``scrollback_spill_dir``, default the system temp directory)
+      instead of dropping them, so the whole session stays scrollable.
+    - ``search_index`` maintains a trigram index over scrollback lines as
+      they are committed, so literal searches skip most of the history.
+    - ``shared_reactor`` reads and writes the PTY through one reactor shared
+      by every terminal on the event loop, which scales better when many
+      terminals run at once. Without a ``turn_budget`` the output is then
+      parsed from the reactor's callbacks, with no task per terminal.
+    - ``turn_budget`` is the parse and render time in seconds a terminal may
+      use per turn before yielding to other busy terminals on the event
+      loop; None parses each batch in one go. It applies when not threaded.
+      ``DEFAULT_TURN_BUDGET`` from the scheduler is a good start when many
+      busy terminals share a loop.
+    - ``record_path`` records the session to this asciicast v2 file.
+      ``record_max_bytes`` rotates the recording into numbered parts of at
+      most that size, and ``record_max_files`` keeps only the newest parts.
+    - ``metrics_interval`` posts a ``Terminal.MetricsUpdated`` message with
+      the terminal's metrics every that many seconds; None posts none.
+    """
+
+    max_fps: float = DEFAULT_MAX_FPS
+    output_budget: int = DEFAULT_OUTPUT_BUDGET
+    threaded: bool = False
+    catchup_threshold: int = DEFAULT_CATCHUP_THRESHOLD
+    skip_overwritten: bool = False
+    compact_screen: bool = False
+    scrollback_lines: int = DEFAULT_SCROLLBACK_LINES
+    scrollback_bytes: int | None = None
+    scrollback_spill: bool = False
+    scrollback_spill_dir: str | None = None
+    search_index: bool = True
+    shared_reactor: bool = False
+    turn_budget: float | None = None
+    record_path: str | None = None
+    record_max_bytes: int | None = None
+    record_max_files: int | None = None
+    metrics_interval: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_fps <= 0:
+            raise ValueError(f"max_fps must be positive, got {self.max_fps}")
+        if self.scrollback_lines < 0:
+            raise ValueError(f"scrollback_lines must not be negative, got {self.scrollback_lines}")
+        if self.turn_budget is not None and self.turn_budget <= 0:
+            raise ValueError(f"turn_budget must be positive, got {self.turn_budget}")
+        if self.metrics_interval is not None and self.metrics_interval <= 0:
+            raise ValueError(f"metrics_interval must be positive, got {self.metrics_interval}")
+
+    @property
+    def frame_interval(self) -> float:
+        """Minimum seconds between two rendered frames."""
+        return 1.0 / self.max_fps
@@ -0,0 +1,167 @@
+"""A running command: its PTY emulator, pyte screen and output pumping."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Callable
+
+import pyte
+
+from textual_term._config import TerminalConfig
+from textual_term._emulator import PtyEmulator
+from textual_term._keys import translate_paste
+from textual_term._pump import OutputPump, OutputPush
+from textual_term._queue import OutputQueue
+from textual_term._reactor import shared_reactor
+from textual_term._recorder import AsciicastRecorder
+from textual_term._screen import BRACKETED_PASTE_MODE, CompactScreen, ResponsiveScreen
+from textual_term._scrollback import Scrollback
+from textual_term._worker import ParserWorker
+
+
+class TerminalConnection:
+    """Runs a command in a PTY and pumps its output into a pyte screen.
+
+    The screen saves the lines it scrolls off to ``scrollback``. Output is
+    fed and rendered by ``pump`` on the event loop, or by a parser worker
+    thread when the config is ``threaded``. On the shared reactor, unless
+    turns are scheduled, the output is handed on from the reactor's read
+    callbacks rather than by a task of the connection's own. Must be
+    created and started with an event loop running.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        rows: int,
+        cols: int,
+        config: TerminalConfig,
+        scrollback: Scrollback,
+        pump: OutputPump,
+    ) -> None:
+        self._config = config
+        self._pump = pump
+        self.recorder: AsciicastRecorder | None = None
+        if config.record_path is not None:
+            self.recorder = AsciicastRecorder(
+                config.record_path,
+                cols,
+                rows,
+                command=command,
+                max_bytes=config.record_max_bytes,
+                max_files=config.record_max_files,
+            )
+        self.emulator = PtyEmulator(
+            command,
+            rows,
+            cols,
+            output_budget=config.output_budget,
+            reactor=shared_reactor() if config.shared_reactor else None,
+            recorder=self.recorder,
+        )
+        write = self._threadsafe_writer() if config.threaded else self.emulator.write_to_pty
+        screen_class = CompactScreen if config.compact_screen else ResponsiveScreen
+        self.screen = screen_class(cols, rows, write_callback=write, scrollback=scrollback)
+        self.stream = pyte.ByteStream(self.screen)
+        self.worker: ParserWorker | None = None
+        self._task: asyncio.Task | None = None  # pyright: ignore[reportMissingTypeArgument]
+        self._push: OutputPush | None = None
+
+    def start(self) -> None:
+        """Spawn the command and start pumping its output."""
+        self.emulator.open_pty()
+        if self._config.threaded:
+            self.worker = self._pump.start_worker(self.stream, self.screen)
+        self.emulator.start()
+        if self._config.shared_reactor and self._config.turn_budget is None:
+            self._push_output()
+        elif self.worker is not None:
+            output = forward(self.emulator.output_queue, self.worker, self._config.output_budget)
+            self._task = asyncio.create_task(output)
+        else:
+            self._task = asyncio.create_task(
+                self._pump.run(self.emulator, self.stream, self.screen)
+            )
+
+    def stop(self) -> None:
+        """Stop pumping output, stop the emulator and close the recording."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._push:
+            self._push.close()
+            self._push = None
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+        self.emulator.stop()
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+    def send(self, text: str, sent_at: float | None = None) -> None:
+        """Write input to the PTY.
+
+        sent_at, the ``time.monotonic()`` of the key event, times the input
+        for the input-latency metrics.
+        """
+        self.emulator.write_to_pty(text, sent_at)
+
+    def paste(self, text: str, sent_at: float | None = None) -> None:
+        """Write pasted text to the PTY, bracketed if the child enabled it.
+
+        The emulator's writer streams it to the PTY in chunks, timed from
+        sent_at like ``send()``.
+        """
+        bracketed = BRACKETED_PASTE_MODE in self.screen.mode
+        self.emulator.write_to_pty(translate_paste(text, bracketed), sent_at)
+
+    def resize(self, rows: int, cols: int) -> None:
+        """Resize the screen and the PTY, if the size changed."""
+        if self.screen.lines == rows and self.screen.columns == cols:
+            return
+        if self.worker:
+            self.worker.resize(rows, cols)
+        else:
+            self.screen.resize(rows, cols)
+        self.emulator.resize(rows, cols)
+
+    def _push_output(self) -> None:
+        """Have the emulator hand on its output as it is read, to the worker or the pump."""
+        queue = self.emulator.output_queue
+        if self.worker is not None:
+            ready = functools.partial(forward_ready, queue, self.worker, self._config.output_budget)
+            self.worker.backlog.on_drained = ready
+        else:
+            self._push = self._pump.push(queue, self.stream, self.screen)
+            ready = self._push.wake
+        self.emulator.on_output = ready
+
+    def _threadsafe_writer(self) -> Callable[[str], None]:
+        """Return a write callback that marshals worker-thread writes onto the event loop."""
+        loop = asyncio.get_running_loop()
+        emulator = self.emulator
+
+        def write(data: str) -> None:
+            loop.call_soon_threadsafe(emulator.write_to_pty, data)
+
+        return write
+
+
+async def forward(queue: OutputQueue, worker: ParserWorker, output_budget: int) -> None:
+    """Hand output to a parser worker until disconnect, waiting while it is over output_budget."""
+    while True:
+        msg = await queue.get()
+        if msg[0] == "disconnect":
+            break
+        worker.feed(msg[1])
+        await worker.backlog.wait(output_budget)
+
+
+def forward_ready(queue: OutputQueue, worker: ParserWorker, output_budget: int) -> None:
+    """Hand queued output to a parser worker while it is within output_budget, without waiting."""
+    while not queue.empty() and worker.backlog.pending <= output_budget:
+        msg = queue.get_nowait()
+        if msg[0] == "stdout":
+            worker.feed(msg[1])
@@ -0,0 +1,125 @@
+"""The rows a Terminal widget shows, and the regions repainted when they change."""
+
+from __future__ import annotations
+
+import time
+
+from textual.geometry import Region
+from textual.strip import Strip
+from textual.widget import Widget
+
+from textual_term import _trace
+from textual_term._history import HistoryView
+from textual_term._metrics import TerminalMetrics
+from textual_term._renderer import overlay_cursor
+from textual_term._scrollback import Scrollback
+from textual_term._selection import SearchSelection
+
+
+class TerminalDisplay:
+    """Composes the rows shown in a widget and repaints only the rows that changed.
+
+    The live lines of the latest frame are topped with scrollback rows while
+    the ``history`` view is scrolled back, the ``search`` matches in view are
+    highlighted and the cursor is drawn over its row while the widget has
+    focus. Every step keeps the Strip of a row it did not change, so rows
+    are compared by identity to find the regions to refresh.
+    """
+
+    def __init__(self, widget: Widget, scrollback: Scrollback, metrics: TerminalMetrics) -> None:
+        self._widget = widget
+        self._metrics = metrics
+        self._strips: list[Strip] = []
+        self._live_lines: list[Strip] = []
+        self._cursor: tuple[int, int] | None = None
+        self._cursor_strip: tuple[Strip, int, Strip] | None = None
+        self.history = HistoryView(scrollback, self.repaint)
+        self.search = SearchSelection(scrollback, self.history, self.rows, self.repaint)
+
+    def rows(self) -> int:
+        """Return the number of rows in the latest frame."""
+        return len(self._live_lines)
+
+    def line(self, y: int) -> Strip | None:
+        """Return the Strip shown on row y, or None past the last row."""
+        return self._strips[y] if 0 <= y < len(self._strips) else None
+
+    def show_frame(self, lines: list[Strip], cursor: tuple[int, int]) -> None:
+        """Display a rendered frame of the live screen with its cursor position."""
+        self._cursor = cursor
+        self._show_lines(lines)
+
+    def repaint(self) -> None:
+        """Redisplay the live lines after the view has moved or changed."""
+        self._show_lines(self._live_lines)
+
+    def _show_lines(self, lines: list[Strip]) -> None:
+        """Display rendered lines and repaint the rows that changed.
+
+        The renderer only rebuilds rows that pyte marked dirty, and the cursor
+        is overlaid here by ``_with_cursor()``, so only the rows it left and
+        entered get new Strips. A row whose Strip is the same object as before
+        is unchanged and is left out of the refresh.
+        """
+        self._live_lines = lines
+        previous = self._strips
+        self._strips = self._visible_lines()
+        if len(previous) != len(self._strips):
+            self._refresh()
+            return
+        regions = self._damaged_regions(previous, self._strips)
+        if regions:
+            self._refresh(*regions)
+
+    def _refresh(self, *regions: Region) -> None:
+        """Repaint regions (everything if none), counting and tracing the call."""
+        self._metrics.refreshes += 1
+        started = time.perf_counter()
+        self._widget.refresh(*regions)
+        if _trace.tracer is not None:
+            _trace.tracer.record("refresh", started, time.perf_counter(), id(self._widget))
+
+    def _damaged_regions(self, previous: list[Strip], current: list[Strip]) -> list[Region]:
+        """Return one full-width region per run of consecutive rows whose Strip changed."""
+        width = self._widget.size.width
+        regions: list[Region] = []
+        start: int | None = None
+        for y, (old, new) in enumerate(zip(previous, current)):
+            if old is not new and start is None:
+                start = y
+            elif old is new and start is not None:
+                regions.append(Region(0, start, width, y - start))
+                start = None
+        if start is not None:
+            regions.append(Region(0, start, width, len(current) - start))
+        return regions
+
+    def _visible_lines(self) -> list[Strip]:
+        """Return the live lines, topped with scrollback lines while scrolled back.
+
+        Search matches on the visible lines are highlighted. Highlighted rows
+        are cached by line number, so rows that did not change keep the same
+        Strip from frame to frame.
+        """
+        top = self.history.top()
+        lines = self.search.highlight(self.history.view(self._live_lines), top)
+        return self._with_cursor(lines, self.history.offset)
+
+    def _with_cursor(self, lines: list[Strip], offset: int) -> list[Strip]:
+        """Draw the cursor over its row while focused, if that row is in view.
+
+        The overlaid row is cached, so a frame that neither moves the cursor
+        nor changes its row reuses the same Strip.
+        """
+        if self._cursor is None or not self._widget.has_focus:
+            return lines
+        x, y = self._cursor
+        row = y + offset
+        if not 0 <= row < len(lines):
+            return lines
+        line = lines[row]
+        cached = self._cursor_strip
+        if cached is None or cached[0] is not line or cached[1] != x:
+            cached = (line, x, overlay_cursor(line, x))
+            self._cursor_strip = cached
+        return [*lines[:row], cached[2], *lines[row + 1 :]]
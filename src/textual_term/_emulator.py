@@ -2,90 +2,168 @@
 
 from __future__ import annotations
 
-import asyncio
-import contextlib
-import os
+from collections.abc import Callable
+from typing import TYPE_CHECKING
 
-from textual_term._pty import close_pty, open_pty, resize_fd, write_to_fd
+from textual_term._metrics import EmulatorMetrics
+from textual_term._pty import close_pty, open_pty, resize_fd
+from textual_term._queue import OutputQueue
+from textual_term._reactor import LoopPoller, PtyReactor
+from textual_term._writer import PtyWriter
 
+if TYPE_CHECKING:
+    from textual_term._recorder import AsciicastRecorder
+
+DEFAULT_OUTPUT_BUDGET = 4 * 1024 * 1024
 
-class PtyEmulator:
-    """Manages a child process via pty with async I/O."""
 
-    def __init__(self, command: str, rows: int, cols: int) -> None:
+class PtyEmulator:
+    """Manages a child process via pty with async I/O.
+
+    Output is queued on a byte-budgeted ``output_queue``, and ``on_output``,
+    if set, is called after each chunk so it can be consumed from the read
+    callback without a task. When the consumer falls more than
+    ``output_budget`` bytes behind, reads pause so the kernel PTY buffer
+    throttles the child, until the queue has drained to half the budget.
+    Input goes straight from ``write_to_pty()`` to a non-blocking ``PtyWriter``.
+
+    The PTY is polled by ``reactor`` when one is given, otherwise by a
+    ``LoopPoller`` of its own. A ``recorder`` is handed every chunk of output,
+    every input write and every resize; its creator closes it. ``metrics``
+    counts reads, queued output and read pauses, and times writes from their
+    ``queued_at`` timestamp until they reach the PTY.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        rows: int,
+        cols: int,
+        *,
+        output_budget: int = DEFAULT_OUTPUT_BUDGET,
+        reactor: PtyReactor | None = None,
+        recorder: AsciicastRecorder | None = None,
+    ) -> None:
         self._command = command
         self._rows = rows
         self._cols = cols
         self._fd: int | None = None
         self._pid: int | None = None
-        self._loop: asyncio.AbstractEventLoop | None = None
-        self._run_task: asyncio.Task | None = None  # pyright: ignore[reportMissingTypeArgument]
-        self.input_queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
-        self.output_queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
+        self._reactor = reactor
+        self._poller: PtyReactor | LoopPoller | None = None
+        self._recorder = recorder
+        self._reading_paused = False
+        self._eof = False
+        self._writer: PtyWriter | None = None
+        self._metrics = EmulatorMetrics()
+        self.on_output: Callable[[], None] | None = None
+        self.output_queue = OutputQueue(output_budget, on_drain=self._resume_reading)
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Bytes of output queued but not yet consumed."""
+        return self.output_queue.buffered_bytes
+
+    @property
+    def pending_write_bytes(self) -> int:
+        """Bytes of input accepted by write_to_pty() but not yet written to the PTY."""
+        return self._writer.pending_bytes if self._writer is not None else 0
+
+    @property
+    def metrics(self) -> EmulatorMetrics:
+        """A snapshot of this emulator's counters."""
+        metrics = self._metrics.snapshot()
+        if self._poller is not None and self._fd is not None:
+            metrics.reads += self._poller.read_count(self._fd)
+        metrics.queue_depth = self.output_queue.qsize()
+        metrics.queued_bytes = self.output_queue.buffered_bytes
+        return metrics
+
+    @property
+    def reading_paused(self) -> bool:
+        """True while PTY reads are suspended because the output budget is exceeded."""
+        return self._reading_paused
 
     def open_pty(self) -> None:
         """Fork a PTY and exec the command in the child process."""
         self._pid, self._fd = open_pty(self._command, self._rows, self._cols)
 
     def start(self) -> None:
-        """Create run asyncio task."""
-        self._run_task = asyncio.create_task(self._run())
+        """Start reading the PTY and accepting input."""
+        if self._fd is not None:
+            self._poller = self._reactor if self._reactor is not None else LoopPoller()
+            self._poller.attach(self._fd, self._deliver_output)
+            record = self._metrics.write_latency.record
+            self._writer = PtyWriter(self._fd, self._poller, on_written=record)
 
     def stop(self) -> None:
-        """Cancel tasks, remove reader, kill child, reap zombie."""
-        if self._run_task:
-            self._run_task.cancel()
-            self._run_task = None
-        if self._loop and self._fd is not None:
-            with contextlib.suppress(ValueError, OSError):
-                self._loop.remove_reader(self._fd)
+        """Stop reading and writing, kill the child and reap it."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._poller is not None and self._fd is not None:
+            self._metrics.reads += self._poller.read_count(self._fd)
+            self._poller.detach(self._fd)
         close_pty(self._fd, self._pid)
-        self._fd = None
-        self._pid = None
-        self._loop = None
+        self._fd = self._pid = None
+        self._poller = None
+        self._reading_paused = False
 
-    def write_to_pty(self, data: str) -> None:
-        """Write raw string data to the PTY fd."""
-        if self._fd is not None:
-            write_to_fd(self._fd, data)
+    def write_to_pty(self, data: str, queued_at: float | None = None) -> None:
+        """Queue string data for the PTY and write what it accepts now, never blocking.
+
+        With a ``time.monotonic()`` queued_at, the time until it is written is write latency.
+        """
+        if self._writer is None:
+            return
+        if self._recorder is not None:
+            self._recorder.input(data)
+        self._writer.write(data.encode("utf-8"), queued_at)
 
     def resize(self, rows: int, cols: int) -> None:
         """Resize the PTY window."""
         self._rows = rows
         self._cols = cols
+        if self._recorder is not None:
+            self._recorder.resize(cols, rows)
         if self._fd is not None:
             resize_fd(self._fd, rows, cols)
 
-    async def _run(self) -> None:
-        """Register PTY reader and handle input from widget."""
-        loop = asyncio.get_running_loop()
-        self._loop = loop
-        fd = self._fd
-        if fd is None:
+    def _deliver_output(self, raw: bytes | None) -> None:
+        """Queue output, pausing when over budget; None means the PTY closed."""
+        if raw is None:
+            self._eof = True
+            self._pause_reading()
+            self.output_queue.put_nowait(["disconnect", 1])
+        else:
+            self._queue_output(raw)
+        if self.on_output is not None:
+            self.on_output()
+
+    def _queue_output(self, raw: bytes) -> None:
+        """Record and queue a chunk of output, pausing reads once over budget."""
+        if self._recorder is not None:
+            self._recorder.output(raw)
+        self.output_queue.put_nowait(["stdout", raw])
+        metrics = self._metrics
+        metrics.bytes_read += len(raw)
+        metrics.chunks_queued += 1
+        metrics.peak_queued_bytes = max(metrics.peak_queued_bytes, self.output_queue.buffered_bytes)
+        if self.output_queue.over_budget and not self._reading_paused:
+            metrics.read_pauses += 1
+            self._pause_reading()
+
+    def _pause_reading(self) -> None:
+        """Stop reading the PTY until the consumer drains the output queue."""
+        if self._reading_paused or self._poller is None or self._fd is None:
             return
+        self._poller.pause_reading(self._fd)
+        self._reading_paused = True
 
-        def on_output() -> None:
-            raw = _read_pty_bytes(fd)
-            if raw is None:
-                with contextlib.suppress(OSError, ValueError):
-                    loop.remove_reader(fd)
-                self.output_queue.put_nowait(["disconnect", 1])
-                return
-            self.output_queue.put_nowait(["stdout", raw.decode("utf-8", errors="replace")])
-
-        loop.add_reader(fd, on_output)
-        while True:
-            msg = await self.input_queue.get()
-            if msg[0] == "stdin":
-                self.write_to_pty(msg[1])
-            elif msg[0] == "resize":
-                self.resize(msg[1], msg[2])
-
-
-def _read_pty_bytes(fd: int) -> bytes | None:
-    """Read raw bytes from PTY fd. Returns None on EOF or error."""
-    with contextlib.suppress(OSError, ValueError):
-        data = os.read(fd, 65536)
-        if data:
-            return data
-    return None
+    def _resume_reading(self) -> None:
+        """Resume PTY reads after the output queue has drained, unless the PTY has closed."""
+        if not self._reading_paused or self._eof:
+            return
+        self._reading_paused = False
+        if self._poller is not None and self._fd is not None:
+            self._poller.resume_reading(self._fd)
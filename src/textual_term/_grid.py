@@ -0,0 +1,388 @@
+"""Array-backed cell storage for CompactScreen, and the pyte-style buffer view over it."""
+
+from __future__ import annotations
+
+import re
+import sys
+import unicodedata
+from array import array
+from collections.abc import Iterator
+from itertools import groupby
+from typing import TYPE_CHECKING
+
+from pyte.screens import Char, wcwidth
+
+if TYPE_CHECKING:
+    from textual_term._screen import CompactScreen
+
+SPACE = ord(" ")
+WIDE_CHAR_STUB = 0
+WIDE_CHAR_WIDTH = 2
+# A non-ASCII cell followed by a cell that is not a wide-character stub.
+_NON_ASCII_BEFORE_TEXT = re.compile(r"[^\x00-\x7f](?=[^\x00])")
+MAX_ATTRIBUTES = 1 << 16
+_UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+Attributes = tuple[str, str, bool, bool, bool, bool, bool, bool]
+
+
+class CellGrid:
+    """The rows of a CompactScreen and the table of attribute tuples their cells refer to.
+
+    Each distinct attribute tuple is interned once and cells store its id.
+    When the table reaches ``MAX_ATTRIBUTES`` entries, ids that no cell uses
+    any more are dropped and the rest renumbered. Operations that blank
+    rows take the Char whose attributes the blank cells get.
+    """
+
+    def __init__(self) -> None:
+        self.rows: list[CompactRow] = []
+        self.columns = 0
+        self._table: list[Attributes] = []
+        self._ids: dict[Attributes, int] = {}
+        self._held: Char | None = None
+        self._held_id = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def attributes(self, attr_id: int) -> Attributes:
+        """Return the (fg, bg, bold, italics, underscore, strikethrough, reverse, blink) tuple for an id."""
+        return self._table[attr_id]
+
+    def attr_id(self, char: Char) -> int:
+        """Return the id of char's attributes, adding them to the table if new."""
+        attrs = attributes_of(char)
+        attr_id = self._ids.get(attrs)
+        if attr_id is None:
+            if len(self._table) >= MAX_ATTRIBUTES:
+                self._compact()
+            attr_id = len(self._table)
+            self._table.append(attrs)
+            self._ids[attrs] = attr_id
+        return attr_id
+
+    def held_id(self, char: Char) -> int:
+        """Return attr_id(char), cached while char is the same object as last time.
+
+        Meant for the cursor attributes, which are looked up on every draw and
+        change rarely. The cached id survives compaction.
+        """
+        if char is not self._held:
+            self._held_id = self.attr_id(char)
+            self._held = char
+        return self._held_id
+
+    def reset(self, lines: int, columns: int, blank: Char) -> None:
+        """Replace every row with a blank one."""
+        self.columns = columns
+        self.rows = self.blank_rows(lines, blank)
+
+    def blank_rows(self, count: int, blank: Char) -> list[CompactRow]:
+        """Return count rows of spaces with blank's attributes."""
+        attr_id = self.attr_id(blank)
+        return [CompactRow.blank(self.columns, attr_id) for _ in range(count)]
+
+    def resize(self, lines: int, columns: int, blank: Char) -> None:
+        """Drop or add rows at the bottom and cells at the right."""
+        del self.rows[lines:]
+        self.rows += self.blank_rows(lines - len(self.rows), blank)
+        if columns != self.columns:
+            attr_id = self.attr_id(blank)
+            for row in self.rows:
+                row.resize(columns, attr_id)
+        self.columns = columns
+
+    def scroll(self, top: int, bottom: int, count: int, blank: Char) -> None:
+        """Scroll rows [top, bottom] up by count (down if negative), blanking rows that enter."""
+        count = max(top - bottom - 1, min(count, bottom - top + 1))
+        rows = self.blank_rows(abs(count), blank)
+        if count > 0:
+            self.rows[top : bottom + 1] = self.rows[top + count : bottom + 1] + rows
+        else:
+            self.rows[top : bottom + 1] = rows + self.rows[top : bottom + 1 + count]
+
+    def spans(self, y: int) -> tuple[str, list[tuple[int, Attributes]]]:
+        """Return the text of row y and its (length, attributes) runs."""
+        runs = self.rows[y].runs()
+        spans = [(len(text), self._table[attr_id]) for attr_id, text in runs]
+        return "".join(text for _attr_id, text in runs), spans
+
+    def combine(self, y: int, x: int, char: str) -> None:
+        """Attach a combining character to the cell before (x, y), if there is one."""
+        if x:
+            row, x = self.rows[y], x - 1
+        elif y:
+            row, x = self.rows[y - 1], self.columns - 1
+        else:
+            return
+        row.set_cell(x, unicodedata.normalize("NFC", row.cell_data(x) + char), row.attrs[x])
+
+    def _compact(self) -> None:
+        """Drop attribute ids no longer used by any cell and renumber the rest."""
+        # Id 0 is the default blank and the held id may be kept by a caller,
+        # so both survive; sorting keeps id 0 at 0.
+        live = {0, self._held_id}
+        for row in self.rows:
+            live.update(row.attrs)
+        ordered = sorted(live)
+        remap = {old: new for new, old in enumerate(ordered)}
+        self._table = [self._table[old] for old in ordered]
+        self._ids = {attrs: attr_id for attr_id, attrs in enumerate(self._table)}
+        for row in self.rows:
+            row.attrs = array("H", map(remap.__getitem__, row.attrs))
+        self._held_id = remap[self._held_id]
+
+
+class CompactRow:
+    """One row of a CellGrid.
+
+    ``chars`` holds one codepoint per cell (``WIDE_CHAR_STUB`` for the cell
+    after a wide character) and ``attrs`` one interned attribute id per cell.
+    Cells whose data is more than one codepoint, such as combining sequences
+    without a precomposed form, keep their text in ``extra``.
+    """
+
+    __slots__ = ("chars", "attrs", "extra")
+
+    def __init__(self, chars: array[int], attrs: array[int]) -> None:
+        self.chars = chars
+        self.attrs = attrs
+        self.extra: dict[int, str] | None = None
+
+    @classmethod
+    def blank(cls, columns: int, attr_id: int) -> CompactRow:
+        """Return a row of spaces with the given attribute id."""
+        return cls(array("I", [SPACE]) * columns, array("H", [attr_id]) * columns)
+
+    def cell_data(self, x: int) -> str:
+        """Return the text stored in cell x."""
+        if self.extra and x in self.extra:
+            return self.extra[x]
+        code = self.chars[x]
+        return chr(code) if code != WIDE_CHAR_STUB else ""
+
+    def set_cell(self, x: int, data: str, attr_id: int) -> None:
+        """Store data with an attribute id in cell x."""
+        if self.extra:
+            self.extra.pop(x, None)
+        if len(data) > 1:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[x] = data
+        self.chars[x] = ord(data[0]) if data else WIDE_CHAR_STUB
+        self.attrs[x] = attr_id
+
+    def fill(self, start: int, end: int, code: int, attr_id: int) -> None:
+        """Set cells [start, end) to one codepoint and attribute id."""
+        if end <= start:
+            return
+        self.chars[start:end] = array("I", [code]) * (end - start)
+        self.attrs[start:end] = array("H", [attr_id]) * (end - start)
+        if self.extra:
+            self._drop_extra(start, end)
+
+    def write(self, x: int, text: str, attr_id: int) -> None:
+        """Store printable ASCII text from cell x, one character per cell."""
+        end = x + len(text)
+        self.chars[x:end] = array("I", text.encode(_UTF32))
+        self.attrs[x:end] = array("H", [attr_id]) * len(text)
+        if self.extra:
+            self._drop_extra(x, end)
+
+    def put(self, x: int, char: str, width: int, attr_id: int) -> None:
+        """Store a character of the given width in cell x, followed by a stub if wide."""
+        self.set_cell(x, char, attr_id)
+        if width == WIDE_CHAR_WIDTH and x + 1 < len(self.chars):
+            self.set_cell(x + 1, "", attr_id)
+
+    def shift(self, start: int, count: int, attr_id: int) -> None:
+        """Shift cells from start right by count (left if negative), filling with blanks.
+
+        Cells shifted past the end of the row are lost.
+        """
+        columns = len(self.chars)
+        count = max(start - columns, min(count, columns - start))
+        if not count:
+            return
+        blank_chars = array("I", [SPACE]) * abs(count)
+        blank_attrs = array("H", [attr_id]) * abs(count)
+        if count > 0:
+            self.chars[start:] = blank_chars + self.chars[start : columns - count]
+            self.attrs[start:] = blank_attrs + self.attrs[start : columns - count]
+        else:
+            self.chars[start:] = self.chars[start - count :] + blank_chars
+            self.attrs[start:] = self.attrs[start - count :] + blank_attrs
+        if self.extra:
+            moved = {x if x < start else x + count: data for x, data in self.extra.items()}
+            self.extra = {
+                x: data
+                for x, data in moved.items()
+                if x < start or start + max(count, 0) <= x < columns
+            }
+
+    def resize(self, columns: int, attr_id: int) -> None:
+        """Truncate or pad the row with blanks to the given width."""
+        current = len(self.chars)
+        if columns < current:
+            del self.chars[columns:]
+            del self.attrs[columns:]
+            if self.extra:
+                self._drop_extra(columns, current)
+        else:
+            self.chars.extend(array("I", [SPACE]) * (columns - current))
+            self.attrs.extend(array("H", [attr_id]) * (columns - current))
+
+    def text(self, start: int, end: int) -> str:
+        """Return the text of cells [start, end) as pyte's ``display`` shows it."""
+        if not self._hides_cells(start, end):
+            return self._decode(start, end)
+        return "".join(self.display_cells()[start:end])
+
+    def runs(self) -> list[tuple[int, str]]:
+        """Return (attribute id, text) for each run of cells sharing an attribute id."""
+        cells = self.display_cells() if self._hides_cells(0, len(self.chars)) else None
+        runs: list[tuple[int, str]] = []
+        start = 0
+        for attr_id, group in groupby(self.attrs):
+            end = start + sum(1 for _ in group)
+            text = self._decode(start, end) if cells is None else "".join(cells[start:end])
+            runs.append((attr_id, text))
+            start = end
+        return runs
+
+    def display_cells(self) -> list[str]:
+        """Return the text of every cell as pyte's ``display`` shows it."""
+        return display_cells([self.cell_data(x) for x in range(len(self.chars))])
+
+    def _hides_cells(self, start: int, end: int) -> bool:
+        """True if a wide character may hide a cell in [start, end) that is not a stub.
+
+        Otherwise the text is the decoded codepoints without stubs. Rows
+        with multi-codepoint cells always take the cell-by-cell path.
+        """
+        if self.extra:
+            return True
+        text = self.chars[max(start - 1, 0) : end].tobytes().decode(_UTF32, errors="replace")
+        return any(is_wide(match.group()) for match in _NON_ASCII_BEFORE_TEXT.finditer(text))
+
+    def _decode(self, start: int, end: int) -> str:
+        """Return the codepoints of cells [start, end), dropping wide-character stubs."""
+        return self.chars[start:end].tobytes().decode(_UTF32, errors="replace").replace("\0", "")
+
+    def _drop_extra(self, start: int, end: int) -> None:
+        """Forget multi-codepoint data for cells [start, end)."""
+        if self.extra:
+            for x in [x for x in self.extra if start <= x < end]:
+                del self.extra[x]
+
+
+class LineView:
+    """Dict-like Char view of a compact row, for pyte code that uses ``buffer[y][x]``."""
+
+    def __init__(self, grid: CellGrid, row: CompactRow, default: Char) -> None:
+        self._grid = grid
+        self._row = row
+        self.default = default
+
+    def __getitem__(self, x: int) -> Char:
+        return self.get(x, self.default)
+
+    def __setitem__(self, x: int, char: Char) -> None:
+        if 0 <= x < len(self._row.chars):
+            self._row.set_cell(x, char.data, self._grid.attr_id(char))
+
+    def __contains__(self, x: object) -> bool:
+        return isinstance(x, int) and 0 <= x < len(self._row.chars)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._row.chars)))
+
+    def __len__(self) -> int:
+        return len(self._row.chars)
+
+    def get(self, x: int, default: Char | None = None) -> Char | None:
+        """Return the Char in cell x, or default outside the row."""
+        if not 0 <= x < len(self._row.chars):
+            return default
+        return Char(self._row.cell_data(x), *self._grid.attributes(self._row.attrs[x]))
+
+    def pop(self, x: int, default: Char | None = None) -> Char | None:
+        """Return the Char in cell x and reset the cell to a blank."""
+        char = self.get(x, default)
+        if x in self:
+            self._row.fill(x, x + 1, SPACE, self._grid.attr_id(self.default))
+        return char
+
+
+class BufferView:
+    """Dict-like view of all rows of a CompactScreen, mirroring pyte's ``buffer``."""
+
+    def __init__(self, screen: CompactScreen) -> None:
+        self._screen = screen
+
+    def __getitem__(self, y: int) -> LineView:
+        return LineView(self._screen.grid, self._screen.grid.rows[y], self._screen.default_char)
+
+    def __contains__(self, y: object) -> bool:
+        return isinstance(y, int) and 0 <= y < len(self._screen.grid.rows)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._screen.grid.rows)))
+
+    def __len__(self) -> int:
+        return len(self._screen.grid.rows)
+
+    def values(self) -> list[LineView]:
+        """Return a line view per row."""
+        grid, default = self._screen.grid, self._screen.default_char
+        return [LineView(grid, row, default) for row in grid.rows]
+
+    def clear(self) -> None:
+        """Blank every row."""
+        grid = self._screen.grid
+        grid.rows = grid.blank_rows(len(grid.rows), self._screen.default_char)
+
+    def pop(self, y: int, default: object = None) -> object:
+        """Blank row y, returning its previous view."""
+        if y not in self:
+            return default
+        view = self[y]
+        self._screen.grid.rows[y] = self._screen.grid.blank_rows(1, self._screen.default_char)[0]
+        return view
+
+
+def is_wide(data: str) -> bool:
+    """True if a cell holding data is a wide character, taking two columns."""
+    return data > "\x7f" and wcwidth(data[0]) == WIDE_CHAR_WIDTH
+
+
+def display_cells(cells: list[str]) -> list[str]:
+    """Blank the cell after each wide character in a row of cell texts, in place.
+
+    pyte's ``display`` skips that cell whatever it holds. It is normally an
+    empty stub, but insert mode or a combining mark drawn at the last
+    column can leave text there.
+    """
+    wide = False
+    for x, data in enumerate(cells):
+        if wide:
+            cells[x] = ""
+            wide = False
+        else:
+            wide = is_wide(data)
+    return cells
+
+
+def attributes_of(char: Char) -> Attributes:
+    """Return the attribute part of a Char (everything except data)."""
+    return (
+        char.fg,
+        char.bg,
+        char.bold,
+        char.italics,
+        char.underscore,
+        char.strikethrough,
+        char.reverse,
+        char.blink,
+    )
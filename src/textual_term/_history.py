@@ -0,0 +1,89 @@
+"""The terminal view's position in the scrollback."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from textual.strip import Strip
+
+from textual_term._renderer import render_frozen_line
+from textual_term._scrollback import Scrollback
+
+# History scrolling keys: lines to move back, or None for a page.
+HISTORY_KEYS: dict[str, int | None] = {
+    "shift+up": 1,
+    "shift+down": -1,
+    "shift+pageup": None,
+    "shift+pagedown": None,
+}
+
+
+class HistoryView:
+    """How far the view is scrolled back into the scrollback, and the history rows it shows.
+
+    While scrolled back, lines saved to the scrollback since the offset was
+    set are added to it, so the view stays on the same history as output
+    arrives. History rows are rendered once and cached by line number, so
+    a row that stays in view keeps the same Strip from frame to frame.
+    ``on_change`` is called whenever the offset is set.
+    """
+
+    def __init__(self, scrollback: Scrollback, on_change: Callable[[], None]) -> None:
+        self._scrollback = scrollback
+        self._on_change = on_change
+        self._offset = 0
+        self._mark = 0
+        self._strips: dict[int, Strip] = {}
+
+    @property
+    def offset(self) -> int:
+        """How many lines the view is scrolled back; 0 shows the live screen."""
+        return self._offset
+
+    @offset.setter
+    def offset(self, offset: int) -> None:
+        self._offset = max(0, min(offset, len(self._scrollback)))
+        self._mark = self._scrollback.appended
+        self._on_change()
+
+    def follow(self) -> None:
+        """Return the view to the live screen."""
+        if self._offset:
+            self.offset = 0
+
+    def scroll(self, lines: int) -> None:
+        """Scroll back by lines (forward if negative)."""
+        self.offset = self._offset + lines
+
+    def scroll_key(self, key: str, page: int) -> bool:
+        """Scroll for a history key, by page lines for the page keys. False for other keys."""
+        if key not in HISTORY_KEYS:
+            return False
+        lines = HISTORY_KEYS[key]
+        if lines is None:
+            lines = page if key.endswith("up") else -page
+        self.scroll(lines)
+        return True
+
+    def top(self) -> int:
+        """Return the absolute number of the line at the top of the view."""
+        if self._offset:
+            appended = self._scrollback.appended
+            self._offset = min(self._offset + appended - self._mark, len(self._scrollback))
+            self._mark = appended
+        return self._scrollback.appended - self._offset
+
+    def view(self, lines: list[Strip]) -> list[Strip]:
+        """Return the rows in view: history rows, then as many of the live lines as fit."""
+        top = self.top()
+        if not self._offset:
+            return lines
+        rows = len(lines)
+        start = len(self._scrollback) - self._offset
+        cached = self._strips
+        self._strips = {}
+        for number, line in enumerate(self._scrollback.lines(start, start + rows), top):
+            strip = cached.get(number)
+            self._strips[number] = strip if strip is not None else render_frozen_line(line)
+        history = list(self._strips.values())
+        return history + lines[: rows - len(history)]
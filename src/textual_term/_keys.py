@@ -36,6 +36,9 @@ CTRL_KEYS: dict[str, str] = {
     "escape": "\x1b",
 }
 
+PASTE_START = "\x1b[200~"
+PASTE_END = "\x1b[201~"
+
 
 def translate_key(event: Key) -> str | None:
     """Translate a Textual Key event to a string suitable for PTY input.
@@ -47,3 +50,18 @@ def translate_key(event: Key) -> str | None:
     if event.character:
         return event.character
     return None
+
+
+def translate_paste(text: str, bracketed: bool) -> str:
+    """Translate pasted text to PTY input.
+
+    Line endings become carriage returns, as Enter sends. When the child has
+    enabled bracketed paste the text is wrapped in paste markers, with any
+    end marker inside it removed, however nested, so the paste cannot end early.
+    """
+    text = text.replace("\r\n", "\r").replace("\n", "\r")
+    if not bracketed:
+        return text
+    while PASTE_END in text:
+        text = text.replace(PASTE_END, "")
+    return PASTE_START + text + PASTE_END
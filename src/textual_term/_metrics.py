@@ -0,0 +1,114 @@
+"""Cheap counters and latency histograms showing where a terminal spends its time."""
+
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass, field
+
+HISTOGRAM_BUCKETS = 24
+
+
+class Histogram:
+    """Durations counted in power-of-two microsecond buckets.
+
+    Bucket ``i`` holds samples below ``2**i`` microseconds (the last bucket
+    takes everything longer), so recording a sample is a multiply, a
+    ``bit_length()`` and a few additions. Percentiles are bucket upper
+    bounds, accurate to within a factor of two, capped at the largest sample.
+    """
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"Histogram(count={self.count}, mean={self.mean * 1000:.3f}ms,"
+            f" p99={self.percentile(0.99) * 1000:.3f}ms, max={self.max * 1000:.3f}ms)"
+        )
+
+    def record(self, seconds: float) -> None:
+        """Add one sample of seconds."""
+        self.buckets[min(int(seconds * 1_000_000).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        """Average sample in seconds, 0.0 when empty."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound in seconds below which fraction of the samples fall."""
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << index) / 1_000_000, self.max)
+        return self.max
+
+    def copy(self) -> Histogram:
+        """Return an independent copy of the histogram."""
+        other = Histogram()
+        other.buckets = list(self.buckets)
+        other.count = self.count
+        other.total = self.total
+        other.max = self.max
+        return other
+
+
+@dataclass
+class EmulatorMetrics:
+    """PTY-side counters of a PtyEmulator.
+
+    ``queue_depth`` and ``queued_bytes`` are the output queue at the time of
+    the snapshot; ``write_latency`` runs from a key or paste event reaching
+    the widget to the last of its bytes being written to the PTY.
+    """
+
+    bytes_read: int = 0
+    reads: int = 0
+    chunks_queued: int = 0
+    queue_depth: int = 0
+    queued_bytes: int = 0
+    peak_queued_bytes: int = 0
+    read_pauses: int = 0
+    write_latency: Histogram = field(default_factory=Histogram)
+
+    def snapshot(self) -> EmulatorMetrics:
+        """Return a copy that later updates do not change."""
+        return dataclasses.replace(self, write_latency=self.write_latency.copy())
+
+
+@dataclass
+class TerminalMetrics:
+    """Counters of a Terminal, with its emulator's while it is running.
+
+    ``parse`` times each ``stream.feed()`` call and ``render`` each frame.
+    ``frames_coalesced`` counts output batches that were folded into a later
+    frame instead of getting one of their own, either by the frame-rate cap
+    or by catch-up; ``refreshes`` counts ``refresh()`` calls made for frames.
+    """
+
+    bytes_parsed: int = 0
+    frames_rendered: int = 0
+    frames_coalesced: int = 0
+    refreshes: int = 0
+    parse: Histogram = field(default_factory=Histogram)
+    render: Histogram = field(default_factory=Histogram)
+    emulator: EmulatorMetrics | None = None
+
+    def snapshot(self) -> TerminalMetrics:
+        """Return a copy that later updates do not change."""
+        return dataclasses.replace(
+            self,
+            parse=self.parse.copy(),
+            render=self.render.copy(),
+            emulator=self.emulator.snapshot() if self.emulator is not None else None,
+        )
@@ -1,4 +1,4 @@
-"""Low-level PTY operations: fork, exec, resize, write, cleanup."""
+"""Low-level PTY operations: fork, exec, resize, read, write, cleanup."""
 
 from __future__ import annotations
 
@@ -10,9 +10,14 @@ import signal
 import struct
 import termios
 
+READ_SIZE = 65536
+
 
 def open_pty(command: str, rows: int, cols: int) -> tuple[int, int]:
-    """Open a PTY and spawn the command as a child process. Returns (child_pid, master_fd)."""
+    """Open a PTY and spawn the command as a child process. Returns (child_pid, master_fd).
+
+    The master fd is non-blocking, so reads and writes never stall the event loop.
+    """
     master_fd, slave_fd = pty.openpty()
     env = os.environ.copy()
     env["TERM"] = "xterm-256color"
@@ -23,6 +28,7 @@ def open_pty(command: str, rows: int, cols: int) -> tuple[int, int]:
     ]
     pid = os.posix_spawnp(command, [command], env, file_actions=file_actions, setsid=True)
     os.close(slave_fd)
+    os.set_blocking(master_fd, False)
     resize_fd(master_fd, rows, cols)
     return pid, master_fd
 
@@ -33,9 +39,22 @@ def resize_fd(fd: int, rows: int, cols: int) -> None:
     fcntl.ioctl(fd, termios.TIOCSWINSZ, winsize)
 
 
-def write_to_fd(fd: int, data: str) -> None:
-    """Write a UTF-8 encoded string to a file descriptor."""
-    os.write(fd, data.encode("utf-8"))
+def read_some(fd: int) -> bytes | None:
+    """Read what a non-blocking fd has ready. Returns b"" if nothing is ready, None on EOF or error."""
+    try:
+        return os.read(fd, READ_SIZE) or None
+    except BlockingIOError:
+        return b""
+    except (OSError, ValueError):
+        return None
+
+
+def write_some(fd: int, data: bytes | bytearray) -> int:
+    """Write as much of data as a non-blocking fd accepts now. Returns the bytes written."""
+    try:
+        return os.write(fd, data)
+    except BlockingIOError:
+        return 0
 
 
 def close_pty(fd: int | None, pid: int | None) -> None:
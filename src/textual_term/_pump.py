@@ -0,0 +1,292 @@
+"""Feeding a terminal's PTY output to pyte and rendering it at a capped frame rate."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+
+import pyte
+from textual.strip import Strip
+
+from textual_term import _trace
+from textual_term._catchup import CatchUpPolicy
+from textual_term._config import TerminalConfig
+from textual_term._emulator import PtyEmulator
+from textual_term._metrics import TerminalMetrics
+from textual_term._queue import OutputQueue
+from textual_term._renderer import ScreenRenderer
+from textual_term._scheduler import FEED_SLICE, TurnSlot, shared_scheduler
+from textual_term._screen import ResponsiveScreen
+from textual_term._worker import ParserWorker
+
+
+class OutputPump:
+    """Drains an emulator's output queue into pyte and renders at most once per frame.
+
+    Every pending chunk is fed before a frame is rendered. Output arriving
+    after an idle period renders immediately; output within the frame
+    interval of the previous render waits for the next frame. While
+    catching up on a large backlog, frames are skipped entirely. With a
+    ``turn_budget``, parsing and rendering happen in turns shared with the
+    other terminals on the loop. Parse and render times go to ``metrics``
+    and, while tracing, to the track of ``owner``. ``run()`` does this in a
+    task; ``push()`` does it from callbacks as output arrives.
+    """
+
+    def __init__(
+        self,
+        config: TerminalConfig,
+        metrics: TerminalMetrics,
+        show_frame: Callable[[list[Strip], tuple[int, int]], None],
+        owner: object,
+    ) -> None:
+        self._config = config
+        self.catchup = CatchUpPolicy(config.catchup_threshold, config.skip_overwritten)
+        self.renderer = ScreenRenderer()
+        self._metrics = metrics
+        self._show_frame = show_frame
+        self._track = id(owner)
+        self.turns: TurnSlot | None = None
+
+    async def run(
+        self, emulator: PtyEmulator, stream: pyte.ByteStream, screen: ResponsiveScreen
+    ) -> None:
+        """Feed and render the emulator's output until it disconnects."""
+        if self._config.turn_budget is not None:
+            self.turns = shared_scheduler().register(self._config.turn_budget)
+        loop = asyncio.get_running_loop()
+        queue = emulator.output_queue
+        interval = self._config.frame_interval
+        last_frame = -interval
+        connected = True
+        while connected:
+            chunks, connected = collect(await queue.get(), queue)
+            if not chunks:
+                continue
+            started = time.perf_counter()
+            await self._feed(stream, chunks, queue)
+            delay = last_frame + interval - loop.time()
+            if connected and delay > 0:
+                connected = await self._coalesce(stream, queue, delay)
+            if connected and await self._behind(queue, last_frame):
+                self._metrics.frames_coalesced += 1
+            else:
+                await self._render(screen, queue)
+                last_frame = loop.time()
+            if _trace.tracer is not None:
+                _trace.tracer.record("recv_loop", started, time.perf_counter(), self._track)
+
+    def start_worker(self, stream: pyte.ByteStream, screen: ResponsiveScreen) -> ParserWorker:
+        """Start a parser worker that feeds and renders like this pump, off the event loop."""
+        worker = ParserWorker(
+            stream,
+            screen,
+            self.renderer,
+            self._config.frame_interval,
+            self.catchup,
+            self._show_frame,
+            self._metrics,
+        )
+        worker.start()
+        return worker
+
+    def push(
+        self, queue: OutputQueue, stream: pyte.ByteStream, screen: ResponsiveScreen
+    ) -> OutputPush:
+        """Return an OutputPush that feeds and renders queue's output without a task."""
+        interval = self._config.frame_interval
+        return OutputPush(self, queue, stream, screen, interval, self._metrics, self._track)
+
+    def render_frame(self, screen: ResponsiveScreen) -> None:
+        """Render dirty screen lines and show the frame."""
+        started = time.perf_counter()
+        lines = self.renderer.render(screen)
+        self._metrics.render.record(time.perf_counter() - started)
+        self._metrics.frames_rendered += 1
+        if _trace.tracer is not None:
+            _trace.tracer.record("render", started, time.perf_counter(), self._track)
+        self._show_frame(lines, (screen.cursor.x, screen.cursor.y))
+
+    async def _coalesce(self, stream: pyte.ByteStream, queue: OutputQueue, delay: float) -> bool:
+        """Wait delay seconds for the next frame, feeding what arrived. False on disconnect."""
+        await asyncio.sleep(delay)
+        if queue.empty():
+            return True
+        chunks, connected = collect(queue.get_nowait(), queue)
+        if chunks:
+            self._metrics.frames_coalesced += 1
+            await self._feed(stream, chunks, queue)
+        return connected
+
+    async def _render(self, screen: ResponsiveScreen, queue: OutputQueue) -> None:
+        """Render a frame, within a scheduler turn when scheduled."""
+        if self.turns is None:
+            self.render_frame(screen)
+        else:
+            await self.turns.call(lambda: self.render_frame(screen), lambda: not queue.empty())
+
+    def feed_chunks(self, stream: pyte.ByteStream, chunks: list[bytes]) -> None:
+        """Feed output chunks to pyte, applying the catch-up policy to the batch.
+
+        Output arrives as raw bytes; the ByteStream's incremental decoder keeps
+        multibyte sequences that are split across reads intact.
+        """
+        for chunk in self.catchup.prepare(stream, chunks):
+            started = time.perf_counter()
+            stream.feed(chunk)
+            self._count_feed(started, time.perf_counter(), len(chunk))
+
+    async def _feed(self, stream: pyte.ByteStream, chunks: list[bytes], queue: OutputQueue) -> None:
+        """Feed output chunks, in slices spread over scheduler turns when scheduled."""
+        if self.turns is None:
+            self.feed_chunks(stream, chunks)
+            return
+        pieces = deque(
+            chunk[start : start + FEED_SLICE]
+            for chunk in self.catchup.prepare(stream, chunks)
+            for start in range(0, len(chunk), FEED_SLICE)
+        )
+        await self.turns.feed(stream, pieces, queue, self._count_feed)
+
+    def _count_feed(self, started: float, ended: float, size: int) -> None:
+        """Record one stream.feed() call in the metrics and any active trace."""
+        self._metrics.parse.record(ended - started)
+        self._metrics.bytes_parsed += size
+        if _trace.tracer is not None:
+            _trace.tracer.record("feed", started, ended, self._track, size)
+
+    async def _behind(self, queue: OutputQueue, last_frame: float) -> bool:
+        """Return True if this frame should be skipped to catch up on a backlog."""
+        if not self.catchup.active:
+            return False
+        await asyncio.sleep(0)
+        return self.catchup.defer_frame(
+            not queue.empty(), last_frame, asyncio.get_running_loop().time()
+        )
+
+
+class OutputPush:
+    """Feeds and renders a terminal's output from loop callbacks instead of a task.
+
+    ``wake()`` is meant for the emulator's ``on_output``. The first wake
+    schedules one ``drain()``, which feeds everything queued by then and
+    renders at once if the previous frame is a frame interval old. Otherwise
+    a timer is set for the next frame, and output arriving until it fires is
+    left queued and fed in one batch before that frame, as in
+    ``OutputPump.run()``. While catching up, a frame waits one loop pass so
+    output still arriving can defer it.
+    """
+
+    def __init__(
+        self,
+        pump: OutputPump,
+        queue: OutputQueue,
+        stream: pyte.ByteStream,
+        screen: ResponsiveScreen,
+        frame_interval: float,
+        metrics: TerminalMetrics,
+        track: int,
+    ) -> None:
+        self._pump = pump
+        self._queue = queue
+        self._stream = stream
+        self._screen = screen
+        self._frame_interval = frame_interval
+        self._metrics = metrics
+        self._track = track
+        self._loop = asyncio.get_running_loop()
+        self._last_frame = -frame_interval
+        self._woken = False
+        self._frame_handle: asyncio.Handle | None = None
+        self._closed = False
+
+    def wake(self) -> None:
+        """Schedule a drain, unless one is scheduled or a pending frame will take the output."""
+        if not self._woken and self._frame_handle is None and not self._closed:
+            self._woken = True
+            self._loop.call_soon(self.drain)
+
+    def drain(self) -> None:
+        """Feed everything queued, then render now or set a timer for the next frame.
+
+        Does nothing while a frame is pending; that frame feeds the output.
+        """
+        self._woken = False
+        if self._closed or self._frame_handle is not None or self._queue.empty():
+            return
+        started = time.perf_counter()
+        due = self._last_frame + self._frame_interval
+        if not self._feed_queued():
+            self._finish()
+        elif self._loop.time() >= due:
+            self._frame()
+        else:
+            self._frame_handle = self._loop.call_at(due, self._frame)
+        if _trace.tracer is not None:
+            _trace.tracer.record("recv_loop", started, time.perf_counter(), self._track)
+
+    def close(self) -> None:
+        """Stop taking output and cancel a pending frame."""
+        self._closed = True
+        if self._frame_handle is not None:
+            self._frame_handle.cancel()
+            self._frame_handle = None
+
+    def _feed_queued(self) -> bool:
+        """Feed every queued chunk. Returns False if the emulator disconnected."""
+        if self._queue.empty():
+            return True
+        chunks, connected = collect(self._queue.get_nowait(), self._queue)
+        if chunks:
+            self._pump.feed_chunks(self._stream, chunks)
+        return connected
+
+    def _frame(self) -> None:
+        """Feed what arrived while the frame was pending, then render it."""
+        self._frame_handle = None
+        if not self._queue.empty():
+            self._metrics.frames_coalesced += 1
+            if not self._feed_queued():
+                self._finish()
+                return
+        if self._pump.catchup.active:
+            self._frame_handle = self._loop.call_soon(self._catch_up)
+        else:
+            self._render()
+
+    def _catch_up(self) -> None:
+        """Render unless output read meanwhile shows the terminal is behind, then drain it."""
+        self._frame_handle = None
+        backlog = not self._queue.empty()
+        if self._pump.catchup.defer_frame(backlog, self._last_frame, self._loop.time()):
+            self._metrics.frames_coalesced += 1
+        else:
+            self._render()
+        if backlog:
+            self.wake()
+
+    def _finish(self) -> None:
+        """Render the last output after a disconnect and stop."""
+        self._render()
+        self.close()
+
+    def _render(self) -> None:
+        """Render dirty lines and show the frame."""
+        self._pump.render_frame(self._screen)
+        self._last_frame = self._loop.time()
+
+
+def collect(
+    msg: list, queue: OutputQueue  # pyright: ignore[reportMissingTypeArgument]
+) -> tuple[list[bytes], bool]:
+    """Gather msg and every queued message into output chunks. The flag is False on disconnect."""
+    chunks: list[bytes] = []
+    while msg[0] != "disconnect":
+        if msg[0] == "stdout":
+            chunks.append(msg[1])
+        if queue.empty():
+            return chunks, True
+        msg = queue.get_nowait()
+    return chunks, False
@@ -0,0 +1,59 @@
+"""Byte-budgeted asyncio queue for PTY output messages."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+
+class OutputQueue(asyncio.Queue):  # pyright: ignore[reportMissingTypeArgument]
+    """asyncio.Queue of output messages that tracks the payload bytes it holds.
+
+    Messages are lists whose second element is the payload for ``stdout``
+    messages. ``over_budget`` turns true once the queued payload exceeds
+    ``max_bytes``; ``on_drain`` is called after a get once the queue has
+    drained to half of the budget, so the producer can resume. A consumer
+    that takes output off the queue faster than it parses it can ``hold()``
+    the unparsed bytes so they still count, and ``release()`` them as it goes.
+    """
+
+    def __init__(self, max_bytes: int, on_drain: Callable[[], None] | None = None) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.buffered_bytes = 0
+        self._on_drain = on_drain
+
+    @property
+    def over_budget(self) -> bool:
+        """True when the queued payload exceeds the byte budget."""
+        return self.buffered_bytes > self.max_bytes
+
+    def hold(self, size: int) -> None:
+        """Count size bytes taken off the queue but not yet consumed against the budget."""
+        self.buffered_bytes += size
+
+    def release(self, size: int) -> None:
+        """Stop counting size held bytes, resuming the producer if the queue has drained."""
+        self.buffered_bytes -= size
+        self._check_drain()
+
+    def _put(self, item: list) -> None:  # pyright: ignore[reportMissingTypeArgument]
+        super()._put(item)
+        self.buffered_bytes += _payload_size(item)
+
+    def _get(self) -> list:  # pyright: ignore[reportMissingTypeArgument]
+        item = super()._get()
+        self.buffered_bytes -= _payload_size(item)
+        self._check_drain()
+        return item
+
+    def _check_drain(self) -> None:
+        if self._on_drain is not None and self.buffered_bytes <= self.max_bytes // 2:
+            self._on_drain()
+
+
+def _payload_size(item: list) -> int:  # pyright: ignore[reportMissingTypeArgument]
+    """Return the byte size of a message payload, zero for control messages."""
+    if item[0] == "stdout":
+        return len(item[1])
+    return 0
@@ -0,0 +1,234 @@
+"""Polling PTY fds: a shared reactor over one event-loop registration, or the loop per fd."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import selectors
+import time
+import weakref
+from collections.abc import Callable
+
+from textual_term import _pty, _trace
+
+READ_BUDGET = 256 * 1024
+
+_shared: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PtyReactor] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class _Channel:
+    """Callbacks and selector state for one attached PTY."""
+
+    __slots__ = ("on_output", "on_writable", "reading", "events", "reads")
+
+    def __init__(self, on_output: Callable[[bytes | None], None]) -> None:
+        self.on_output = on_output
+        self.on_writable: Callable[[], None] | None = None
+        self.reading = True
+        self.events = 0
+        self.reads = 0
+
+
+class PtyReactor:
+    """Reads and writes every attached PTY from a single loop callback.
+
+    The PTY fds live in the reactor's own selector (epoll on Linux), and only
+    that selector's fd is registered with the event loop, so any number of
+    terminals costs the loop one reader. When it fires, every ready PTY is
+    read until it would block or ``read_budget`` bytes have been taken, and
+    the reads are handed to the terminal as one batched chunk; PTYs with
+    buffered input are flushed in the same pass when they become writable.
+    A callback that detaches another fd stops that fd being serviced for
+    the rest of the pass.
+    """
+
+    def __init__(self, read_budget: int = READ_BUDGET) -> None:
+        self.read_budget = read_budget
+        self._selector = selectors.DefaultSelector()
+        self._channels: dict[int, _Channel] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def attach(self, fd: int, on_output: Callable[[bytes | None], None]) -> None:
+        """Start reading fd; on_output gets each batch of output, then None at EOF."""
+        if not self._channels:
+            self._loop = asyncio.get_running_loop()
+            self._loop.add_reader(self._selector.fileno(), self._poll)
+        self._channels[fd] = _Channel(on_output)
+        self._update(fd)
+
+    def detach(self, fd: int) -> None:
+        """Stop reading and writing fd. The loop registration goes with the last fd."""
+        channel = self._channels.pop(fd, None)
+        if channel is None:
+            return
+        if channel.events:
+            self._selector.unregister(fd)
+        if not self._channels and self._loop is not None:
+            self._loop.remove_reader(self._selector.fileno())
+            self._loop = None
+
+    def pause_reading(self, fd: int) -> None:
+        """Stop reading fd until resume_reading()."""
+        self._set(fd, reading=False)
+
+    def resume_reading(self, fd: int) -> None:
+        """Resume reading fd."""
+        self._set(fd, reading=True)
+
+    def add_writer(self, fd: int, callback: Callable[[], None]) -> None:
+        """Call callback from the reactor pass whenever fd is writable."""
+        channel = self._channels.get(fd)
+        if channel is not None:
+            channel.on_writable = callback
+            self._update(fd)
+
+    def remove_writer(self, fd: int) -> None:
+        """Stop watching fd for writability."""
+        channel = self._channels.get(fd)
+        if channel is not None:
+            channel.on_writable = None
+            self._update(fd)
+
+    def read_count(self, fd: int) -> int:
+        """Number of read syscalls made on fd since it was attached."""
+        channel = self._channels.get(fd)
+        return channel.reads if channel is not None else 0
+
+    def close(self) -> None:
+        """Detach every fd and close the selector."""
+        for fd in list(self._channels):
+            self.detach(fd)
+        self._selector.close()
+
+    def _set(self, fd: int, *, reading: bool) -> None:
+        channel = self._channels.get(fd)
+        if channel is not None:
+            channel.reading = reading
+            self._update(fd)
+
+    def _update(self, fd: int) -> None:
+        """Bring fd's selector registration in line with its channel."""
+        channel = self._channels[fd]
+        events = (selectors.EVENT_READ if channel.reading else 0) | (
+            selectors.EVENT_WRITE if channel.on_writable is not None else 0
+        )
+        if events == channel.events:
+            return
+        if not channel.events:
+            self._selector.register(fd, events, channel)
+        elif not events:
+            self._selector.unregister(fd)
+        else:
+            self._selector.modify(fd, events, channel)
+        channel.events = events
+
+    def _poll(self) -> None:
+        """Service every ready PTY: one batched read per terminal, then pending writes."""
+        for key, mask in self._selector.select(0):
+            channel = key.data
+            if mask & selectors.EVENT_READ and channel.reading and self._attached(key.fd, channel):
+                self._read(key.fd, channel)
+            if (
+                mask & selectors.EVENT_WRITE
+                and channel.on_writable is not None
+                and self._attached(key.fd, channel)
+            ):
+                channel.on_writable()
+
+    def _attached(self, fd: int, channel: _Channel) -> bool:
+        """True if channel is still the one attached for fd."""
+        return self._channels.get(fd) is channel
+
+    def _read(self, fd: int, channel: _Channel) -> None:
+        """Read fd until it would block or the budget is spent, and deliver one chunk."""
+        tracer = _trace.tracer
+        started = time.perf_counter() if tracer is not None else 0.0
+        chunks: list[bytes] = []
+        size = 0
+        data: bytes | None = b""
+        while size < self.read_budget:
+            data = _pty.read_some(fd)
+            channel.reads += 1
+            if not data:
+                break
+            chunks.append(data)
+            size += len(data)
+        if chunks:
+            channel.on_output(chunks[0] if len(chunks) == 1 else b"".join(chunks))
+        if data is None:
+            channel.on_output(None)
+        if tracer is not None:
+            tracer.record("reactor.read", started, time.perf_counter(), size=size)
+
+
+class LoopPoller:
+    """The reactor interface over the event loop's own callbacks, one registration per fd.
+
+    Each time a PTY is readable it is read once and the output delivered
+    as is. This is how a terminal reads and flushes its PTY without the
+    shared reactor.
+    """
+
+    def __init__(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._outputs: dict[int, Callable[[bytes | None], None]] = {}
+        self._reads: dict[int, int] = {}
+
+    def attach(self, fd: int, on_output: Callable[[bytes | None], None]) -> None:
+        """Start reading fd; on_output gets each read, then None at EOF."""
+        self._outputs[fd] = on_output
+        self._reads[fd] = 0
+        self.resume_reading(fd)
+
+    def detach(self, fd: int) -> None:
+        """Stop reading and writing fd."""
+        if self._outputs.pop(fd, None) is not None:
+            self.pause_reading(fd)
+            self.remove_writer(fd)
+
+    def pause_reading(self, fd: int) -> None:
+        """Stop reading fd until resume_reading()."""
+        with contextlib.suppress(OSError, ValueError):
+            self._loop.remove_reader(fd)
+
+    def resume_reading(self, fd: int) -> None:
+        """Resume reading fd."""
+        self._loop.add_reader(fd, self._read, fd)
+
+    def add_writer(self, fd: int, callback: Callable[[], None]) -> None:
+        """Call callback whenever fd is writable."""
+        self._loop.add_writer(fd, callback)
+
+    def remove_writer(self, fd: int) -> None:
+        """Stop watching fd for writability."""
+        with contextlib.suppress(OSError, ValueError):
+            self._loop.remove_writer(fd)
+
+    def read_count(self, fd: int) -> int:
+        """Number of read syscalls made on fd since it was attached."""
+        return self._reads.get(fd, 0)
+
+    def _read(self, fd: int) -> None:
+        """Read what fd has ready and deliver it."""
+        tracer = _trace.tracer
+        started = time.perf_counter() if tracer is not None else 0.0
+        data = _pty.read_some(fd)
+        self._reads[fd] += 1
+        if data != b"":
+            self._outputs[fd](data)
+        if tracer is not None:
+            tracer.record("pty.read", started, time.perf_counter(), size=len(data or b""))
+
+
+def shared_reactor() -> PtyReactor:
+    """Return the reactor shared by every terminal on the running event loop."""
+    loop = asyncio.get_running_loop()
+    reactor = _shared.get(loop)
+    if reactor is None:
+        reactor = _shared[loop] = PtyReactor()
+    return reactor
@@ -0,0 +1,239 @@
+"""Asciicast v2 session recording through a batched background writer."""
+
+from __future__ import annotations
+
+import codecs
+import contextlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import TextIO
+
+ASCIICAST_VERSION = 2
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_BYTES = 256 * 1024
+DEFAULT_BUFFER_LIMIT = 16 * 1024 * 1024
+
+
+class AsciicastRecorder:
+    """Records output, input and resize events to asciicast v2 files.
+
+    The recording calls only timestamp the event and put it on an in-memory
+    queue; a writer thread wakes every ``flush_interval`` seconds (or once
+    ``flush_bytes`` are waiting), decodes and JSON-encodes the batch and
+    writes it in one go, so the PTY read path never touches the disk. If
+    the writer falls ``buffer_limit`` bytes behind, further events are
+    dropped and counted in ``dropped_bytes`` rather than growing memory.
+    The events go to a ``CastFile``, rotated by ``max_bytes`` and
+    ``max_files``. A write error stops the recording and is kept in
+    ``error``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        *,
+        command: str | None = None,
+        max_bytes: int | None = None,
+        max_files: int | None = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.flush_bytes = DEFAULT_FLUSH_BYTES
+        self.buffer_limit = DEFAULT_BUFFER_LIMIT
+        self.dropped_bytes = 0
+        self._cast = CastFile(path, (width, height), command, max_bytes, max_files)
+        self._inbox: queue.SimpleQueue[tuple | None]  # pyright: ignore[reportMissingTypeArgument]
+        self._inbox = queue.SimpleQueue()
+        self._queued_bytes = 0
+        self._written_bytes = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._thread = threading.Thread(target=self._run, name="textual-term-recorder", daemon=True)
+        self._thread.start()
+
+    @property
+    def parts(self) -> list[str]:
+        """Paths of the recording parts still on disk, oldest first."""
+        return list(self._cast.parts)
+
+    @property
+    def error(self) -> OSError | None:
+        """The write error that stopped the recording, if any."""
+        return self._cast.error
+
+    def output(self, data: bytes) -> None:
+        """Record output read from the PTY."""
+        self._record("o", data)
+
+    def input(self, data: str) -> None:
+        """Record input written to the PTY."""
+        self._record("i", data)
+
+    def resize(self, width: int, height: int) -> None:
+        """Record a terminal resize."""
+        if not self._closed:
+            self._inbox.put((time.monotonic(), "r", (width, height)))
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until every event recorded so far has been written."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._inbox.put((0.0, "flush", done))
+        self._wake.set()
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write what is buffered, close the file and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._inbox.put(None)
+        self._wake.set()
+        self._thread.join()
+
+    def _record(self, kind: str, data: bytes | str) -> None:
+        if self._closed:
+            return
+        if self._queued_bytes - self._written_bytes > self.buffer_limit:
+            self.dropped_bytes += len(data)
+            return
+        self._inbox.put((time.monotonic(), kind, data))
+        self._queued_bytes += len(data)
+        if self._queued_bytes - self._written_bytes > self.flush_bytes:
+            self._wake.set()
+
+    def _run(self) -> None:
+        """Write queued events in batches until closed."""
+        running = True
+        while running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            running = self._write_batch()
+        self._cast.close()
+
+    def _write_batch(self) -> bool:
+        """Write everything queued. Returns False once the close sentinel is reached."""
+        while True:
+            try:
+                event = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                self._cast.flush()
+                return False
+            when, kind, data = event
+            if kind == "flush":
+                self._cast.flush()
+                data.set()
+                continue
+            if kind == "r":
+                self._cast.size = data
+                data = f"{data[0]}x{data[1]}"
+            else:
+                self._written_bytes += len(data)
+                if isinstance(data, bytes):
+                    data = self._decoder.decode(data)
+            if data:
+                self._cast.write(when, kind, data)
+        self._cast.flush()
+        return True
+
+
+class CastFile:
+    """The asciicast v2 file a recording is written to, rotated into numbered parts.
+
+    With ``max_bytes`` the recording is rotated into numbered parts
+    (``session.cast``, ``session.1.cast``, ...), each a complete recording
+    with its own header and clock. With ``max_files`` only that many of the
+    newest parts are kept. A write error stops writing and is kept in
+    ``error``. New parts get a header with the current ``size``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: tuple[int, int],
+        command: str | None = None,
+        max_bytes: int | None = None,
+        max_files: int | None = None,
+    ) -> None:
+        self.path = path
+        self.size = size
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.error: OSError | None = None
+        self.parts: list[str] = []
+        self._command = command
+        self._file: TextIO | None = None
+        self._file_size = 0
+        self._part = 0
+        self._part_start = 0.0
+
+    def close(self) -> None:
+        """Close the current part."""
+        if self._file is not None:
+            with contextlib.suppress(OSError):
+                self._file.close()
+            self._file = None
+
+    def write(self, when: float, kind: str, data: str) -> None:
+        """Append an event to the current part, starting a new part when it is full."""
+        if self.error is not None:
+            return
+        tail = f", {json.dumps(kind)}, {json.dumps(data)}]\n"
+        try:
+            if self._file is None or self._full(len(tail) + 20):
+                self._open_part(when)
+            assert self._file is not None
+            line = f"[{when - self._part_start:.6f}{tail}"
+            self._file.write(line)
+            self._file_size += len(line)
+        except OSError as error:
+            self.error = error
+
+    def flush(self) -> None:
+        """Flush the current part to disk."""
+        if self._file is not None and self.error is None:
+            try:
+                self._file.flush()
+            except OSError as error:
+                self.error = error
+
+    def _full(self, size: int) -> bool:
+        return self.max_bytes is not None and self._file_size + size > self.max_bytes
+
+    def _open_part(self, start: float) -> None:
+        """Close the current part and start the next one with a fresh header."""
+        if self._file is not None:
+            self._file.close()
+            self._part += 1
+        root, ext = os.path.splitext(self.path)
+        path = self.path if self._part == 0 else f"{root}.{self._part}{ext}"
+        self._file = open(path, "w", encoding="utf-8")  # noqa: SIM115
+        self._part_start = start
+        self.parts.append(path)
+        header = self._header(time.time() - (time.monotonic() - start))
+        self._file.write(header)
+        self._file_size = len(header)
+        while self.max_files is not None and len(self.parts) > self.max_files:
+            with contextlib.suppress(OSError):
+                os.remove(self.parts.pop(0))
+
+    def _header(self, timestamp: float) -> str:
+        header: dict[str, object] = {
+            "version": ASCIICAST_VERSION,
+            "width": self.size[0],
+            "height": self.size[1],
+            "timestamp": int(timestamp),
+            "env": {"TERM": "xterm-256color", "SHELL": os.environ.get("SHELL", "")},
+        }
+        if self._command is not None:
+            header["command"] = self._command
+        return json.dumps(header) + "\n"
@@ -1,18 +1,31 @@
-"""Pyte screen buffer to Rich Text rendering."""
+"""Pyte screen buffer to Textual Strip rendering."""
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
-from rich.console import ConsoleOptions, RenderResult
+from rich.segment import Segment
 from rich.style import Style
-from rich.text import Text
+from textual.strip import Strip
+
+from textual_term._grid import is_wide
+from textual_term._screen import CompactScreen
 
 if TYPE_CHECKING:
     from pyte.screens import Char, Screen
-    from rich.console import Console
+
+    from textual_term._grid import Attributes
+    from textual_term._scrollback import FrozenLine
+
+Runs = list[tuple[str, "Style | None"]]
 
 HEX_COLOR_LENGTH = 6
+STYLE_CACHE_SIZE = 4096
+CURSOR_STYLE = Style(reverse=True)
+SEARCH_MATCH_STYLE = Style(color="black", bgcolor="yellow")
+SEARCH_CURRENT_STYLE = Style(color="black", bgcolor="dark_orange", bold=True)
+DEFAULT_ATTRIBUTES: Attributes = ("default", "default", False, False, False, False, False, False)
 
 COLOR_MAP: dict[str, str] = {
     "brown": "yellow",
@@ -27,6 +40,7 @@ COLOR_MAP: dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
 def _resolve_color(color: str) -> str | None:
     """Convert a pyte color name to a Rich color string."""
     if not color:
@@ -39,58 +53,219 @@ def _resolve_color(color: str) -> str | None:
     return lower
 
 
-def _char_to_style(char: Char) -> Style:
-    """Convert a pyte Char to a Rich Style."""
-    fg = _resolve_color(char.fg) if char.fg != "default" else None
-    bg = _resolve_color(char.bg) if char.bg != "default" else None
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _interned_style(
+    fg: str,
+    bg: str,
+    bold: bool,
+    italics: bool,
+    underscore: bool,
+    strikethrough: bool,
+    reverse: bool,
+) -> Style:
+    """Return the shared Rich Style for a pyte attribute combination."""
     return Style(
-        color=fg,
-        bgcolor=bg,
-        bold=char.bold,
-        italic=char.italics,
-        underline=char.underscore,
-        strike=char.strikethrough,
-        reverse=char.reverse,
+        color=_resolve_color(fg) if fg != "default" else None,
+        bgcolor=_resolve_color(bg) if bg != "default" else None,
+        bold=bold,
+        italic=italics,
+        underline=underscore,
+        strike=strikethrough,
+        reverse=reverse,
+    )
+
+
+def _char_to_style(char: Char) -> Style:
+    """Convert a pyte Char to a Rich Style.
+
+    Styles are interned, so every cell with the same attributes shares one Style.
+    """
+    return _interned_style(
+        char.fg,
+        char.bg,
+        char.bold,
+        char.italics,
+        char.underscore,
+        char.strikethrough,
+        char.reverse,
     )
 
 
-def _render_line(
-    line: dict[int, Char],
-    columns: int,
-    cursor_x: int | None,
-) -> Text:
-    """Render a single screen line to a Rich Text object."""
-    text = Text()
+def _line_runs(line: dict[int, Char], columns: int) -> Runs:
+    """Group consecutive cells that share a style into (text, style) runs.
+
+    Missing cells are blank padding with no style. As in pyte's ``display``,
+    the cell after a wide character is skipped. Interned styles make an
+    identity check enough to detect a style change.
+    """
+    runs: Runs = []
+    chunk: list[str] = []
+    run_style: Style | None = None
+    wide = False
     for x in range(columns):
         char = line.get(x)
         if char is None:
-            if cursor_x == x:
-                text.append(" ", Style(reverse=True))
-            else:
-                text.append(" ")
-            continue
-        style = _char_to_style(char)
-        if cursor_x == x:
-            style = style + Style(reverse=True)
-        text.append(char.data, style)
-    return text
-
-
-def render_screen(screen: Screen, show_cursor: bool) -> list[Text]:
-    """Convert a pyte Screen buffer to a list of Rich Text lines."""
-    lines: list[Text] = []
-    cursor_y = screen.cursor.y if show_cursor else -1
-    for y in range(screen.lines):
-        cursor_x = screen.cursor.x if y == cursor_y else None
-        lines.append(_render_line(screen.buffer[y], screen.columns, cursor_x))
+            data = " "
+            style = None
+        else:
+            data = "" if wide else char.data
+            style = _char_to_style(char)
+        wide = is_wide(data)
+        if style is not run_style and chunk:
+            runs.append(("".join(chunk), run_style))
+            chunk = []
+        run_style = style
+        chunk.append(data)
+    if chunk:
+        runs.append(("".join(chunk), run_style))
+    return runs
+
+
+def _attr_style(attrs: Attributes) -> Style | None:
+    """Convert a compact-screen attribute tuple to an interned Style.
+
+    Default attributes map to no style, as missing cells do in ``_line_runs``.
+    """
+    if attrs == DEFAULT_ATTRIBUTES:
+        return None
+    fg, bg, bold, italics, underscore, strikethrough, reverse, _blink = attrs
+    return _interned_style(fg, bg, bold, italics, underscore, strikethrough, reverse)
+
+
+def _compact_line_runs(screen: CompactScreen, y: int) -> Runs:
+    """Group a compact row into (text, style) runs straight from its arrays.
+
+    Cells are grouped by attribute id, so no Char is built.
+    """
+    grid = screen.grid
+    return [(text, _attr_style(grid.attributes(attr_id))) for attr_id, text in grid.rows[y].runs()]
+
+
+def _screen_line_runs(screen: Screen, y: int) -> Runs:
+    """Return the runs for row y, reading compact screens without the buffer view."""
+    if isinstance(screen, CompactScreen):
+        return _compact_line_runs(screen, y)
+    return _line_runs(screen.buffer[y], screen.columns)
+
+
+def _runs_to_strip(runs: Runs) -> Strip:
+    """Build a Strip with one Segment per run."""
+    return Strip([Segment(data, style) for data, style in runs])
+
+
+def _render_line(line: dict[int, Char], columns: int) -> Strip:
+    """Render a single screen line to a Strip with one segment per run."""
+    return _runs_to_strip(_line_runs(line, columns))
+
+
+def render_screen(screen: Screen, show_cursor: bool) -> list[Strip]:
+    """Convert a pyte Screen buffer to a list of Strips."""
+    lines = [_runs_to_strip(_screen_line_runs(screen, y)) for y in range(screen.lines)]
+    if show_cursor and screen.cursor.y < screen.lines:
+        y = screen.cursor.y
+        lines[y] = overlay_cursor(lines[y], screen.cursor.x)
     return lines
 
 
-class TerminalRenderable:
-    """Rich renderable wrapper for terminal screen content."""
+def overlay_cursor(strip: Strip, x: int) -> Strip:
+    """Return strip with the cell at column x drawn as the cursor (reversed).
+
+    A cursor past the end of the line, as after writing the last column, is
+    not drawn.
+    """
+    if x >= strip.cell_length:
+        return strip
+    before, cell, after = strip.divide([x, x + 1, strip.cell_length])
+    cursor = Strip(Segment.apply_style(list(cell), post_style=CURSOR_STYLE), cell.cell_length)
+    return Strip.join([before, cursor, after])
+
+
+def render_frozen_line(line: FrozenLine) -> Strip:
+    """Convert a scrollback line to a Strip."""
+    runs: Runs = []
+    offset = 0
+    for start, end, attrs in line.spans():
+        if offset < start:
+            runs.append((line.text[offset:start], None))
+        runs.append((line.text[start:end], _attr_style(attrs)))
+        offset = end
+    if offset < len(line.text):
+        runs.append((line.text[offset:], None))
+    return _runs_to_strip(runs)
+
+
+def highlight_matches(
+    strip: Strip, ranges: list[tuple[int, int]], current: tuple[int, int] | None
+) -> Strip:
+    """Return strip with the character ranges of search matches highlighted.
+
+    Segments are split at match boundaries and the match style is layered
+    over the cell style; ``current`` stands out from the other matches.
+    """
+    if not ranges:
+        return strip
+    marks = [
+        (start, end, SEARCH_CURRENT_STYLE if (start, end) == current else SEARCH_MATCH_STYLE)
+        for start, end in sorted(ranges)
+    ]
+    segments: list[Segment] = []
+    offset = 0
+    for text, style, _control in strip:
+        segments.extend(_mark_segment(text, style, offset, marks))
+        offset += len(text)
+    return Strip(segments, strip.cell_length)
+
+
+def _mark_segment(
+    text: str, style: Style | None, offset: int, marks: list[tuple[int, int, Style]]
+) -> list[Segment]:
+    """Split a segment starting at cell offset at the match marks, styling the marked parts."""
+    segments: list[Segment] = []
+    position = 0
+    for start, end, mark_style in marks:
+        cut_start = max(start - offset, position)
+        cut_end = min(end - offset, len(text))
+        if cut_start >= cut_end:
+            continue
+        if position < cut_start:
+            segments.append(Segment(text[position:cut_start], style))
+        marked = mark_style if style is None else style + mark_style
+        segments.append(Segment(text[cut_start:cut_end], marked))
+        position = cut_end
+    if position < len(text):
+        segments.append(Segment(text[position:], style))
+    return segments
+
+
+class ScreenRenderer:
+    """Incremental pyte Screen renderer that caches a Strip per line.
+
+    Only lines in ``screen.dirty`` are rebuilt on each call, and the dirty
+    set is cleared once they have been rendered. The cursor is not part of
+    the cached lines; it is drawn over them with ``overlay_cursor``, so
+    moving it rebuilds nothing.
+    """
+
+    def __init__(self) -> None:
+        self._lines: list[Strip] = []
+        self._size: tuple[int, int] = (0, 0)
+
+    def invalidate(self) -> None:
+        """Force the next render to rebuild every line."""
+        self._size = (0, 0)
 
-    def __init__(self, text_lines: list[Text]) -> None:
-        self._lines = text_lines
+    def render(self, screen: Screen) -> list[Strip]:
+        """Re-render dirty lines of the screen and return all cached lines."""
+        for y in self._dirty_rows(screen):
+            self._lines[y] = _runs_to_strip(_screen_line_runs(screen, y))
+        screen.dirty.clear()
+        return list(self._lines)
 
-    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
-        yield from self._lines
+    def _dirty_rows(self, screen: Screen) -> set[int]:
+        """Return the rows that must be re-rendered for this frame."""
+        size = (screen.lines, screen.columns)
+        if size != self._size:
+            self._size = size
+            self._lines = [Strip([]) for _ in range(screen.lines)]
+            return set(range(screen.lines))
+        return {y for y in screen.dirty if 0 <= y < screen.lines}
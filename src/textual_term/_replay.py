@@ -0,0 +1,255 @@
+"""Replay of recorded sessions through the screen and renderer, with keyframe seeking."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import copy
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import pyte
+
+from textual_term._recorder import ASCIICAST_VERSION
+from textual_term._renderer import ScreenRenderer
+from textual_term._screen import ResponsiveScreen
+
+if TYPE_CHECKING:
+    from textual.strip import Strip
+
+DEFAULT_KEYFRAME_INTERVAL = 30.0
+DEFAULT_REPLAY_FPS = 30
+
+
+@dataclass
+class Recording:
+    """A recorded session: the initial size and its output and resize events.
+
+    ``times`` holds each event's offset in seconds; an event's ``data`` is
+    raw output bytes, or ``(width, height)`` for a resize.
+    """
+
+    width: int
+    height: int
+    times: list[float] = field(default_factory=list)
+    events: list[bytes | tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Offset of the last event in seconds."""
+        return self.times[-1] if self.times else 0.0
+
+
+def load_cast(path: str) -> Recording:
+    """Read an asciicast v2 file. Input and marker events are skipped."""
+    with open(path, encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != ASCIICAST_VERSION:
+            raise ValueError(f"{path}: not an asciicast v2 recording")
+        recording = Recording(header["width"], header["height"])
+        for line in file:
+            if not line.strip():
+                continue
+            when, kind, data = json.loads(line)
+            if kind == "o":
+                recording.times.append(when)
+                recording.events.append(data.encode("utf-8"))
+            elif kind == "r":
+                width, height = data.split("x")
+                recording.times.append(when)
+                recording.events.append((int(width), int(height)))
+    return recording
+
+
+class Keyframes:
+    """Copies of a replayed screen, taken every ``interval`` seconds of recording time.
+
+    A keyframe is only taken where the parser is between escape sequences,
+    so parsing can resume from it with a fresh stream.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._times: list[float] = []
+        self._screens: list[tuple[int, ResponsiveScreen]] = []
+
+    def __len__(self) -> int:
+        return len(self._screens)
+
+    def due(self, when: float) -> bool:
+        """True if a keyframe should be taken before the event at when."""
+        last = self._times[-1] if self._times else 0.0
+        return when - last >= self.interval
+
+    def take(self, index: int, when: float, stream: pyte.ByteStream) -> None:
+        """Copy the stream's screen as the state before event index, at when."""
+        if self._times and when <= self._times[-1]:
+            return
+        pending, _flag = stream.utf8_decoder.getstate()
+        if pending or not stream._taking_plain_text:
+            return
+        self._times.append(when)
+        self._screens.append((index, copy.deepcopy(stream.listener)))
+
+    def before(self, position: float) -> tuple[int, float, ResponsiveScreen] | None:
+        """Return the event index, time and screen of the last keyframe at or before position."""
+        slot = bisect.bisect_right(self._times, position) - 1
+        if slot < 0:
+            return None
+        index, screen = self._screens[slot]
+        return index, self._times[slot], screen
+
+
+class ReplayEngine:
+    """Feeds a Recording through a ResponsiveScreen and renders frames from it.
+
+    The engine owns a screen positioned at ``position`` seconds into the
+    recording, and takes ``keyframes`` while output is fed. ``seek()``
+    restores the nearest earlier keyframe and parses forward from there, so
+    jumping around a long recording costs at most one ``keyframe_interval``
+    of parsing once that part has been played or sought through;
+    ``build_keyframes()`` does the first pass up front.
+    """
+
+    def __init__(
+        self, recording: Recording, keyframe_interval: float = DEFAULT_KEYFRAME_INTERVAL
+    ) -> None:
+        self.recording = recording
+        self.keyframes = Keyframes(keyframe_interval)
+        self.renderer = ScreenRenderer()
+        self.screen = self._new_screen()
+        self.stream = pyte.ByteStream(self.screen)
+        self.position = 0.0
+        self._index = 0
+        self._speed: float | None = 1.0
+        self._anchor: tuple[float, float] | None = None
+
+    @property
+    def finished(self) -> bool:
+        """True once every event has been applied."""
+        return self._index >= len(self.recording.events)
+
+    @property
+    def keyframe_count(self) -> int:
+        """Number of keyframes taken so far."""
+        return len(self.keyframes)
+
+    @property
+    def speed(self) -> float | None:
+        """Playback speed multiplier; None plays as fast as possible."""
+        return self._speed
+
+    @speed.setter
+    def speed(self, speed: float | None) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed}")
+        self._speed = speed
+        self._anchor = None
+
+    def seek(self, position: float) -> None:
+        """Move to position seconds, restoring the nearest keyframe if that is closer."""
+        position = max(0.0, position)
+        keyframe = self.keyframes.before(position)
+        if position < self.position or (keyframe is not None and keyframe[0] > self._index):
+            self._restore(keyframe)
+        self.advance_to(position)
+        self._anchor = None
+
+    def advance_to(self, position: float) -> None:
+        """Apply every event up to position seconds."""
+        stop = bisect.bisect_right(self.recording.times, position)
+        self._apply(stop)
+        self.position = max(self.position, position)
+
+    def build_keyframes(self) -> None:
+        """Parse the whole recording once to take every keyframe, then return to the start."""
+        self.advance_to(self.recording.duration)
+        self.seek(0.0)
+
+    def frame(self) -> tuple[list[Strip], tuple[int, int]]:
+        """Render the screen's changed rows; returns every row and the cursor position."""
+        cursor = self.screen.cursor
+        return self.renderer.render(self.screen), (cursor.x, cursor.y)
+
+    async def play(
+        self,
+        on_frame: Callable[[list[Strip], tuple[int, int]], None],
+        speed: float | None = 1.0,
+        max_fps: float = DEFAULT_REPLAY_FPS,
+    ) -> None:
+        """Play from the current position to the end, posting at most max_fps frames a second.
+
+        ``speed`` and ``seek()`` may be changed while playing. Without a speed the
+        recording is parsed as fast as possible, yielding once per frame.
+        """
+        self.speed = speed
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / max_fps
+        while not self.finished:
+            if self._speed is None:
+                self._apply_for(interval)
+            else:
+                if self._anchor is None:
+                    self._anchor = (loop.time(), self.position)
+                started, origin = self._anchor
+                self.advance_to(origin + (loop.time() - started) * self._speed)
+            on_frame(*self.frame())
+            await asyncio.sleep(self._idle_time(interval))
+        on_frame(*self.frame())
+
+    def _idle_time(self, interval: float) -> float:
+        """Seconds until the next frame is worth rendering at the current speed."""
+        if self._speed is None or self.finished:
+            return 0.0
+        wait = (self.recording.times[self._index] - self.position) / self._speed
+        return min(max(wait, interval), 1.0)
+
+    def _apply_for(self, seconds: float) -> None:
+        """Apply events for about the given wall-clock time."""
+        deadline = time.perf_counter() + seconds
+        while not self.finished and time.perf_counter() < deadline:
+            self._apply(min(self._index + 64, len(self.recording.events)))
+        self.position = self.recording.times[self._index - 1] if self._index else 0.0
+
+    def _apply(self, stop: int) -> None:
+        """Feed events up to index stop, batching consecutive output and taking keyframes."""
+        times = self.recording.times
+        events = self.recording.events
+        batch: list[bytes] = []
+        for index in range(self._index, stop):
+            event = events[index]
+            if isinstance(event, tuple):
+                self._feed(batch)
+                self.screen.resize(event[1], event[0])
+            else:
+                if self.keyframes.due(times[index]):
+                    self._feed(batch)
+                    self.keyframes.take(index, times[index], self.stream)
+                batch.append(event)
+        self._feed(batch)
+        self._index = max(self._index, stop)
+
+    def _feed(self, batch: list[bytes]) -> None:
+        if batch:
+            self.stream.feed(b"".join(batch))
+            batch.clear()
+
+    def _restore(self, keyframe: tuple[int, float, ResponsiveScreen] | None) -> None:
+        """Reset the screen to a keyframe, or to the start without one."""
+        if keyframe is None:
+            self.screen = self._new_screen()
+            self._index = 0
+            self.position = 0.0
+        else:
+            self._index, self.position, snapshot = keyframe
+            self.screen = copy.deepcopy(snapshot)
+        self.stream = pyte.ByteStream(self.screen)
+        self.renderer.invalidate()
+
+    def _new_screen(self) -> ResponsiveScreen:
+        return ResponsiveScreen(
+            self.recording.width, self.recording.height, write_callback=lambda _data: None
+        )
@@ -0,0 +1,171 @@
+"""Deficit round-robin scheduling of output parsing across terminals."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyte
+
+    from textual_term._queue import OutputQueue
+
+DEFAULT_TURN_BUDGET = 0.005
+FEED_SLICE = 4 * 1024
+
+_shared: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OutputScheduler] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass
+class TurnStats:
+    """How one terminal has used its turns, for tuning ``turn_budget``."""
+
+    turns: int = 0
+    bytes_fed: int = 0
+    busy_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    deficit: float = 0.0
+
+
+class TurnSlot:
+    """A terminal's place in an OutputScheduler, with its quantum and deficit."""
+
+    def __init__(self, scheduler: OutputScheduler, quantum: float) -> None:
+        self.scheduler = scheduler
+        self.quantum = quantum
+        self.deficit = 0.0
+        self.stats = TurnStats()
+
+    @asynccontextmanager
+    async def turn(self, backlogged: Callable[[], bool]) -> AsyncIterator[None]:
+        """Hold a turn for the body; backlogged() says at the end whether work remains."""
+        await self.scheduler.acquire(self)
+        try:
+            yield
+        finally:
+            self.scheduler.release(self, backlogged())
+
+    def charge(self, seconds: float, nbytes: int = 0) -> None:
+        """Spend seconds of the current turn, having parsed nbytes."""
+        self.deficit -= seconds
+        self.stats.busy_seconds += seconds
+        self.stats.bytes_fed += nbytes
+
+    async def call(self, work: Callable[[], None], backlogged: Callable[[], bool]) -> None:
+        """Run work within a turn and charge the time it took."""
+        async with self.turn(backlogged):
+            started = time.perf_counter()
+            work()
+            self.charge(time.perf_counter() - started)
+
+    async def feed(
+        self,
+        stream: pyte.ByteStream,
+        pieces: deque[bytes],
+        queue: OutputQueue,
+        on_feed: Callable[[float, float, int], None],
+    ) -> None:
+        """Feed pieces to stream over as many turns as it takes.
+
+        Pieces waiting for a turn are held on queue, so they count against
+        its output budget until they are parsed. on_feed(started, ended,
+        size) is called after each piece.
+        """
+        queue.hold(sum(map(len, pieces)))
+        try:
+            while pieces:
+                async with self.turn(lambda: bool(pieces) or not queue.empty()):
+                    while pieces and self.deficit > 0:
+                        piece = pieces.popleft()
+                        started = time.perf_counter()
+                        stream.feed(piece)
+                        ended = time.perf_counter()
+                        self.charge(ended - started, len(piece))
+                        on_feed(started, ended, len(piece))
+                        queue.release(len(piece))
+                if pieces:
+                    await asyncio.sleep(0)
+        finally:
+            queue.release(sum(map(len, pieces)))
+
+
+class OutputScheduler:
+    """Hands out parse-and-render turns to terminals in deficit round-robin order.
+
+    Only one terminal holds a turn at a time; the others queue in arrival
+    order. Each turn adds the slot's ``quantum`` (seconds) to its deficit,
+    and the holder keeps working while the deficit is positive. Overrunning
+    the budget leaves a negative deficit that the next turn pays back, so a
+    terminal gets its share of time however uneven its work is. A slot
+    that runs out of work forfeits what it has left.
+    """
+
+    def __init__(self) -> None:
+        self._holder: TurnSlot | None = None
+        self._waiting: deque[tuple[TurnSlot, asyncio.Future[None]]] = deque()
+
+    def register(self, quantum: float = DEFAULT_TURN_BUDGET) -> TurnSlot:
+        """Return a new slot that receives quantum seconds per turn."""
+        return TurnSlot(self, quantum)
+
+    async def acquire(self, slot: TurnSlot) -> None:
+        """Wait for slot's turn and credit its quantum."""
+        started = time.perf_counter()
+        if self._holder is not None or self._waiting:
+            future = asyncio.get_running_loop().create_future()
+            self._waiting.append((slot, future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                self._abandon(slot, future)
+                raise
+        self._holder = slot
+        slot.deficit += slot.quantum
+        waited = time.perf_counter() - started
+        stats = slot.stats
+        stats.turns += 1
+        stats.wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+    def release(self, slot: TurnSlot, backlogged: bool) -> None:
+        """End slot's turn and wake the next waiter. An idle slot's credit is dropped."""
+        if not backlogged:
+            slot.deficit = 0.0
+        slot.stats.deficit = slot.deficit
+        if self._holder is slot:
+            self._holder = None
+            self._wake_next()
+
+    def _abandon(self, slot: TurnSlot, future: asyncio.Future[None]) -> None:
+        """Clean up after a waiter was cancelled, passing on a turn it was already given."""
+        if future.done() and not future.cancelled():
+            self._holder = slot
+            self.release(slot, False)
+            return
+        self._waiting = deque(entry for entry in self._waiting if entry[1] is not future)
+
+    def _wake_next(self) -> None:
+        while self._waiting:
+            slot, future = self._waiting.popleft()
+            if not future.done():
+                self._holder = slot
+                future.set_result(None)
+                return
+
+
+def shared_scheduler() -> OutputScheduler:
+    """Return the scheduler shared by every terminal on the running event loop."""
+    loop = asyncio.get_running_loop()
+    scheduler = _shared.get(loop)
+    if scheduler is None:
+        scheduler = _shared[loop] = OutputScheduler()
+    return scheduler
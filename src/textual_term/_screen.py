@@ -1,10 +1,32 @@
-"""Pyte Screen subclass that writes DSR responses back to the PTY."""
+"""Pyte Screen subclasses: DSR responses, scrollback capture and a compact array-backed buffer."""
 
 from __future__ import annotations
 
+import unicodedata
 from collections.abc import Callable
+from itertools import groupby
+from typing import TYPE_CHECKING
 
 import pyte
+from pyte import modes as mo
+from pyte.screens import Margins, wcwidth
+
+from textual_term._grid import (
+    SPACE,
+    WIDE_CHAR_WIDTH,
+    Attributes,
+    BufferView,
+    CellGrid,
+    attributes_of,
+    display_cells,
+)
+
+if TYPE_CHECKING:
+    from textual_term._scrollback import Scrollback
+
+# Private modes are stored shifted by pyte; these switch to the alternate screen.
+ALTERNATE_SCREEN_MODES = frozenset(mode << 5 for mode in (47, 1047, 1049))
+BRACKETED_PASTE_MODE = 2004 << 5
 
 
 class ResponsiveScreen(pyte.Screen):
@@ -14,12 +36,28 @@ class ResponsiveScreen(pyte.Screen):
     report_device_status() which calls write_process_input() with the response.
     The base pyte implementation is a no-op. This subclass writes the response
     back to the PTY fd so the child process receives the answer.
+
+    With a ``scrollback``, lines that scroll off the top of the screen (or
+    are dropped from the top by a resize) are appended to it, except while
+    the alternate screen is active.
     """
 
-    def __init__(self, columns: int, lines: int, write_callback: Callable[[str], None]) -> None:
+    def __init__(
+        self,
+        columns: int,
+        lines: int,
+        write_callback: Callable[[str], None],
+        scrollback: Scrollback | None = None,
+    ) -> None:
+        self.scrollback = scrollback
         super().__init__(columns, lines)
         self._write_callback = write_callback
 
+    @property
+    def display(self) -> list[str]:
+        """A list of screen lines as unicode strings."""
+        return [self.row_text(y) for y in range(self.lines)]
+
     def write_process_input(self, data: str) -> None:
         """Write DSR response data back to the PTY stdin."""
         self._write_callback(data)
@@ -28,3 +66,233 @@ class ResponsiveScreen(pyte.Screen):
         """Override to strip the 'private' kwarg that pyte may pass."""
         kwargs.pop("private", None)
         super().set_margins(*args, **kwargs)
+
+    def index(self) -> None:
+        """Move the cursor down, saving the top line if it scrolls off the screen."""
+        self._save_scrolled_line()
+        super().index()
+
+    def resize(self, lines: int | None = None, columns: int | None = None) -> None:
+        """Resize the screen, saving lines dropped from the top."""
+        if lines and lines < self.lines:
+            self._save_top_rows(self.lines - lines)
+        super().resize(lines, columns)
+
+    def row_spans(self, y: int) -> tuple[str, list[tuple[int, Attributes]]]:
+        """Return the text of row y and its (length, attributes) runs."""
+        line = self.buffer[y]
+        default = self.default_char
+        cells = [line.get(x, default) for x in range(self.columns)]
+        texts = display_cells([char.data for char in cells])
+        spans: list[tuple[int, Attributes]] = []
+        start = 0
+        for attrs, group in groupby(cells, attributes_of):
+            end = start + sum(1 for _ in group)
+            spans.append((sum(map(len, texts[start:end])), attrs))
+            start = end
+        return "".join(texts), spans
+
+    def row_text(self, y: int) -> str:
+        """Return the text of row y, as in ``display``."""
+        line = self.buffer[y]
+        return "".join(display_cells([line[x].data for x in range(self.columns)]))
+
+    def _save_scrolled_line(self) -> None:
+        """Append the top line to the scrollback if an index is about to scroll it away."""
+        if self.scrollback is None or ALTERNATE_SCREEN_MODES & self.mode:
+            return
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        if top == 0 and self.cursor.y == bottom:
+            self._save_top_rows(1)
+
+    def _save_top_rows(self, count: int) -> None:
+        if self.scrollback is None or ALTERNATE_SCREEN_MODES & self.mode:
+            return
+        default = attributes_of(self.default_char)
+        for y in range(min(count, self.lines)):
+            text, spans = self.row_spans(y)
+            self.scrollback.append(text, spans, default)
+
+
+class CompactScreen(ResponsiveScreen):
+    """ResponsiveScreen that stores cells in a CellGrid of typed arrays instead of dicts of Chars.
+
+    Scrolling, line insert/delete and erase operations move or fill whole
+    rows and array slices. ``buffer`` is a read/write view that builds Chars
+    on demand, so pyte code that is not overridden here keeps working. Unlike
+    pyte, erasing the display fills every cell with the cursor attributes.
+    """
+
+    def __init__(
+        self,
+        columns: int,
+        lines: int,
+        write_callback: Callable[[str], None],
+        scrollback: Scrollback | None = None,
+    ) -> None:
+        self.grid = CellGrid()
+        super().__init__(columns, lines, write_callback, scrollback)
+        self.buffer = BufferView(self)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def reset(self) -> None:
+        """Reset the terminal state and blank every row."""
+        super().reset()
+        self.grid.reset(self.lines, self.columns, self.default_char)
+
+    def resize(self, lines: int | None = None, columns: int | None = None) -> None:
+        """Resize the screen, dropping lines from the top and columns from the right.
+
+        The cursor is kept on the screen, as the grid's rows are indexed by it.
+        """
+        columns = columns or self.columns
+        super().resize(lines, self.columns)
+        self.grid.resize(self.lines, columns, self.default_char)
+        if columns != self.columns:
+            self.dirty.update(range(self.lines))
+            self.columns = columns
+            self.set_margins()
+        self.ensure_vbounds()
+        self.ensure_hbounds()
+
+    def draw(self, data: str) -> None:
+        """Display characters at the cursor, writing plain ASCII runs as array slices."""
+        data = data.translate(self.g1_charset if self.charset else self.g0_charset)
+        attr_id = self.grid.held_id(self.cursor.attrs)
+        if data.isascii() and data.isprintable() and mo.IRM not in self.mode:
+            _draw_ascii(self, data, attr_id)
+        else:
+            for char in data:
+                if not _draw_char(self, char, attr_id):
+                    break
+        self.dirty.add(self.cursor.y)
+
+    def index(self) -> None:
+        """Move the cursor down, scrolling the region up at the bottom margin."""
+        self._save_scrolled_line()
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        if self.cursor.y == bottom:
+            self._scroll(top, bottom, 1)
+        else:
+            self.cursor_down()
+
+    def reverse_index(self) -> None:
+        """Move the cursor up, scrolling the region down at the top margin."""
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        if self.cursor.y == top:
+            self._scroll(top, bottom, -1)
+        else:
+            self.cursor_up()
+
+    def insert_lines(self, count: int | None = None) -> None:
+        """Insert blank lines at the cursor; lines pushed past the bottom margin are lost."""
+        self._scroll_from_cursor(-(count or 1))
+
+    def delete_lines(self, count: int | None = None) -> None:
+        """Delete lines at the cursor; blank lines enter at the bottom margin."""
+        self._scroll_from_cursor(count or 1)
+
+    def insert_characters(self, count: int | None = None) -> None:
+        """Insert blank cells at the cursor, shifting the rest of the line right."""
+        self._shift(count or 1)
+
+    def delete_characters(self, count: int | None = None) -> None:
+        """Delete cells at the cursor, shifting the rest of the line left."""
+        self._shift(-(count or 1))
+
+    def erase_characters(self, count: int | None = None) -> None:
+        """Erase cells from the cursor with the cursor attributes."""
+        self._erase(self.cursor.x, self.cursor.x + (count or 1))
+
+    def erase_in_line(self, how: int = 0, private: bool = False) -> None:
+        """Erase part or all of the cursor line with the cursor attributes."""
+        x = self.cursor.x
+        bounds = {0: (x, self.columns), 1: (0, x + 1), 2: (0, self.columns)}
+        self._erase(*bounds.get(how, (x, x)))
+
+    def erase_in_display(self, how: int = 0, *args: object, **kwargs: object) -> None:
+        """Erase part or all of the display with the cursor attributes."""
+        if how not in (0, 1, 2, 3):
+            return
+        start = self.cursor.y + 1 if how == 0 else 0
+        end = self.cursor.y if how == 1 else self.lines
+        self.dirty.update(range(start, end))
+        attr_id = self.grid.held_id(self.cursor.attrs)
+        for row in self.grid.rows[start:end]:
+            row.fill(0, self.columns, SPACE, attr_id)
+        if how in (0, 1):
+            self.erase_in_line(how)
+
+    def row_spans(self, y: int) -> tuple[str, list[tuple[int, Attributes]]]:
+        """Return the text of row y and its (length, attributes) runs, read from the arrays."""
+        return self.grid.spans(y)
+
+    def row_text(self, y: int) -> str:
+        """Return the text of row y, as in ``display``."""
+        return self.grid.rows[y].text(0, self.columns)
+
+    def _erase(self, start: int, end: int) -> None:
+        """Fill cells [start, end) of the cursor line with spaces in the cursor attributes."""
+        self.dirty.add(self.cursor.y)
+        attr_id = self.grid.held_id(self.cursor.attrs)
+        self.grid.rows[self.cursor.y].fill(start, min(end, self.columns), SPACE, attr_id)
+
+    def _scroll(self, top: int, bottom: int, count: int, first_dirty: int = 0) -> None:
+        """Scroll rows [top, bottom] up by count (down if negative), dirtying rows from first_dirty
+        down as pyte does."""
+        self.dirty.update(range(first_dirty, self.lines))
+        self.grid.scroll(top, bottom, count, self.default_char)
+
+    def _scroll_from_cursor(self, count: int) -> None:
+        """Scroll the region from the cursor line to the bottom margin up by count (down if
+        negative) and return the carriage, if the cursor is within the margins."""
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        if top <= self.cursor.y <= bottom:
+            self._scroll(self.cursor.y, bottom, count, self.cursor.y)
+            self.carriage_return()
+
+    def _shift(self, count: int) -> None:
+        """Shift the cursor line right from the cursor by count cells (left if negative)."""
+        self.dirty.add(self.cursor.y)
+        attr_id = self.grid.attr_id(self.default_char)
+        self.grid.rows[self.cursor.y].shift(self.cursor.x, count, attr_id)
+
+
+def _draw_ascii(screen: CompactScreen, data: str, attr_id: int) -> None:
+    """Draw printable ASCII on screen, one array slice per row segment."""
+    cursor = screen.cursor
+    offset = 0
+    while offset < len(data):
+        _wrap(screen, 1)
+        count = min(len(data) - offset, screen.columns - cursor.x)
+        screen.grid.rows[cursor.y].write(cursor.x, data[offset : offset + count], attr_id)
+        cursor.x += count
+        offset += count
+
+
+def _draw_char(screen: CompactScreen, char: str, attr_id: int) -> bool:
+    """Draw one character on screen as pyte does. Returns False for unprintable characters."""
+    width = wcwidth(char)
+    _wrap(screen, max(width, 0))
+    cursor = screen.cursor
+    if width == 0 and unicodedata.combining(char):
+        screen.grid.combine(cursor.y, cursor.x, char)
+        return True
+    if width not in (1, WIDE_CHAR_WIDTH):
+        return False
+    if mo.IRM in screen.mode:
+        screen.insert_characters(width)
+    screen.grid.rows[cursor.y].put(cursor.x, char, width, attr_id)
+    cursor.x = min(cursor.x + width, screen.columns)
+    return True
+
+
+def _wrap(screen: CompactScreen, width: int) -> None:
+    """At the right margin, wrap to the next line if autowrap is on, else back up width cells."""
+    if screen.cursor.x < screen.columns:
+        return
+    if mo.DECAWM in screen.mode:
+        screen.dirty.add(screen.cursor.y)
+        screen.carriage_return()
+        screen.linefeed()
+    else:
+        screen.cursor.x -= width
@@ -0,0 +1,194 @@
+"""Bounded scrollback history of lines that scrolled off the top of the screen."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING
+
+from textual_term._search import BLOCK_LINES, find_in_lines
+
+if TYPE_CHECKING:
+    import re
+
+    from textual_term._grid import Attributes
+    from textual_term._search import SearchIndex, SearchMatch
+    from textual_term._spill import SpillFile
+
+DEFAULT_SCROLLBACK_LINES = 10_000
+# Rough per-run cost used for the byte budget: a length and an attribute reference.
+RUN_BYTES = 16
+MAX_INTERNED_ATTRIBUTES = 4096
+
+
+class FrozenLine:
+    """One line of history: its text plus run-length attribute spans.
+
+    ``runs`` alternates run lengths (in characters of ``text``) and shared
+    attribute tuples; text after the last run is unstyled. Trailing blanks
+    are not stored, and a line without any styling has no runs at all.
+    """
+
+    __slots__ = ("text", "runs")
+
+    def __init__(self, text: str, runs: tuple[int | Attributes, ...] = ()) -> None:
+        self.text = text
+        self.runs = runs
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate storage cost, as counted against a byte budget."""
+        return len(self.text) + RUN_BYTES * (len(self.runs) // 2)
+
+    def spans(self) -> list[tuple[int, int, Attributes]]:
+        """Return (start, end, attributes) for every run."""
+        spans: list[tuple[int, int, Attributes]] = []
+        start = 0
+        for index in range(0, len(self.runs), 2):
+            end = start + self.runs[index]  # type: ignore[operator]
+            spans.append((start, end, self.runs[index + 1]))  # type: ignore[arg-type]
+            start = end
+        return spans
+
+
+class Scrollback:
+    """Oldest-first evicting history bounded by a line count and an optional byte budget.
+
+    Lines are appended by the screen (possibly on the parser thread) and read
+    by the widget, so access is guarded by a lock. With a ``spill`` file,
+    evicted lines are written to disk instead of dropped, and indices cover
+    the spilled lines first, then the ones in memory. With a search
+    ``index``, every committed line is also added to it.
+    """
+
+    def __init__(
+        self,
+        max_lines: int = DEFAULT_SCROLLBACK_LINES,
+        max_bytes: int | None = None,
+        spill: SpillFile | None = None,
+        index: SearchIndex | None = None,
+    ) -> None:
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.appended = 0
+        self._spill = spill
+        self._index = index
+        self._lines: deque[FrozenLine] = deque()
+        self._attributes: dict[Attributes, Attributes] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._lines)
+
+    @property
+    def spill(self) -> SpillFile | None:
+        """The on-disk tier evicted lines are written to, if any."""
+        return self._spill
+
+    @property
+    def first_line(self) -> int:
+        """Absolute number of the oldest line still held (see SearchMatch)."""
+        return self.appended - len(self)
+
+    @property
+    def _spilled(self) -> int:
+        return self._spill.count if self._spill is not None else 0
+
+    def append(self, text: str, spans: list[tuple[int, Attributes]], default: Attributes) -> None:
+        """Freeze a line given as text and (length, attributes) runs, then evict as needed."""
+        line = self._freeze(text, spans, default)
+        with self._lock:
+            if self.max_lines <= 0:
+                return
+            self._lines.append(line)
+            self.nbytes += line.nbytes
+            if self._index is not None:
+                self._index.add(self.appended, line.text)
+            self.appended += 1
+            while len(self._lines) > self.max_lines or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._lines) > 1
+            ):
+                evicted = self._lines.popleft()
+                self.nbytes -= evicted.nbytes
+                if self._spill is not None:
+                    self._spill.append(evicted)
+                elif self._index is not None and self.first_line % BLOCK_LINES == 0:
+                    self._index.discard_before(self.first_line)
+
+    def lines(self, start: int, stop: int) -> list[FrozenLine]:
+        """Return history lines [start, stop), oldest first."""
+        with self._lock:
+            return self._slice(start, stop)
+
+    def find(self, pattern: re.Pattern[str], literal: str | None = None) -> list[SearchMatch]:
+        """Return every match of pattern, using the index to skip blocks without ``literal``."""
+        with self._lock:
+            first = self.first_line
+            if self._index is None:
+                ranges = [(first, self.appended)]
+            else:
+                ranges = self._index.candidates(literal, first, self.appended)
+            matches: list[SearchMatch] = []
+            for start, stop in ranges:
+                texts = [line.text for line in self._slice(start - first, stop - first)]
+                matches.extend(find_in_lines(pattern, texts, start))
+            return matches
+
+    def _slice(self, start: int, stop: int) -> list[FrozenLine]:
+        """Return lines [start, stop) from the disk and memory tiers; the lock must be held."""
+        spilled = self._spilled
+        stop = min(stop, spilled + len(self._lines))
+        on_disk = range(max(start, 0), min(stop, spilled))
+        in_memory = range(max(start, spilled), stop)
+        lines = [self._spill.line(index) for index in on_disk] if self._spill is not None else []
+        lines.extend(self._lines[index - spilled] for index in in_memory)
+        return lines
+
+    def clear(self) -> None:
+        """Forget all history, deleting any spilled lines."""
+        with self._lock:
+            self._lines.clear()
+            self.nbytes = 0
+            if self._spill is not None:
+                self._spill.clear()
+            if self._index is not None:
+                self._index.clear()
+
+    def close(self) -> None:
+        """Release the on-disk tier; spilled lines are deleted, in-memory lines are kept.
+
+        Lines evicted after this are dropped instead of spilled.
+        """
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def _freeze(
+        self, text: str, spans: list[tuple[int, Attributes]], default: Attributes
+    ) -> FrozenLine:
+        """Strip trailing blanks and build the compact run tuple.
+
+        ``spans`` must not contain two adjacent runs with equal attributes.
+        """
+        if spans and spans[-1][1] == default:
+            # Text past the last run is unstyled, so a trailing default run is implied.
+            head = len(text) - spans.pop()[0]
+            text = text[:head] + text[head:].rstrip(" ")
+        if all(attrs == default for _length, attrs in spans):
+            return FrozenLine(text)
+        runs: list[int | Attributes] = []
+        for length, attrs in spans:
+            runs.append(length)
+            runs.append(self._intern(attrs))
+        return FrozenLine(text, tuple(runs))
+
+    def _intern(self, attrs: Attributes) -> Attributes:
+        """Share one tuple per distinct attribute combination."""
+        shared = self._attributes.get(attrs)
+        if shared is None:
+            if len(self._attributes) >= MAX_INTERNED_ATTRIBUTES:
+                self._attributes.clear()
+            shared = self._attributes.setdefault(attrs, attrs)
+        return shared
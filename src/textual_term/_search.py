@@ -0,0 +1,108 @@
+"""Incremental search index over scrollback lines."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+BLOCK_LINES = 256
+BLOOM_BITS = 8192
+
+
+@dataclass(frozen=True, order=True)
+class SearchMatch:
+    """A match on an absolute line number, from character ``start`` to ``end``.
+
+    Line numbers count every line ever committed to the scrollback, so they
+    stay valid when old lines are evicted: scrollback line ``i`` is number
+    ``scrollback.first_line + i`` and screen row ``y`` is
+    ``scrollback.appended + y``.
+    """
+
+    line: int
+    start: int
+    end: int
+
+
+class SearchIndex:
+    """Per-block trigram Bloom filters over committed lines.
+
+    Lines are grouped into blocks of ``BLOCK_LINES`` consecutive line
+    numbers. When a block is complete, the lower-cased trigrams of its text
+    are hashed into a ``BLOOM_BITS``-bit filter, so indexing costs one pass
+    over each line and a block takes 1 KiB whatever its content. A literal
+    query only scans blocks whose filter has every trigram of the pattern,
+    plus the block still being filled.
+    """
+
+    def __init__(self) -> None:
+        self._blooms: dict[int, int] = {}
+        self._pending: list[str] = []
+
+    def add(self, number: int, text: str) -> None:
+        """Index the line committed as ``number``; numbers must be consecutive."""
+        self._pending.append(text)
+        if number % BLOCK_LINES == BLOCK_LINES - 1:
+            self._blooms[number // BLOCK_LINES] = _bloom(_trigrams("\n".join(self._pending)))
+            self._pending = []
+
+    def discard_before(self, number: int) -> None:
+        """Drop filters of blocks that lie entirely before line ``number``."""
+        for block in [block for block in self._blooms if (block + 1) * BLOCK_LINES <= number]:
+            del self._blooms[block]
+
+    def clear(self) -> None:
+        """Drop every filter."""
+        self._blooms.clear()
+        self._pending = []
+
+    def candidates(self, literal: str | None, first: int, stop: int) -> list[tuple[int, int]]:
+        """Return the [start, stop) line-number ranges that may contain ``literal``.
+
+        Without a literal (or one shorter than three characters) every line is a
+        candidate. Adjacent candidate blocks are merged into one range.
+        """
+        grams = _trigrams(literal) if literal else set()
+        if not grams:
+            return [(first, stop)] if first < stop else []
+        mask = _bloom(grams)
+        ranges: list[tuple[int, int]] = []
+        for block in range(first // BLOCK_LINES, (stop - 1) // BLOCK_LINES + 1):
+            bloom = self._blooms.get(block)
+            if bloom is not None and bloom & mask != mask:
+                continue
+            start = max(block * BLOCK_LINES, first)
+            end = min((block + 1) * BLOCK_LINES, stop)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+
+def compile_pattern(pattern: str, regex: bool, ignore_case: bool) -> re.Pattern[str]:
+    """Compile a search pattern; plain patterns match literally."""
+    return re.compile(pattern if regex else re.escape(pattern), re.IGNORECASE if ignore_case else 0)
+
+
+def find_in_lines(pattern: re.Pattern[str], texts: list[str], first: int) -> list[SearchMatch]:
+    """Return every non-empty match in ``texts``, numbering lines from ``first``."""
+    return [
+        SearchMatch(first + offset, match.start(), match.end())
+        for offset, text in enumerate(texts)
+        for match in pattern.finditer(text)
+        if match.end() > match.start()
+    ]
+
+
+def _trigrams(text: str) -> set[tuple[str, str, str]]:
+    lowered = text.lower()
+    return set(zip(lowered, lowered[1:], lowered[2:]))
+
+
+def _bloom(grams: set[tuple[str, str, str]]) -> int:
+    bits = bytearray(BLOOM_BITS // 8)
+    for gram in grams:
+        bit = hash(gram) % BLOOM_BITS
+        bits[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(bits, "little")
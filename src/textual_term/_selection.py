@@ -0,0 +1,144 @@
+"""Search results in the terminal view: the selected match and highlighting."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from collections.abc import Callable
+
+from textual.strip import Strip
+
+from textual_term._history import HistoryView
+from textual_term._renderer import highlight_matches
+from textual_term._screen import ResponsiveScreen
+from textual_term._scrollback import Scrollback
+from textual_term._search import SearchMatch, compile_pattern, find_in_lines
+
+
+class SearchSelection:
+    """The matches of the last search, the selected one, and their highlighting.
+
+    ``find()`` searches the scrollback and the attached screen; ``next()``
+    and ``previous()`` select a match and scroll the history view to it.
+    Highlighted rows are cached by line number, so a row whose text and
+    selection did not change keeps the same Strip from frame to frame.
+    ``rows`` returns the number of rows in view and ``on_change`` redisplays
+    them after the results or the selection change.
+    """
+
+    def __init__(
+        self,
+        scrollback: Scrollback,
+        history: HistoryView,
+        rows: Callable[[], int],
+        on_change: Callable[[], None],
+    ) -> None:
+        self._scrollback = scrollback
+        self._history = history
+        self._rows = rows
+        self._on_change = on_change
+        self._screen: ResponsiveScreen | None = None
+        self._lock: threading.Lock | None = None
+        self._matches: list[SearchMatch] = []
+        self._lines: dict[int, list[SearchMatch]] = {}
+        self._current: int | None = None
+        self._highlighted: dict[int, tuple[Strip, tuple[int, int] | None, Strip]] = {}
+
+    @property
+    def matches(self) -> list[SearchMatch]:
+        """The matches of the last search, in line order."""
+        return self._matches
+
+    def attach(self, screen: ResponsiveScreen, lock: threading.Lock | None = None) -> None:
+        """Search screen from now on, holding lock while reading it and the scrollback."""
+        self._screen = screen
+        self._lock = lock
+
+    def find(
+        self, pattern: str, regex: bool = False, ignore_case: bool = False
+    ) -> list[SearchMatch]:
+        """Find and highlight every match in the scrollback and on the screen.
+
+        Plain patterns match literally and are looked up through the search
+        index; regex patterns scan every line. An empty pattern clears the
+        search. With a lock attached, the screen and scrollback are read
+        under it, so they are searched as of the same moment.
+        """
+        matches: list[SearchMatch] = []
+        if pattern:
+            compiled = compile_pattern(pattern, regex, ignore_case)
+            with self._lock if self._lock is not None else contextlib.nullcontext():
+                matches = self._scrollback.find(compiled, None if regex else pattern)
+                if self._screen is not None:
+                    display = self._screen.display
+                    matches += find_in_lines(compiled, display, self._scrollback.appended)
+        self._matches = matches
+        self._current = None
+        self._lines = {}
+        self._highlighted = {}
+        for match in matches:
+            self._lines.setdefault(match.line, []).append(match)
+        self._on_change()
+        return matches
+
+    def next(self) -> SearchMatch | None:
+        """Select the next (newer) match, wrapping around, and scroll it into view."""
+        return self._select(1)
+
+    def previous(self) -> SearchMatch | None:
+        """Select the previous (older) match, wrapping around, and scroll it into view.
+
+        The first call after a search selects the newest match.
+        """
+        return self._select(-1)
+
+    def clear(self) -> None:
+        """Remove the results and their highlighting."""
+        self.find("")
+
+    def highlight(self, lines: list[Strip], top: int) -> list[Strip]:
+        """Highlight the matches on lines, the first of which is line number top."""
+        if not self._lines:
+            return lines
+        cached = self._highlighted
+        self._highlighted = {}
+        return [self._highlight(line, top + row, cached) for row, line in enumerate(lines)]
+
+    def _select(self, step: int) -> SearchMatch | None:
+        """Move the current match by step and scroll the view to it."""
+        if not self._matches:
+            return None
+        if self._current is None:
+            current = 0 if step > 0 else len(self._matches) - 1
+        else:
+            current = (self._current + step) % len(self._matches)
+        self._current = current
+        match = self._matches[current]
+        rows = self._rows()
+        top = self._history.top()
+        if top <= match.line < top + rows:
+            self._on_change()
+        else:
+            self._history.offset = self._scrollback.appended - match.line + rows // 2
+        return match
+
+    def _highlight(
+        self,
+        line: Strip,
+        number: int,
+        cached: dict[int, tuple[Strip, tuple[int, int] | None, Strip]],
+    ) -> Strip:
+        """Highlight the matches on line ``number``, reusing a cached result."""
+        matches = self._lines.get(number)
+        if not matches:
+            return line
+        current = None
+        if self._current is not None:
+            selected = self._matches[self._current]
+            current = (selected.start, selected.end) if selected.line == number else None
+        entry = cached.get(number)
+        if entry is None or entry[0] is not line or entry[1] != current:
+            ranges = [(match.start, match.end) for match in matches]
+            entry = (line, current, highlight_matches(line, ranges, current))
+        self._highlighted[number] = entry
+        return entry[2]
@@ -0,0 +1,168 @@
+"""Headless terminal session: a PTY and a pyte screen driven without Textual."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from types import TracebackType
+
+import pyte
+
+from textual_term._emulator import DEFAULT_OUTPUT_BUDGET, PtyEmulator
+from textual_term._screen import CompactScreen, ResponsiveScreen
+from textual_term._scrollback import DEFAULT_SCROLLBACK_LINES, Scrollback
+from textual_term._search import compile_pattern
+from textual_term._watch import ScreenWatch
+
+DEFAULT_WAIT_TIMEOUT = 10.0
+DEFAULT_IDLE_TIME = 0.2
+
+
+class TerminalSession:
+    """Runs a command in a PTY and keeps its screen up to date, for scripting and tests.
+
+    Output is parsed on the event loop as it arrives; nothing is rendered.
+    ``wait_for_text()`` and ``wait_for_idle()`` go through a ``ScreenWatch``,
+    which checks the whole screen once and after that only the rows pyte
+    marks dirty and the lines that scroll off the top, so waiting costs
+    little more than parsing however long it takes. Use it as an async context manager, or call ``start()`` and
+    ``stop()`` from a running loop::
+
+        async with TerminalSession("./install.sh") as session:
+            await session.wait_for_text("Continue? [y/N]")
+            session.send("y\\r")
+            await session.wait_for_idle()
+    """
+
+    def __init__(
+        self,
+        command: str,
+        rows: int = 24,
+        cols: int = 80,
+        *,
+        compact_screen: bool = False,
+        scrollback_lines: int = DEFAULT_SCROLLBACK_LINES,
+        output_budget: int = DEFAULT_OUTPUT_BUDGET,
+    ) -> None:
+        self._command = command
+        self._output_budget = output_budget
+        self._emulator: PtyEmulator | None = None
+        self.scrollback = Scrollback(scrollback_lines)
+        screen_class = CompactScreen if compact_screen else ResponsiveScreen
+        self.screen = screen_class(cols, rows, self._answer, scrollback=self.scrollback)
+        self.stream = pyte.ByteStream(self.screen)
+        self._pump_task: asyncio.Task | None = None  # pyright: ignore[reportMissingTypeArgument]
+        self._watch = ScreenWatch(self.screen, self.scrollback)
+
+    async def __aenter__(self) -> TerminalSession:
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    @property
+    def display(self) -> list[str]:
+        """The text of every screen row."""
+        return self.screen.display
+
+    @property
+    def exited(self) -> bool:
+        """True once the child has closed the PTY."""
+        return self._watch.closed
+
+    def start(self) -> None:
+        """Fork the PTY and start parsing its output."""
+        emulator = PtyEmulator(
+            self._command,
+            self.screen.lines,
+            self.screen.columns,
+            output_budget=self._output_budget,
+        )
+        emulator.open_pty()
+        emulator.start()
+        self._emulator = emulator
+        self._watch.last_output = asyncio.get_running_loop().time()
+        self._pump_task = asyncio.create_task(self._pump(emulator))
+
+    def stop(self) -> None:
+        """Kill the child and stop parsing. Pending waits fail with EOFError."""
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            self._pump_task = None
+        if self._emulator is not None:
+            self._emulator.stop()
+            self._emulator = None
+        self._close()
+
+    def send(self, text: str) -> None:
+        """Write text to the child, as if typed. Never blocks."""
+        if self._emulator is not None:
+            self._emulator.write_to_pty(text)
+
+    def resize(self, rows: int, cols: int) -> None:
+        """Resize the screen and the PTY."""
+        self.screen.resize(rows, cols)
+        if self._emulator is not None:
+            self._emulator.resize(rows, cols)
+
+    async def wait_for_text(
+        self,
+        pattern: str,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        *,
+        regex: bool = False,
+        ignore_case: bool = False,
+    ) -> re.Match[str]:
+        """Wait until pattern appears on a screen row and return the match.
+
+        The screen as it is now counts, then every row that changes and every
+        line that scrolls off until the pattern is found. Patterns match
+        within one row. Raises TimeoutError after timeout seconds and
+        EOFError if the child exits first.
+        """
+        compiled = compile_pattern(pattern, regex, ignore_case)
+        match = self._watch.search(compiled)
+        if match is not None:
+            return match
+        if self._watch.closed:
+            raise EOFError(f"{self._command!r} exited before {pattern!r} appeared")
+        try:
+            return await self._watch.wait(compiled, timeout)
+        except TimeoutError:
+            raise TimeoutError(f"{pattern!r} did not appear within {timeout} s") from None
+
+    async def wait_for_idle(
+        self, idle: float = DEFAULT_IDLE_TIME, timeout: float = DEFAULT_WAIT_TIMEOUT
+    ) -> None:
+        """Wait until no output has arrived for idle seconds, or the child has exited.
+
+        Raises TimeoutError if the child is still writing after timeout seconds.
+        """
+        await self._watch.idle(idle, timeout)
+
+    async def _pump(self, emulator: PtyEmulator) -> None:
+        """Feed output to the screen, checking the watch after every chunk."""
+        loop = asyncio.get_running_loop()
+        queue = emulator.output_queue
+        while True:
+            msg = await queue.get()
+            if msg[0] == "disconnect":
+                self._close()
+                return
+            if msg[0] == "stdout":
+                self.stream.feed(msg[1])
+                self._watch.output(loop.time())
+
+    def _close(self) -> None:
+        """Mark the session exited and fail every pending wait."""
+        self._watch.close(f"{self._command!r} exited")
+
+    def _answer(self, data: str) -> None:
+        """Send the screen's replies to device status queries back to the child."""
+        self.send(data)
@@ -0,0 +1,151 @@
+"""On-disk scrollback tier: append-only line segments served back through mmap."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from typing import TYPE_CHECKING, BinaryIO
+
+from textual_term._scrollback import FrozenLine
+
+if TYPE_CHECKING:
+    from textual_term._grid import Attributes
+
+# Each index entry is the end offset of one line record in the segment file.
+_OFFSET = struct.Struct("<Q")
+# A record starts with its run count, then (length, attribute id) uint32 pairs,
+# then the UTF-8 text.
+_RUN_COUNT = struct.Struct("<H")
+
+
+class SpillFile:
+    """Append-only store of FrozenLines in a segment file plus an offset index.
+
+    Lines are written through buffered files and read back through read-only
+    mmaps of both files, so reaching line ``i`` costs two index lookups and
+    one record decode regardless of how much history there is, and nothing
+    but the mapped pages is held in memory. The files live in a private
+    temporary directory that is created on the first append and removed by
+    ``clear()`` or ``close()``. Attribute tuples are stored as ids into a table kept in
+    memory for the lifetime of the files.
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        self.directory = directory
+        self.count = 0
+        self._path: str | None = None
+        self._data: BinaryIO | None = None
+        self._index: BinaryIO | None = None
+        self._data_size = 0
+        self._data_map: mmap.mmap | None = None
+        self._index_map: mmap.mmap | None = None
+        self._mapped = 0
+        self._attributes: list[Attributes] = []
+        self._attribute_ids: dict[Attributes, int] = {}
+        self._closed = False
+
+    @property
+    def path(self) -> str | None:
+        """The directory holding the segment and index files, once created."""
+        return self._path
+
+    def append(self, line: FrozenLine) -> None:
+        """Write a line to the end of the segment file. Raises ValueError once closed."""
+        if self._closed:
+            raise ValueError("spill file is closed")
+        if self._data is None or self._index is None:
+            self._data, self._index = self._open()
+        record = self._encode(line)
+        self._data.write(record)
+        self._data_size += len(record)
+        self._index.write(_OFFSET.pack(self._data_size))
+        self.count += 1
+
+    def line(self, index: int) -> FrozenLine:
+        """Return line ``index`` (0 is the oldest) read from the mapped files."""
+        if not 0 <= index < self.count:
+            raise IndexError(f"spilled line {index} out of range")
+        data_map, index_map = self._maps(index)
+        end = _OFFSET.unpack_from(index_map, index * _OFFSET.size)[0]
+        start = _OFFSET.unpack_from(index_map, (index - 1) * _OFFSET.size)[0] if index else 0
+        return self._decode(data_map[start:end])
+
+    def clear(self) -> None:
+        """Unmap and delete the files. Appending again starts a new, empty store."""
+        self._unmap()
+        for handle in (self._data, self._index):
+            if handle is not None:
+                handle.close()
+        if self._path is not None:
+            shutil.rmtree(self._path, ignore_errors=True)
+        self._data = self._index = None
+        self._path = None
+        self.count = 0
+        self._data_size = 0
+        self._attributes.clear()
+        self._attribute_ids.clear()
+
+    def close(self) -> None:
+        """Delete the files for good; later appends raise ValueError."""
+        self.clear()
+        self._closed = True
+
+    def _open(self) -> tuple[BinaryIO, BinaryIO]:
+        self._path = tempfile.mkdtemp(prefix="textual-term-scrollback-", dir=self.directory)
+        data = open(os.path.join(self._path, "lines.bin"), "w+b")
+        index = open(os.path.join(self._path, "index.bin"), "w+b")
+        return data, index
+
+    def _maps(self, index: int) -> tuple[mmap.mmap, mmap.mmap]:
+        """Return the data and index maps, remapping if line ``index`` is not mapped yet."""
+        if self._data_map is not None and self._index_map is not None and index < self._mapped:
+            return self._data_map, self._index_map
+        if self._data is None or self._index is None:
+            raise RuntimeError("spill file is closed")
+        self._unmap()
+        self._data.flush()
+        self._index.flush()
+        self._data_map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = self.count
+        return self._data_map, self._index_map
+
+    def _unmap(self) -> None:
+        for mapping in (self._data_map, self._index_map):
+            if mapping is not None:
+                mapping.close()
+        self._data_map = self._index_map = None
+        self._mapped = 0
+
+    def _encode(self, line: FrozenLine) -> bytes:
+        runs = array("I")
+        for index in range(0, len(line.runs), 2):
+            runs.append(line.runs[index])  # type: ignore[arg-type]
+            runs.append(self._attribute_id(line.runs[index + 1]))  # type: ignore[arg-type]
+        text = line.text.encode("utf-8", "surrogatepass")
+        return _RUN_COUNT.pack(len(runs) // 2) + runs.tobytes() + text
+
+    def _decode(self, record: bytes) -> FrozenLine:
+        (count,) = _RUN_COUNT.unpack_from(record)
+        text_start = _RUN_COUNT.size + count * 8
+        runs = array("I", record[_RUN_COUNT.size : text_start])
+        text = record[text_start:].decode("utf-8", "surrogatepass")
+        if not count:
+            return FrozenLine(text)
+        pairs: list[int | Attributes] = []
+        for index in range(0, len(runs), 2):
+            pairs.append(runs[index])
+            pairs.append(self._attributes[runs[index + 1]])
+        return FrozenLine(text, tuple(pairs))
+
+    def _attribute_id(self, attrs: Attributes) -> int:
+        attr_id = self._attribute_ids.get(attrs)
+        if attr_id is None:
+            attr_id = len(self._attributes)
+            self._attributes.append(attrs)
+            self._attribute_ids[attrs] = attr_id
+        return attr_id
@@ -0,0 +1,152 @@
+"""Opt-in tracing of the output hot path into a ring buffer, exported as Chrome trace JSON."""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+from array import array
+
+TRACE_ENV = "TEXTUAL_TERM_TRACE"
+TRACE_EVENTS_ENV = "TEXTUAL_TERM_TRACE_EVENTS"
+DEFAULT_TRACE_EVENTS = 100_000
+
+# The active tracer, or None while tracing is off. Call sites check this
+# before doing any tracing work, so disabled tracing costs one lookup.
+tracer: Tracer | None = None
+
+
+class Tracer:
+    """Fixed-capacity ring buffer of completed spans.
+
+    Each span is a name, start and end ``perf_counter()`` times, the track
+    it belongs to (a thread id by default) and an optional byte count. The
+    buffer is allocated up front and the oldest spans are overwritten once
+    it is full, so recording never allocates and memory stays bounded.
+    ``dump()`` writes the spans as Chrome trace events, viewable in
+    ``chrome://tracing`` or Perfetto.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TRACE_EVENTS) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.recorded = 0
+        self._names: list[str] = [""] * capacity
+        self._starts = array("d", bytes(8 * capacity))
+        self._ends = array("d", bytes(8 * capacity))
+        self._tracks = array("Q", bytes(8 * capacity))
+        self._sizes = array("q", bytes(8 * capacity))
+        self._track_names: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.recorded, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        """Spans overwritten because the buffer was full."""
+        return max(0, self.recorded - self.capacity)
+
+    def record(
+        self, name: str, start: float, end: float, track: int | None = None, size: int = 0
+    ) -> None:
+        """Record a span from start to end, in perf_counter() seconds."""
+        if track is None:
+            track = threading.get_ident()
+        with self._lock:
+            index = self.recorded % self.capacity
+            self.recorded += 1
+        self._names[index] = name
+        self._starts[index] = start
+        self._ends[index] = end
+        self._tracks[index] = track
+        self._sizes[index] = size
+
+    def name_track(self, track: int, name: str) -> None:
+        """Label a track in the exported trace."""
+        self._track_names[track] = name
+
+    def clear(self) -> None:
+        """Forget every recorded span."""
+        with self._lock:
+            self.recorded = 0
+
+    def events(self) -> list[dict[str, object]]:
+        """Return the recorded spans, oldest first, as Chrome trace events."""
+        pid = os.getpid()
+        with self._lock:
+            recorded = self.recorded
+        first = max(0, recorded - self.capacity)
+        events: list[dict[str, object]] = []
+        for number in range(first, recorded):
+            index = number % self.capacity
+            event: dict[str, object] = {
+                "name": self._names[index],
+                "ph": "X",
+                "ts": self._starts[index] * 1_000_000,
+                "dur": (self._ends[index] - self._starts[index]) * 1_000_000,
+                "pid": pid,
+                "tid": self._tracks[index],
+            }
+            if self._sizes[index]:
+                event["args"] = {"bytes": self._sizes[index]}
+            events.append(event)
+        return events
+
+    def dump(self, path: str) -> None:
+        """Write the recorded spans to path as Chrome trace-event JSON."""
+        pid = os.getpid()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        names.update(self._track_names)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": track, "args": {"name": name}}
+            for track, name in names.items()
+        ]
+        trace = {
+            "traceEvents": metadata + self.events(),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped": self.dropped},
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(trace, file)
+
+
+def enable_tracing(path: str | None = None, capacity: int = DEFAULT_TRACE_EVENTS) -> Tracer:
+    """Start tracing into a new buffer; with a path, the trace is written there at exit."""
+    global tracer
+    tracer = Tracer(capacity)
+    if path is not None:
+        atexit.register(_dump_at_exit, tracer, path)
+    return tracer
+
+
+def disable_tracing() -> None:
+    """Stop tracing. Spans already recorded stay in the tracer enable_tracing() returned."""
+    global tracer
+    tracer = None
+
+
+def dump_trace(path: str) -> bool:
+    """Write the active trace to path. Returns False when tracing is off."""
+    if tracer is None:
+        return False
+    tracer.dump(path)
+    return True
+
+
+def _dump_at_exit(active: Tracer, path: str) -> None:
+    with contextlib.suppress(OSError):
+        active.dump(path)
+
+
+def _enable_from_environment() -> None:
+    """Turn tracing on when TEXTUAL_TERM_TRACE names an output file."""
+    path = os.environ.get(TRACE_ENV)
+    if path:
+        enable_tracing(path, int(os.environ.get(TRACE_EVENTS_ENV, DEFAULT_TRACE_EVENTS)))
+
+
+_enable_from_environment()
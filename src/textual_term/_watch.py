@@ -0,0 +1,117 @@
+"""Waiting for text to appear on a pyte screen, or for its output to stop."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from textual_term._screen import ResponsiveScreen
+    from textual_term._scrollback import FrozenLine, Scrollback
+
+
+class _Waiter:
+    """A pending ScreenWatch.wait() call."""
+
+    __slots__ = ("pattern", "future")
+
+    def __init__(self, pattern: re.Pattern[str], future: asyncio.Future[re.Match[str]]) -> None:
+        self.pattern = pattern
+        self.future = future
+
+
+class ScreenWatch:
+    """Matches patterns against the rows of a screen and the lines that scroll off it.
+
+    ``search()`` reads the whole screen once. After that each ``output()``
+    reads only the rows pyte marked dirty and the scrollback lines
+    committed since the previous check, and only while something is
+    waiting. Once ``close()`` is called every pending wait fails.
+    """
+
+    def __init__(self, screen: ResponsiveScreen, scrollback: Scrollback) -> None:
+        self._screen = screen
+        self._scrollback = scrollback
+        self._waiters: list[_Waiter] = []
+        self._seen_lines = 0
+        self.last_output = 0.0
+        self.closed = False
+
+    def search(self, pattern: re.Pattern[str]) -> re.Match[str] | None:
+        """Return the first match of pattern on the screen as it is now, or None."""
+        self._catch_up_lines()
+        self._screen.dirty.clear()
+        for text in self._screen.display:
+            match = pattern.search(text)
+            if match is not None:
+                return match
+        return None
+
+    async def wait(self, pattern: re.Pattern[str], timeout: float) -> re.Match[str]:
+        """Wait until a check matches pattern. Raises TimeoutError after timeout seconds."""
+        waiter = _Waiter(pattern, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        finally:
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+
+    async def idle(self, idle: float, timeout: float) -> None:
+        """Wait until no output has arrived for idle seconds, or the watch is closed.
+
+        Raises TimeoutError if output is still arriving after timeout seconds.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.closed:
+            quiet_at = self.last_output + idle
+            now = loop.time()
+            if now >= quiet_at:
+                return
+            if quiet_at > deadline:
+                raise TimeoutError(f"output did not stop for {idle} s within {timeout} s")
+            await asyncio.sleep(quiet_at - now)
+
+    def output(self, now: float) -> None:
+        """Note that output fed to the screen arrived at now, and check the waiters."""
+        self.last_output = now
+        if self._waiters:
+            self._check()
+
+    def close(self, reason: str) -> None:
+        """Fail every pending wait with an EOFError saying reason came first."""
+        self.closed = True
+        for waiter in self._waiters:
+            if not waiter.future.done():
+                waiter.future.set_exception(
+                    EOFError(f"{reason} before {waiter.pattern.pattern!r} appeared")
+                )
+        self._waiters.clear()
+
+    def _check(self) -> None:
+        """Match waiters against lines scrolled off and rows changed since the last check."""
+        screen = self._screen
+        texts = [line.text for line in self._catch_up_lines()]
+        texts += [screen.row_text(y) for y in sorted(screen.dirty) if 0 <= y < screen.lines]
+        screen.dirty.clear()
+        for waiter in list(self._waiters):
+            for text in texts:
+                match = waiter.pattern.search(text)
+                if match is not None:
+                    if not waiter.future.done():
+                        waiter.future.set_result(match)
+                    self._waiters.remove(waiter)
+                    break
+
+    def _catch_up_lines(self) -> list[FrozenLine]:
+        """Return the scrollback lines committed since the last call."""
+        scrollback = self._scrollback
+        appended = scrollback.appended
+        new = min(appended - self._seen_lines, len(scrollback))
+        self._seen_lines = appended
+        if new <= 0:
+            return []
+        return scrollback.lines(len(scrollback) - new, len(scrollback))
@@ -2,109 +2,205 @@
 
 from __future__ import annotations
 
-import asyncio
-
-import pyte
-from textual.events import Key, Resize
+import dataclasses
+
+from textual import on
+from textual.events import (
+    Blur,
+    Focus,
+    Key,
+    MouseScrollDown,
+    MouseScrollUp,
+    Paste,
+    Resize,
+)
+from textual.message import Message
+from textual.strip import Strip
+from textual.timer import Timer
 from textual.widget import Widget
 
-from textual_term._emulator import PtyEmulator
+from textual_term import _trace
+from textual_term._config import TerminalConfig
+from textual_term._connection import TerminalConnection
+from textual_term._display import TerminalDisplay
+from textual_term._history import HistoryView
 from textual_term._keys import translate_key
-from textual_term._renderer import TerminalRenderable, render_screen
-from textual_term._screen import ResponsiveScreen
+from textual_term._metrics import TerminalMetrics
+from textual_term._pump import OutputPump
+from textual_term._recorder import AsciicastRecorder
+from textual_term._replay import ReplayEngine
+from textual_term._scheduler import TurnStats
+from textual_term._scrollback import Scrollback
+from textual_term._search import SearchIndex
+from textual_term._selection import SearchSelection
+from textual_term._spill import SpillFile
 
 DEFAULT_ROWS = 24
 DEFAULT_COLS = 80
+MOUSE_SCROLL_LINES = 3
+
+
+class MetricsUpdated(Message, namespace="terminal"):
+    """Posted every ``metrics_interval`` seconds with a snapshot of the terminal's metrics."""
+
+    def __init__(self, terminal: Terminal, metrics: TerminalMetrics) -> None:
+        super().__init__()
+        self.terminal = terminal
+        self.metrics = metrics
+
+    @property
+    def control(self) -> Terminal:
+        """The terminal the metrics belong to."""
+        return self.terminal
 
 
 class Terminal(Widget, can_focus=True):
     """Terminal emulator widget that runs a command in a PTY."""
 
-    DEFAULT_CSS = """
-    Terminal {
-        height: 1fr;
-    }
-    """
+    DEFAULT_CSS = "Terminal { height: 1fr; }"
+
+    MetricsUpdated = MetricsUpdated
 
     def __init__(
         self,
         command: str,
         *,
+        config: TerminalConfig | None = None,
         name: str | None = None,
         id: str | None = None,
         classes: str | None = None,
     ) -> None:
         super().__init__(name=name, id=id, classes=classes)
         self._command = command
-        self._emulator: PtyEmulator | None = None
-        self._screen: ResponsiveScreen | None = None
-        self._stream: pyte.Stream | None = None
-        self._recv_task: asyncio.Task | None = None  # pyright: ignore[reportMissingTypeArgument]
-        self._renderable = TerminalRenderable([])
+        self._config = config or TerminalConfig()
+        self._connection: TerminalConnection | None = None
+        self._metrics = TerminalMetrics()
+        self._metrics_timer: Timer | None = None
+        self._scrollback = _scrollback(self._config)
+        self._display = TerminalDisplay(self, self._scrollback, self._metrics)
+        self._pump = OutputPump(self._config, self._metrics, self._display.show_frame, self)
 
     def start(self) -> None:
         """Start the PTY emulator and begin processing output."""
         rows, cols = self._terminal_size()
-        emulator = PtyEmulator(self._command, rows, cols)
-        emulator.open_pty()
-        screen = ResponsiveScreen(cols, rows, write_callback=emulator.write_to_pty)
-        stream = pyte.Stream(screen)
-        self._emulator = emulator
-        self._screen = screen
-        self._stream = stream
-        emulator.start()
-        self._recv_task = asyncio.create_task(self._recv_loop())
+        connection = TerminalConnection(
+            self._command, rows, cols, self._config, self._scrollback, self._pump
+        )
+        self._connection = connection
+        self._pump.renderer.invalidate()
+        connection.start()
+        worker = connection.worker
+        self._display.search.attach(connection.screen, worker.lock if worker is not None else None)
+        if _trace.tracer is not None:
+            _trace.tracer.name_track(id(self), f"Terminal {self._command}")
+        if self._config.metrics_interval is not None:
+            self._metrics_timer = self.set_interval(
+                self._config.metrics_interval,
+                lambda: self.post_message(MetricsUpdated(self, self.metrics)),
+            )
 
     def stop(self) -> None:
         """Stop the PTY emulator and cancel background tasks."""
-        if self._recv_task:
-            self._recv_task.cancel()
-            self._recv_task = None
-        if self._emulator:
-            self._emulator.stop()
-            self._emulator = None
-
-    def render(self) -> TerminalRenderable:
-        """Return the current terminal renderable."""
-        return self._renderable
-
-    async def _recv_loop(self) -> None:
-        """Drain emulator output_queue, feed to pyte, and refresh display."""
-        emulator = self._emulator
-        stream = self._stream
-        screen = self._screen
-        if emulator is None or stream is None or screen is None:
+        if self._metrics_timer:
+            self._metrics_timer.stop()
+            self._metrics_timer = None
+        if self._connection:
+            self._metrics.emulator = self._connection.emulator.metrics
+            self._connection.stop()
+            self._connection = None
+        self._scrollback.close()
+
+    def render_line(self, y: int) -> Strip:
+        """Return the prebuilt Strip for row y of the view; rows are rendered only on change."""
+        line = self._display.line(y)
+        return line if line is not None else Strip.blank(self.size.width)
+
+    @property
+    def scrollback(self) -> Scrollback:
+        """Lines that have scrolled off the top of the screen."""
+        return self._scrollback
+
+    @property
+    def recorder(self) -> AsciicastRecorder | None:
+        """The session recorder while recording is configured and running."""
+        return self._connection.recorder if self._connection is not None else None
+
+    @property
+    def turn_stats(self) -> TurnStats | None:
+        """A snapshot of this terminal's scheduling turns, or None when it is not scheduled."""
+        turns = self._pump.turns
+        return dataclasses.replace(turns.stats) if turns is not None else None
+
+    @property
+    def metrics(self) -> TerminalMetrics:
+        """A snapshot of the read, parse, render and input-latency metrics, and the emulator's."""
+        metrics = self._metrics.snapshot()
+        if self._connection is not None:
+            metrics.emulator = self._connection.emulator.metrics
+        return metrics
+
+    @property
+    def history(self) -> HistoryView:
+        """The view's position in the scrollback; scroll it to show saved lines."""
+        return self._display.history
+
+    @property
+    def search(self) -> SearchSelection:
+        """Search the scrollback and screen, and step through the highlighted matches."""
+        return self._display.search
+
+    async def replay(self, engine: ReplayEngine, speed: float | None = 1.0) -> None:
+        """Play a recorded session instead of a live PTY; seek or change ``engine.speed`` to steer."""
+        await engine.play(self._display.show_frame, speed, self._config.max_fps)
+
+    def on_key(self, event: Key) -> None:
+        """Scroll history on shift+arrow/page keys; otherwise return to live and send the key."""
+        if self._display.history.scroll_key(event.key, max(self._display.rows() - 1, 1)):
+            event.stop()
             return
-        while True:
-            msg = await emulator.output_queue.get()
-            if msg[0] == "stdout":
-                stream.feed(msg[1])
-                self._renderable = TerminalRenderable(render_screen(screen, self.has_focus))
-                self.refresh()
-            elif msg[0] == "disconnect":
-                break
-
-    async def on_key(self, event: Key) -> None:
-        """Translate key event and write to PTY."""
-        if self._emulator is None:
+        if self._connection is None:
             return
         event.stop()
+        self._display.history.follow()
         translated = translate_key(event)
         if translated is not None:
-            await self._emulator.input_queue.put(["stdin", translated])
+            self._connection.send(translated, event.time)
 
-    async def on_resize(self, event: Resize) -> None:
+    def on_paste(self, event: Paste) -> None:
+        """Return the view to the live screen and send pasted text to the PTY."""
+        if self._connection is None:
+            return
+        event.stop()
+        self._display.history.follow()
+        self._connection.paste(event.text, event.time)
+
+    def on_resize(self, event: Resize) -> None:
         """Update screen size and notify PTY of resize."""
-        rows, cols = self._terminal_size()
-        if self._screen and (self._screen.lines != rows or self._screen.columns != cols):
-            self._screen.resize(rows, cols)
-            if self._emulator:
-                await self._emulator.input_queue.put(["resize", rows, cols])
+        if self._connection is not None:
+            self._connection.resize(*self._terminal_size())
+
+    @on(Focus)
+    @on(Blur)
+    def _show_cursor(self) -> None:
+        """Show the cursor on focus and hide it on blur, repainting only its row."""
+        self._display.repaint()
+
+    @on(MouseScrollUp)
+    @on(MouseScrollDown)
+    def _scroll_history(self, event: MouseScrollUp | MouseScrollDown) -> None:
+        """Scroll back into the scrollback, or forward towards the live screen."""
+        event.stop()
+        up = isinstance(event, MouseScrollUp)
+        self._display.history.scroll(MOUSE_SCROLL_LINES if up else -MOUSE_SCROLL_LINES)
 
     def _terminal_size(self) -> tuple[int, int]:
         """Return (rows, cols) from widget content size, defaulting to 80x24."""
-        height = self.size.height
-        width = self.size.width
-        rows = height if height > 1 else DEFAULT_ROWS
-        cols = width if width > 1 else DEFAULT_COLS
-        return rows, cols
+        rows, cols = self.size.height, self.size.width
+        return (rows if rows > 1 else DEFAULT_ROWS, cols if cols > 1 else DEFAULT_COLS)
+
+
+def _scrollback(config: TerminalConfig) -> Scrollback:
+    """Build the scrollback a terminal with config saves its lines to."""
+    spill = SpillFile(config.scrollback_spill_dir) if config.scrollback_spill else None
+    index = SearchIndex() if config.search_index else None
+    return Scrollback(config.scrollback_lines, config.scrollback_bytes, spill, index)
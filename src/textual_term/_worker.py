@@ -0,0 +1,216 @@
+"""Background thread that parses PTY output and renders screen lines off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from textual_term import _trace
+from textual_term._metrics import TerminalMetrics
+
+if TYPE_CHECKING:
+    import pyte
+    from textual.strip import Strip
+
+    from textual_term._catchup import CatchUpPolicy
+    from textual_term._renderer import ScreenRenderer
+    from textual_term._screen import ResponsiveScreen
+
+
+class ParserWorker:
+    """Owns a pyte stream and screen and drives them from a dedicated thread.
+
+    The event loop hands raw output to ``feed()``; the worker parses it,
+    renders dirty lines at most once per frame interval, and posts the
+    ready-to-paint lines and the cursor position back to the loop through
+    ``on_frame``. The screen must not be changed from the loop while the
+    worker is running, so resizes are queued through ``resize()`` as well.
+    The worker holds ``lock`` while it parses a chunk, resizes or renders;
+    hold it to read the screen and scrollback from the loop. Parse and
+    render times are recorded in ``metrics``, if one is given. Output fed
+    but not parsed yet is counted in ``backlog``.
+    """
+
+    def __init__(
+        self,
+        stream: pyte.ByteStream,
+        screen: ResponsiveScreen,
+        renderer: ScreenRenderer,
+        frame_interval: float,
+        catchup: CatchUpPolicy,
+        on_frame: Callable[[list[Strip], tuple[int, int]], None],
+        metrics: TerminalMetrics | None = None,
+    ) -> None:
+        self._stream = stream
+        self._screen = screen
+        self._renderer = renderer
+        self._frame_interval = frame_interval
+        self._catchup = catchup
+        self._on_frame = on_frame
+        self._metrics = metrics or TerminalMetrics()
+        self._inbox: queue.SimpleQueue[tuple | None]  # pyright: ignore[reportMissingTypeArgument]
+        self._inbox = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped = False
+        self.backlog = ParseBacklog()
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker thread, posting frames to the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(target=self._run, name="textual-term-parser", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Make the worker thread exit and wait for it, dropping output not parsed yet.
+
+        Only the chunk being parsed is finished, so the wait is short. Once
+        this returns the screen and scrollback are no longer touched by the
+        worker and can be used or closed from the loop.
+        """
+        self._stopped = True
+        self._inbox.put(None)
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def feed(self, data: bytes) -> None:
+        """Queue raw PTY output for parsing. Call from the event loop only."""
+        self.backlog.fed += len(data)
+        self._inbox.put(("feed", data))
+
+    def resize(self, rows: int, cols: int) -> None:
+        """Queue a screen resize so it is applied on the worker thread."""
+        self._inbox.put(("resize", rows, cols))
+
+    def _run(self) -> None:
+        """Parse queued output and post a frame at most once per interval."""
+        last_frame = -self._frame_interval
+        dirty = False
+        while True:
+            next_frame = last_frame + self._frame_interval
+            timeout = max(0.0, next_frame - time.monotonic()) if dirty else None
+            try:
+                item = self._inbox.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            else:
+                if not self._apply_pending(item):
+                    return
+                if dirty:
+                    self._metrics.frames_coalesced += 1
+                dirty = True
+            now = time.monotonic()
+            if (
+                dirty
+                and not self._stopped
+                and now >= next_frame
+                and not self._catchup.defer_frame(not self._inbox.empty(), last_frame, now)
+            ):
+                self._post_frame()
+                dirty = False
+                last_frame = time.monotonic()
+
+    def _apply_pending(
+        self,
+        item: tuple | None,  # pyright: ignore[reportMissingTypeArgument]
+    ) -> bool:
+        """Apply the item and everything already queued. Returns False on stop.
+
+        Consecutive feeds are batched so the catch-up policy sees the whole
+        backlog; a resize flushes the batch before it is applied.
+        """
+        chunks: list[bytes] = []
+        while item is not None and not self._stopped:
+            if item[0] == "feed":
+                chunks.append(item[1])
+            elif item[0] == "resize":
+                self._feed_batch(chunks)
+                chunks = []
+                with self.lock:
+                    self._screen.resize(item[1], item[2])
+            try:
+                item = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+        else:
+            return False
+        self._feed_batch(chunks)
+        _notify(self._loop, self.backlog.drained)
+        return True
+
+    def _feed_batch(self, chunks: list[bytes]) -> None:
+        """Feed a batch of output through the catch-up policy."""
+        for chunk in self._catchup.prepare(self._stream, chunks):
+            if self._stopped:
+                return
+            started = time.perf_counter()
+            with self.lock:
+                self._stream.feed(chunk)
+            ended = time.perf_counter()
+            self._metrics.parse.record(ended - started)
+            self._metrics.bytes_parsed += len(chunk)
+            if _trace.tracer is not None:
+                _trace.tracer.record("feed", started, ended, size=len(chunk))
+        self.backlog.parsed += sum(len(chunk) for chunk in chunks)
+
+    def _post_frame(self) -> None:
+        """Render dirty lines and hand them to the event loop with the cursor position."""
+        started = time.perf_counter()
+        with self.lock:
+            lines = self._renderer.render(self._screen)
+            cursor = (self._screen.cursor.x, self._screen.cursor.y)
+        ended = time.perf_counter()
+        self._metrics.render.record(ended - started)
+        self._metrics.frames_rendered += 1
+        if _trace.tracer is not None:
+            _trace.tracer.record("render", started, ended)
+        _notify(self._loop, self._on_frame, lines, cursor)
+
+
+def _notify(
+    loop: asyncio.AbstractEventLoop | None, callback: Callable[..., object], *args: object
+) -> None:
+    """Schedule a callback on loop from the worker thread, ignoring a loop that has closed."""
+    if loop is None:
+        return
+    with contextlib.suppress(RuntimeError):
+        loop.call_soon_threadsafe(callback, *args)
+
+
+class ParseBacklog:
+    """Output handed to a parser worker that it has not parsed yet.
+
+    The loop counts what it feeds and waits for room; the worker thread
+    counts what it parses and then schedules ``drained`` on the loop, which
+    also calls ``on_drained`` if it is set.
+    """
+
+    def __init__(self) -> None:
+        self.fed = 0
+        self.parsed = 0
+        self.on_drained: Callable[[], None] | None = None
+        self._drained = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        """Bytes fed that have not been parsed yet."""
+        return self.fed - self.parsed
+
+    def drained(self) -> None:
+        """Wake the loop if it is waiting for room. Call on the event loop."""
+        self._drained.set()
+        if self.on_drained is not None:
+            self.on_drained()
+
+    async def wait(self, max_bytes: int) -> None:
+        """Wait until no more than max_bytes of fed output are still unparsed."""
+        while self.pending > max_bytes:
+            self._drained.clear()
+            await self._drained.wait()
@@ -0,0 +1,139 @@
+"""Non-blocking buffered writes of input to a PTY."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from textual_term._pty import write_some
+
+if TYPE_CHECKING:
+    from textual_term._reactor import LoopPoller, PtyReactor
+
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+class PtyWriter:
+    """Writes input to a non-blocking PTY fd without ever blocking the loop.
+
+    Whatever the PTY does not accept at once is kept and flushed from a
+    writability callback as the child reads, so large pastes are neither
+    dropped nor allowed to freeze the loop. Input is copied into the
+    outbound buffer ``chunk_size`` bytes at a time, each chunk once the
+    previous one has mostly reached the PTY, and writes keep their order.
+    The callback is registered with ``poller``, the shared reactor or the
+    terminal's own loop poller. A write error (the child has gone) drops
+    the rest of the input.
+
+    A write given a ``queued_at`` ``time.monotonic()`` timestamp is timed:
+    once its last byte has reached the PTY, ``on_written`` is called with
+    the seconds since then.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        poller: PtyReactor | LoopPoller,
+        chunk_size: int = WRITE_CHUNK_SIZE,
+        on_written: Callable[[float], None] | None = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self._fd: int | None = fd
+        self._poller = poller
+        self._on_written = on_written
+        self._queued: deque[memoryview] = deque()
+        self._queued_bytes = 0
+        self._accepted = 0
+        self._written = 0
+        self._timed: deque[tuple[int, float]] = deque()
+        self._outbound = bytearray()
+        self._writing = False
+        self._flushed = asyncio.Event()
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes accepted by write() but not yet written to the PTY."""
+        return len(self._outbound) + self._queued_bytes
+
+    def write(self, data: bytes, queued_at: float | None = None) -> None:
+        """Queue data behind earlier input and write as much as the PTY accepts now."""
+        if self._fd is None or not data:
+            return
+        self._queued.append(memoryview(data))
+        self._queued_bytes += len(data)
+        self._accepted += len(data)
+        if queued_at is not None and self._on_written is not None:
+            self._timed.append((self._accepted, queued_at))
+        self.flush()
+
+    async def wait(self, max_bytes: int = 0) -> None:
+        """Wait until no more than max_bytes are still pending, or the writer is closed."""
+        while self._fd is not None and self.pending_bytes > max_bytes:
+            self._flushed.clear()
+            await self._flushed.wait()
+
+    def flush(self) -> None:
+        """Write pending input until the PTY would block, then wait until it is writable."""
+        fd = self._fd
+        if fd is None:
+            return
+        try:
+            while self._refill():
+                written = write_some(fd, self._outbound)
+                if not written:
+                    break
+                del self._outbound[:written]
+                self._written += written
+        except OSError:
+            self._drop()
+        self._report()
+        self._flushed.set()
+        self._watch(self.pending_bytes > 0)
+
+    def close(self) -> None:
+        """Stop watching the fd, drop pending input and release waiters."""
+        self._watch(False)
+        self._fd = None
+        self._drop()
+        self._flushed.set()
+
+    def _drop(self) -> None:
+        """Drop all pending input, untimed."""
+        self._outbound.clear()
+        self._queued.clear()
+        self._queued_bytes = 0
+        self._timed.clear()
+
+    def _report(self) -> None:
+        """Report the latency of every timed write whose last byte has been written."""
+        now = time.monotonic()
+        while self._timed and self._timed[0][0] <= self._written:
+            _end, queued_at = self._timed.popleft()
+            if self._on_written is not None:
+                self._on_written(now - queued_at)
+
+    def _refill(self) -> bool:
+        """Top the outbound buffer up to a chunk from the queued input. False once empty."""
+        while self._queued and len(self._outbound) < self.chunk_size:
+            head = self._queued[0]
+            take = self.chunk_size - len(self._outbound)
+            self._outbound += head[:take]
+            if len(head) > take:
+                self._queued[0] = head[take:]
+            else:
+                self._queued.popleft()
+            self._queued_bytes -= min(take, len(head))
+        return bool(self._outbound)
+
+    def _watch(self, writing: bool) -> None:
+        """Register the flush callback for writability, or remove it."""
+        if writing == self._writing or self._fd is None:
+            return
+        self._writing = writing
+        if writing:
+            self._poller.add_writer(self._fd, self.flush)
+        else:
+            self._poller.remove_writer(self._fd)
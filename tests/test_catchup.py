@@ -0,0 +1,74 @@
+"""Tests for the catch-up policy."""
+
+from __future__ import annotations
+
+import pyte
+
+from textual_term._catchup import CatchUpPolicy
+from textual_term._screen import ResponsiveScreen
+
+
+def _stream() -> pyte.ByteStream:
+    return pyte.ByteStream(ResponsiveScreen(20, 3, write_callback=lambda _data: None))
+
+
+class TestCatchUpPolicy:
+    """Test backlog detection, frame deferral and overwritten-output skipping."""
+
+    def test_small_batch_not_active(self) -> None:
+        """A batch under the threshold should not enter catch-up mode."""
+        policy = CatchUpPolicy(100)
+        chunks = [b"abc"]
+        assert policy.prepare(_stream(), chunks) is chunks
+        assert not policy.active
+
+    def test_large_batch_active(self) -> None:
+        """A batch over the threshold should enter catch-up mode."""
+        policy = CatchUpPolicy(4)
+        policy.prepare(_stream(), [b"abc", b"def"])
+        assert policy.active
+
+    def test_defer_frame(self) -> None:
+        """Frames should be deferred only while active, behind and not stale."""
+        policy = CatchUpPolicy(4, max_frame_age=1.0)
+        policy.prepare(_stream(), [b"abcdef"])
+        assert policy.defer_frame(True, last_frame=10.0, now=10.5)
+        assert not policy.defer_frame(False, last_frame=10.0, now=10.5)
+        assert not policy.defer_frame(True, last_frame=10.0, now=11.5)
+
+    def test_skip_before_last_clear(self) -> None:
+        """With skip_overwritten, output before the last home+clear should be dropped."""
+        policy = CatchUpPolicy(4, skip_overwritten=True)
+        chunks = policy.prepare(
+            _stream(), [b"frame1\x1b[H\x1b[2J", b"frame2\x1b[1;1H\x1b[2Jframe3"]
+        )
+        assert chunks == [b"\x1b[1;1H\x1b[2Jframe3"]
+        assert policy.skipped_bytes == len(b"frame1\x1b[H\x1b[2Jframe2")
+
+    def test_skip_before_alternate_screen(self) -> None:
+        """An alternate-screen switch should also be a skip point."""
+        policy = CatchUpPolicy(4, skip_overwritten=True)
+        chunks = policy.prepare(_stream(), [b"old output\x1b[?1049hnew"])
+        assert chunks == [b"\x1b[?1049hnew"]
+
+    def test_no_skip_without_option(self) -> None:
+        """Without skip_overwritten, nothing should be dropped."""
+        policy = CatchUpPolicy(4)
+        chunks = [b"frame1\x1b[2Jframe2"]
+        assert policy.prepare(_stream(), chunks) == chunks
+
+    def test_no_skip_inside_escape_sequence(self) -> None:
+        """Nothing should be dropped while the parser is mid-sequence."""
+        stream = _stream()
+        stream.feed(b"\x1b[3")
+        policy = CatchUpPolicy(4, skip_overwritten=True)
+        chunks = [b"1mred\x1b[2Jframe"]
+        assert policy.prepare(stream, chunks) == chunks
+
+    def test_no_skip_inside_utf8_character(self) -> None:
+        """Nothing should be dropped while a multibyte character is incomplete."""
+        stream = _stream()
+        stream.feed("中".encode()[:1])
+        policy = CatchUpPolicy(4, skip_overwritten=True)
+        chunks = [b"\xb8\xadxx\x1b[2Jframe"]
+        assert policy.prepare(stream, chunks) == chunks
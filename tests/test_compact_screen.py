@@ -0,0 +1,175 @@
+"""Tests for the compact array-backed screen."""
+
+from __future__ import annotations
+
+import pyte
+import pytest
+from rich.style import Style
+from textual.strip import Strip
+
+from textual_term import _grid
+from textual_term._renderer import render_screen
+from textual_term._screen import CompactScreen, ResponsiveScreen
+
+SEQUENCES = {
+    "plain": b"hello world",
+    "wrap": b"x" * 50,
+    "no_autowrap": b"\x1b[?7l" + b"y" * 30 + b"Z",
+    "colors": b"\x1b[31mred\x1b[1;44m bold \x1b[0m plain \x1b[38;2;1;2;3mrgb\x1b[7mrev",
+    "wide": "wide 中文字 end".encode(),
+    "wide_at_edge": b"x" * 19 + "中".encode(),
+    "insert_over_wide_stub": b"x" * 18 + "中".encode() + b"\x1b[1;20H\x1b[4hI\x1b[4l",
+    "combining_after_wide_at_edge": b"\x1b[?7l" + b"x" * 18 + "中\u0301".encode(),
+    "combining": "é ä q̇".encode(),
+    "scroll": b"".join(f"line {i}\r\n".encode() for i in range(12)),
+    "reverse_index": b"top\r\n\x1b[1;1H\x1bM\x1bMnew",
+    "margins": b"\x1b[2;4r" + b"".join(f"m{i}\n".encode() for i in range(8)),
+    "insert_delete_lines": b"a\r\nb\r\nc\r\nd\r\n\x1b[2;1H\x1b[2L\x1b[4;1H\x1b[M",
+    "insert_delete_chars": b"abcdefgh\x1b[1;3H\x1b[2@XY\x1b[1;8H\x1b[3P",
+    "insert_mode": b"abcdef\x1b[1;2H\x1b[4hINS\x1b[4l",
+    "erase_chars": b"\x1b[32mgreen text\x1b[1;3H\x1b[4X",
+    "erase_in_line": b"0123456789\x1b[1;5H\x1b[K\r\n0123456789\x1b[2;5H\x1b[1K\r\nabc\x1b[2K",
+    "erase_below": b"aaa\r\nbbb\r\nccc\x1b[2;2H\x1b[J",
+    "erase_above": b"aaa\r\nbbb\r\nccc\x1b[2;2H\x1b[1J",
+    "clear": b"text\x1b[H\x1b[2Jafter",
+    "alignment": b"\x1b#8",
+    "line_drawing": b"\x1b(0lqqk\x1b(B",
+    "reset": b"junk\x1bcfresh",
+}
+
+
+def _feed(screen: pyte.Screen, data: bytes) -> None:
+    pyte.ByteStream(screen).feed(data)
+
+
+def _pair(columns: int = 20, lines: int = 5) -> tuple[CompactScreen, ResponsiveScreen]:
+    compact = CompactScreen(columns, lines, write_callback=lambda _data: None)
+    reference = ResponsiveScreen(columns, lines, write_callback=lambda _data: None)
+    return compact, reference
+
+
+def _styled_cells(strip: Strip) -> list[tuple[object, ...]]:
+    """Return one (character, visible attributes) tuple per rendered character.
+
+    Unset and False attributes compare equal: pyte leaves unwritten cells
+    unstyled, while compact rows always carry an attribute id.
+    """
+    cells: list[tuple[object, ...]] = []
+    for segment in strip:
+        style = segment.style or Style()
+        attributes = (
+            style.color,
+            style.bgcolor,
+            style.bold,
+            style.italic,
+            style.underline,
+            style.strike,
+            style.reverse,
+        )
+        cells.extend((char, *(value or None for value in attributes)) for char in segment.text)
+    return cells
+
+
+def _cells(screen: pyte.Screen) -> list[list[pyte.screens.Char]]:
+    return [[screen.buffer[y][x] for x in range(screen.columns)] for y in range(screen.lines)]
+
+
+class TestCompactScreenMatchesPyte:
+    """CompactScreen should produce the same screen state as pyte's Screen."""
+
+    @pytest.mark.parametrize("name", sorted(SEQUENCES))
+    def test_sequence(self, name: str) -> None:
+        """Display, cursor, cells and dirty rows should match after each sequence."""
+        compact, reference = _pair()
+        compact.dirty.clear()
+        reference.dirty.clear()
+        for screen in (compact, reference):
+            _feed(screen, SEQUENCES[name])
+        assert compact.display == reference.display
+        assert (compact.cursor.x, compact.cursor.y) == (reference.cursor.x, reference.cursor.y)
+        assert _cells(compact) == _cells(reference)
+        assert compact.dirty == reference.dirty
+
+    @pytest.mark.parametrize("name", sorted(SEQUENCES))
+    def test_rows_read_like_pyte_display(self, name: str) -> None:
+        """row_text and rendered rows should show what pyte's display shows, on both screens."""
+        compact, reference = _pair()
+        for screen in (compact, reference):
+            _feed(screen, SEQUENCES[name])
+        expected = reference.display
+        for screen in (compact, reference):
+            assert [screen.row_text(y) for y in range(screen.lines)] == expected
+            assert [screen.row_spans(y)[0] for y in range(screen.lines)] == expected
+            lines = render_screen(screen, show_cursor=False)
+            assert [line.text for line in lines] == expected
+
+    @pytest.mark.parametrize(("lines", "columns"), [(3, 20), (8, 20), (5, 10), (7, 30)])
+    def test_resize(self, lines: int, columns: int) -> None:
+        """Resizing should keep the same content as pyte."""
+        compact, reference = _pair()
+        for screen in (compact, reference):
+            _feed(screen, SEQUENCES["scroll"] + SEQUENCES["colors"])
+            screen.resize(lines, columns)
+            _feed(screen, b"\x1b[Hafter resize")
+        assert compact.display == reference.display
+        assert _cells(compact) == _cells(reference)
+
+    @pytest.mark.parametrize("after", [b"\x1b[K", b"\x1b[P", b"\x1b[@", b"typed"])
+    def test_shrink_keeps_cursor_on_screen(self, after: bytes) -> None:
+        """Erasing or drawing after the screen shrinks under the cursor should stay on screen."""
+        compact, _reference = _pair()
+        _feed(compact, b"\x1b[5;1Hprompt$ ")
+        compact.resize(3, 10)
+        assert compact.cursor.y == 2
+        _feed(compact, after)
+        assert len(compact.display) == 3
+
+    def test_renders_like_pyte(self) -> None:
+        """The renderer should read the arrays and produce the same lines as for pyte."""
+        compact, reference = _pair()
+        for screen in (compact, reference):
+            _feed(screen, SEQUENCES["colors"] + b"\r\n" + SEQUENCES["wide"])
+        compact_lines = render_screen(compact, show_cursor=True)
+        reference_lines = render_screen(reference, show_cursor=True)
+        assert [line.text for line in compact_lines] == [line.text for line in reference_lines]
+        assert [_styled_cells(line) for line in compact_lines] == [
+            _styled_cells(line) for line in reference_lines
+        ]
+
+
+class TestCompactScreenStorage:
+    """Test the array storage and attribute interning."""
+
+    def test_rows_are_typed_arrays(self) -> None:
+        """Each row should store codepoints and attribute ids in typed arrays."""
+        compact, _reference = _pair()
+        _feed(compact, b"\x1b[31mab")
+        row = compact.grid.rows[0]
+        assert row.chars.typecode == "I"
+        assert row.attrs.typecode == "H"
+        assert row.chars[:2].tolist() == [ord("a"), ord("b")]
+        assert compact.grid.attributes(row.attrs[0])[0] == "red"
+
+    def test_identical_attributes_share_an_id(self) -> None:
+        """Cells written with the same attributes should share one attribute id."""
+        compact, _reference = _pair()
+        _feed(compact, b"\x1b[32ma\x1b[0mb\x1b[32mc")
+        attrs = compact.grid.rows[0].attrs
+        assert attrs[0] == attrs[2] != attrs[1]
+
+    def test_buffer_view_writes_cells(self) -> None:
+        """Writing a Char through the buffer view should update the arrays."""
+        compact, _reference = _pair()
+        compact.buffer[1][3] = pyte.screens.Char("Q", fg="blue")
+        assert compact.display[1][3] == "Q"
+        assert compact.buffer[1][3].fg == "blue"
+
+    def test_attribute_table_compacts_when_full(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A full attribute table should drop ids no cell uses any more."""
+        monkeypatch.setattr(_grid, "MAX_ATTRIBUTES", 4)
+        compact, _reference = _pair()
+        for color in range(20):
+            _feed(compact, f"\x1b[38;5;{color}m\x1b[Hx".encode())
+        assert len(compact.grid._table) <= 4
+        assert compact.buffer[0][0].data == "x"
+        assert compact.buffer[0][0].fg == pyte.graphics.FG_BG_256[19]
@@ -0,0 +1,219 @@
+"""Tests for the PTY connection behind a Terminal."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pyte
+import pytest
+
+from textual_term._config import TerminalConfig
+from textual_term._connection import TerminalConnection, forward, forward_ready
+from textual_term._emulator import DEFAULT_OUTPUT_BUDGET
+from textual_term._metrics import TerminalMetrics
+from textual_term._pump import OutputPump
+from textual_term._queue import OutputQueue
+from textual_term._scrollback import Scrollback
+
+
+def _connection(config: TerminalConfig | None = None) -> TerminalConnection:
+    """Build a connection whose emulator is a mock and whose screen is real."""
+    config = config or TerminalConfig()
+    pump = OutputPump(config, TerminalMetrics(), MagicMock(), object())
+    with patch("textual_term._connection.PtyEmulator"):
+        return TerminalConnection("/bin/sh", 3, 10, config, Scrollback(), pump)
+
+
+class TestConnectionStart:
+    """Test building and starting a connection."""
+
+    @patch("textual_term._connection.asyncio.create_task")
+    @patch("textual_term._connection.pyte.ByteStream")
+    @patch("textual_term._connection.ResponsiveScreen")
+    @patch("textual_term._connection.PtyEmulator")
+    def test_start_creates_emulator_and_screen(
+        self,
+        mock_emulator_cls: MagicMock,
+        mock_screen_cls: MagicMock,
+        mock_stream_cls: MagicMock,
+        mock_create_task: MagicMock,
+    ) -> None:
+        """The connection should create emulator, screen and stream, then start pumping."""
+        config = TerminalConfig()
+        scrollback = Scrollback()
+        pump = MagicMock()
+        connection = TerminalConnection("/bin/sh", 24, 80, config, scrollback, pump)
+        connection.start()
+
+        mock_emulator = mock_emulator_cls.return_value
+        mock_emulator_cls.assert_called_once_with(
+            "/bin/sh", 24, 80, output_budget=DEFAULT_OUTPUT_BUDGET, reactor=None, recorder=None
+        )
+        mock_emulator.open_pty.assert_called_once()
+        mock_emulator.start.assert_called_once()
+        mock_screen_cls.assert_called_once_with(
+            80, 24, write_callback=mock_emulator.write_to_pty, scrollback=scrollback
+        )
+        mock_stream_cls.assert_called_once_with(mock_screen_cls.return_value)
+        pump.run.assert_called_once_with(
+            mock_emulator, mock_stream_cls.return_value, mock_screen_cls.return_value
+        )
+        mock_create_task.assert_called_once()
+        assert connection.emulator is mock_emulator
+        assert connection.screen is mock_screen_cls.return_value
+        assert connection.stream is mock_stream_cls.return_value
+        assert connection.worker is None
+
+    def test_stop_cancels_task_and_stops_emulator(self) -> None:
+        """stop() should cancel the output task and stop the emulator."""
+        connection = _connection()
+        task = MagicMock()
+        connection._task = task
+
+        connection.stop()
+
+        task.cancel.assert_called_once()
+        connection.emulator.stop.assert_called_once()  # type: ignore[attr-defined]
+        assert connection._task is None
+
+    async def test_threaded_output_is_forwarded_to_worker(self) -> None:
+        """In threaded mode output should be handed to the worker, not parsed on the loop."""
+        worker = MagicMock()
+        worker.backlog.wait = AsyncMock()
+        queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
+        await queue.put(["stdout", b"abc"])
+        await queue.put(["disconnect", 1])
+
+        await forward(queue, worker, DEFAULT_OUTPUT_BUDGET)  # type: ignore[arg-type]
+
+        worker.feed.assert_called_once_with(b"abc")
+        worker.backlog.wait.assert_awaited_once_with(DEFAULT_OUTPUT_BUDGET)
+
+
+class TestConnectionInput:
+    """Test keys, pastes and resizes sent to the PTY."""
+
+    def test_send_passes_event_time(self) -> None:
+        """Input should be written with its key event's time for the latency metrics."""
+        connection = _connection()
+        connection.send("\r", 12.5)
+        connection.emulator.write_to_pty.assert_called_once_with(  # type: ignore[attr-defined]
+            "\r", 12.5
+        )
+
+    def test_paste_is_one_write(self) -> None:
+        """A large paste should reach the emulator as a single write."""
+        connection = _connection()
+        connection.paste("line\n" * 200_000)
+        connection.emulator.write_to_pty.assert_called_once_with(  # type: ignore[attr-defined]
+            "line\r" * 200_000, None
+        )
+
+    def test_bracketed_when_child_enabled_mode_2004(self) -> None:
+        """The paste should be bracketed once the child enables DEC mode 2004."""
+        connection = _connection()
+        pyte.ByteStream(connection.screen).feed(b"\x1b[?2004h")
+        connection.paste("echo hi")
+        connection.emulator.write_to_pty.assert_called_once_with(  # type: ignore[attr-defined]
+            "\x1b[200~echo hi\x1b[201~", None
+        )
+
+    def test_resize_updates_screen(self) -> None:
+        """resize() should resize the screen and the emulator."""
+        connection = _connection()
+        connection.resize(40, 120)
+        assert (connection.screen.lines, connection.screen.columns) == (40, 120)
+        connection.emulator.resize.assert_called_once_with(40, 120)  # type: ignore[attr-defined]
+
+    def test_resize_no_change(self) -> None:
+        """resize() should do nothing if the size is unchanged."""
+        connection = _connection()
+        connection.resize(3, 10)
+        connection.emulator.resize.assert_not_called()  # type: ignore[attr-defined]
+
+    async def test_resize_threaded_goes_through_worker(self) -> None:
+        """In threaded mode the resize should be queued on the worker thread."""
+        connection = _connection(TerminalConfig(threaded=True))
+        connection.worker = MagicMock()
+        connection.resize(40, 120)
+        connection.worker.resize.assert_called_once_with(40, 120)
+        assert connection.screen.lines == 3
+
+
+class TestReactorDelivery:
+    """Test output handed on from the shared reactor's callbacks, without tasks."""
+
+    @staticmethod
+    def _start(config: TerminalConfig) -> tuple[TerminalConnection, MagicMock]:
+        """Start a connection to a real shell, with a pump whose frames are recorded."""
+        show_frame = MagicMock()
+        pump = OutputPump(config, TerminalMetrics(), show_frame, object())
+        connection = TerminalConnection("/bin/sh", 5, 40, config, Scrollback(), pump)
+        connection.start()
+        return connection, show_frame
+
+    @staticmethod
+    async def _wait_for(connection: TerminalConnection, text: str) -> None:
+        """Wait until text is on the connection's screen."""
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if any(text in line for line in connection.screen.display):
+                return
+        raise AssertionError(f"{text!r} never appeared")
+
+    @pytest.mark.integration
+    async def test_output_is_parsed_without_tasks(self) -> None:
+        """Output should be parsed and rendered with no task for the connection."""
+        tasks = len(asyncio.all_tasks())
+        connection, show_frame = self._start(TerminalConfig(shared_reactor=True))
+        assert connection._task is None
+        assert len(asyncio.all_tasks()) == tasks
+        connection.send("echo PUSH_$((6 * 7))\n")
+        await self._wait_for(connection, "PUSH_42")
+        await asyncio.sleep(0.05)
+        connection.stop()
+        assert show_frame.call_count >= 1
+
+    @pytest.mark.integration
+    async def test_threaded_output_is_forwarded_without_tasks(self) -> None:
+        """In threaded mode output should reach the worker from the reactor's callbacks."""
+        config = TerminalConfig(shared_reactor=True, threaded=True)
+        connection, _show_frame = self._start(config)
+        assert connection._task is None
+        connection.send("echo THREAD_$((6 * 7))\n")
+        try:
+            worker = connection.worker
+            assert worker is not None
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                with worker.lock:
+                    if any("THREAD_42" in line for line in connection.screen.display):
+                        break
+            else:
+                raise AssertionError("output never reached the worker")
+        finally:
+            connection.stop()
+
+    @pytest.mark.integration
+    async def test_turns_keep_the_pump_task(self) -> None:
+        """With a turn budget the pump still runs as a task, to take its turns."""
+        connection, _show_frame = self._start(TerminalConfig(shared_reactor=True, turn_budget=0.01))
+        assert connection._task is not None
+        connection.stop()
+
+    def test_forward_ready_stops_over_budget(self) -> None:
+        """forward_ready should leave output queued while the worker is over budget."""
+        queue = OutputQueue(1000)
+        for _ in range(3):
+            queue.put_nowait(["stdout", b"x" * 10])
+        worker = MagicMock()
+        worker.backlog.pending = 0
+
+        def feed(data: bytes) -> None:
+            worker.backlog.pending += len(data)
+
+        worker.feed.side_effect = feed
+        forward_ready(queue, worker, 15)
+        assert worker.feed.call_count == 2
+        assert queue.qsize() == 1
@@ -4,11 +4,16 @@ from __future__ import annotations
 
 import asyncio
 import os
+import signal
+import time
 
 import pytest
 
 from textual_term._emulator import PtyEmulator
-from textual_term._pty import close_pty, open_pty, resize_fd
+from textual_term._pty import close_pty, open_pty, read_some, resize_fd, write_some
+from textual_term._queue import OutputQueue
+from textual_term._reactor import LoopPoller, PtyReactor
+from textual_term._writer import PtyWriter
 
 
 class TestPtyEmulator:
@@ -22,51 +27,51 @@ class TestPtyEmulator:
         emulator.open_pty()
         emulator.start()
         emulator.write_to_pty("echo PTY_TEST_OUTPUT\n")
-        output_parts: list[str] = []
+        output_parts: list[bytes] = []
         for _ in range(50):
             try:
                 msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=0.1)
                 if msg[0] == "stdout":
                     output_parts.append(msg[1])
-                    if "PTY_TEST_OUTPUT" in "".join(output_parts):
+                    if b"PTY_TEST_OUTPUT" in b"".join(output_parts):
                         break
             except TimeoutError:
                 continue
         emulator.stop()
-        combined = "".join(output_parts)
-        assert "PTY_TEST_OUTPUT" in combined
+        combined = b"".join(output_parts)
+        assert b"PTY_TEST_OUTPUT" in combined
 
     @pytest.mark.integration
-    async def test_input_queue_stdin(self) -> None:
-        """Putting stdin on input_queue should produce output via _run task."""
+    async def test_write_with_timestamp(self) -> None:
+        """A timestamped write should reach the child and record its latency."""
         shell = os.environ.get("SHELL", "/bin/sh")
         emulator = PtyEmulator(shell, 24, 80)
         emulator.open_pty()
         emulator.start()
-        await emulator.input_queue.put(["stdin", "echo QUEUE_TEST\n"])
-        output_parts: list[str] = []
+        emulator.write_to_pty("echo QUEUE_TEST\n", time.monotonic())
+        assert emulator.metrics.write_latency.count == 1
+        output_parts: list[bytes] = []
         for _ in range(50):
             try:
                 msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=0.1)
                 if msg[0] == "stdout":
                     output_parts.append(msg[1])
-                    if "QUEUE_TEST" in "".join(output_parts):
+                    if b"QUEUE_TEST" in b"".join(output_parts):
                         break
             except TimeoutError:
                 continue
         emulator.stop()
-        combined = "".join(output_parts)
-        assert "QUEUE_TEST" in combined
+        combined = b"".join(output_parts)
+        assert b"QUEUE_TEST" in combined
 
     @pytest.mark.integration
-    async def test_input_queue_resize(self) -> None:
-        """Putting resize on input_queue should not raise."""
+    async def test_resize(self) -> None:
+        """resize() should resize the PTY window at once."""
         shell = os.environ.get("SHELL", "/bin/sh")
         emulator = PtyEmulator(shell, 24, 80)
         emulator.open_pty()
         emulator.start()
-        await emulator.input_queue.put(["resize", 40, 120])
-        await asyncio.sleep(0.1)
+        emulator.resize(40, 120)
         assert emulator._rows == 40
         assert emulator._cols == 120
         emulator.stop()
@@ -84,6 +89,143 @@ class TestPtyEmulator:
         assert emulator._pid is None
 
 
+class TestOutputBackpressure:
+    """Test byte-budgeted output and PTY read pausing."""
+
+    @pytest.mark.integration
+    async def test_flood_pauses_and_resumes_reading(self) -> None:
+        """A flooding child should pause reads at the budget and resume after draining."""
+        emulator = PtyEmulator("/bin/sh", 24, 80, output_budget=4096)
+        emulator.open_pty()
+        emulator.start()
+        emulator.write_to_pty("yes\n")
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            if emulator.reading_paused:
+                break
+        assert emulator.reading_paused
+        assert emulator.buffered_bytes <= 4096 + 65536
+        while not emulator.output_queue.empty():
+            emulator.output_queue.get_nowait()
+        assert not emulator.reading_paused
+        emulator.stop()
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("shared", [False, True])
+    async def test_drain_after_eof_does_not_resume_reading(self, shared: bool) -> None:
+        """Draining the queue after the PTY closed should not read its fd again."""
+        reactor = PtyReactor() if shared else None
+        emulator = PtyEmulator("true", 24, 80, reactor=reactor)
+        emulator.open_pty()
+        emulator.start()
+        fd = emulator._fd
+        assert fd is not None
+        kind = ""
+        while kind != "disconnect":
+            kind = (await asyncio.wait_for(emulator.output_queue.get(), timeout=5.0))[0]
+        assert emulator.reading_paused
+        await asyncio.sleep(0.05)
+        assert emulator.output_queue.empty()
+        if reactor is not None:
+            assert not reactor._channels[fd].reading
+        else:
+            assert not asyncio.get_running_loop().remove_reader(fd)
+        emulator.stop()
+        if reactor is not None:
+            reactor.close()
+
+
+class TestBufferedWrites:
+    """Test buffered input writes."""
+
+    @staticmethod
+    def _pipe_emulator() -> tuple[PtyEmulator, int, int]:
+        """Return an emulator writing into a non-blocking pipe instead of a PTY."""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        emulator = PtyEmulator("/bin/sh", 24, 80)
+        emulator._writer = PtyWriter(write_fd, LoopPoller())
+        return emulator, read_fd, write_fd
+
+    async def test_stop_drops_pending_input(self) -> None:
+        """Input still waiting for a full PTY should be dropped when the emulator stops."""
+        emulator, read_fd, write_fd = self._pipe_emulator()
+        emulator.write_to_pty("z" * 200_000)
+        assert emulator.pending_write_bytes > 0
+        emulator.stop()
+        assert emulator.pending_write_bytes == 0
+        emulator.write_to_pty("late")
+        assert emulator.pending_write_bytes == 0
+        os.close(read_fd)
+        os.close(write_fd)
+
+    def test_read_with_nothing_ready_is_not_eof(self) -> None:
+        """A non-blocking read with no data should return b"", not the EOF marker."""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        assert read_some(read_fd) == b""
+        os.close(write_fd)
+        assert read_some(read_fd) is None
+        os.close(read_fd)
+
+    @pytest.mark.integration
+    async def test_paste_into_stopped_child_does_not_block(self) -> None:
+        """Writing to a child that is not reading should return at once and lose nothing."""
+        emulator = PtyEmulator("wc", 24, 80)
+        emulator.open_pty()
+        emulator.start()
+        assert emulator._pid is not None
+        os.kill(emulator._pid, signal.SIGSTOP)
+        emulator.write_to_pty("".join(f"{index:05d}\n" for index in range(20_000)) + "\x04")
+        assert emulator.pending_write_bytes > 0
+        os.kill(emulator._pid, signal.SIGCONT)
+        output = bytearray()
+        deadline = asyncio.get_running_loop().time() + 5.0
+        while b"120000" not in output and asyncio.get_running_loop().time() < deadline:
+            try:
+                msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=0.05)
+            except TimeoutError:
+                continue
+            if msg[0] == "stdout":
+                output += msg[1]
+        assert emulator.pending_write_bytes == 0
+        emulator.stop()
+        assert output.split()[-3:] == [b"20000", b"20000", b"120000"]
+
+
+class TestOutputQueue:
+    """Test OutputQueue byte accounting."""
+
+    def test_tracks_buffered_bytes(self) -> None:
+        """Queued stdout payloads should be counted until they are consumed."""
+        queue = OutputQueue(100)
+        queue.put_nowait(["stdout", b"x" * 30])
+        queue.put_nowait(["disconnect", 1])
+        assert queue.buffered_bytes == 30
+        queue.get_nowait()
+        assert queue.buffered_bytes == 0
+
+    def test_over_budget(self) -> None:
+        """over_budget should be true only once the budget is exceeded."""
+        queue = OutputQueue(10)
+        queue.put_nowait(["stdout", b"x" * 10])
+        assert not queue.over_budget
+        queue.put_nowait(["stdout", b"x"])
+        assert queue.over_budget
+
+    def test_on_drain_called_below_half_budget(self) -> None:
+        """on_drain should fire once the queue drains to half the budget."""
+        drained: list[int] = []
+        queue = OutputQueue(10, on_drain=lambda: drained.append(queue.buffered_bytes))
+        for _ in range(3):
+            queue.put_nowait(["stdout", b"x" * 4])
+        queue.get_nowait()
+        assert not drained
+        queue.get_nowait()
+        assert drained == [4]
+
+
 class TestPtyFunctions:
     """Test low-level PTY functions."""
 
@@ -94,6 +236,22 @@ class TestPtyFunctions:
         assert fd >= 0
         close_pty(fd, pid)
 
+    def test_master_fd_is_non_blocking(self) -> None:
+        """The PTY master should be non-blocking so the loop never stalls on it."""
+        pid, fd = open_pty("/bin/sh", 24, 80)
+        assert not os.get_blocking(fd)
+        close_pty(fd, pid)
+
+    def test_write_some_reports_partial_writes(self) -> None:
+        """write_some should return how much a full pipe accepted, and 0 when it is full."""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(write_fd, False)
+        written = write_some(write_fd, b"x" * 1_000_000)
+        assert 0 < written < 1_000_000
+        assert write_some(write_fd, b"y") == 0
+        os.close(read_fd)
+        os.close(write_fd)
+
     def test_resize(self) -> None:
         """resize_fd should not raise for valid dimensions."""
         pid, fd = open_pty("/bin/sh", 24, 80)
@@ -21,19 +21,19 @@ class TestEnvironment:
         emulator.open_pty()
         emulator.start()
         emulator.write_to_pty("echo MYTERM=${TERM}\n")
-        output_parts: list[str] = []
+        output_parts: list[bytes] = []
         for _ in range(50):
             try:
                 msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=0.1)
                 if msg[0] == "stdout":
                     output_parts.append(msg[1])
-                    if "MYTERM=xterm-256color" in "".join(output_parts):
+                    if b"MYTERM=xterm-256color" in b"".join(output_parts):
                         break
             except TimeoutError:
                 continue
         emulator.stop()
-        combined = "".join(output_parts)
-        assert "MYTERM=xterm-256color" in combined
+        combined = b"".join(output_parts)
+        assert b"MYTERM=xterm-256color" in combined
 
     @pytest.mark.integration
     async def test_pty_inherits_home(self) -> None:
@@ -43,17 +43,17 @@ class TestEnvironment:
         emulator.open_pty()
         emulator.start()
         emulator.write_to_pty("echo MYHOME=${HOME}\n")
-        output_parts: list[str] = []
-        expected = f"MYHOME={os.environ['HOME']}"
+        output_parts: list[bytes] = []
+        expected = f"MYHOME={os.environ['HOME']}".encode()
         for _ in range(50):
             try:
                 msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=0.1)
                 if msg[0] == "stdout":
                     output_parts.append(msg[1])
-                    if expected in "".join(output_parts):
+                    if expected in b"".join(output_parts):
                         break
             except TimeoutError:
                 continue
         emulator.stop()
-        combined = "".join(output_parts)
+        combined = b"".join(output_parts)
         assert expected in combined
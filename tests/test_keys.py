@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from unittest.mock import MagicMock
 
-from textual_term._keys import CTRL_KEYS, translate_key
+from textual_term._keys import CTRL_KEYS, PASTE_END, PASTE_START, translate_key, translate_paste
 
 
 class TestCtrlKeys:
@@ -61,3 +61,24 @@ class TestTranslateKey:
         event.key = "unknown_special"
         event.character = None
         assert translate_key(event) is None
+
+
+class TestTranslatePaste:
+    """Test the translate_paste function."""
+
+    def test_plain_paste_converts_newlines(self) -> None:
+        """Line endings should be sent as carriage returns, like Enter."""
+        assert translate_paste("a\nb\r\nc", bracketed=False) == "a\rb\rc"
+
+    def test_bracketed_paste_is_wrapped(self) -> None:
+        """In bracketed mode the text should be wrapped in paste markers."""
+        assert translate_paste("ls\n", bracketed=True) == f"{PASTE_START}ls\r{PASTE_END}"
+
+    def test_embedded_end_marker_is_removed(self) -> None:
+        """An end marker inside the text should not terminate the paste early."""
+        pasted = translate_paste(f"x{PASTE_END}rm -rf ~\n", bracketed=True)
+        assert pasted.count(PASTE_END) == 1
+        assert pasted.endswith(PASTE_END)
+        nested = translate_paste("x\x1b[20\x1b[201~1~rm -rf ~\n", bracketed=True)
+        assert nested.count(PASTE_END) == 1
+        assert nested.endswith(PASTE_END)
@@ -0,0 +1,141 @@
+"""Tests for per-terminal performance metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pyte
+import pytest
+from textual.app import App, ComposeResult
+
+from textual_term._config import TerminalConfig
+from textual_term._emulator import PtyEmulator
+from textual_term._metrics import Histogram, TerminalMetrics
+from textual_term._reactor import PtyReactor
+from textual_term._screen import ResponsiveScreen
+from textual_term._widget import Terminal
+
+
+class TestHistogram:
+    """Test the power-of-two latency histogram."""
+
+    def test_summary_statistics(self) -> None:
+        """count, mean and max should be exact."""
+        histogram = Histogram()
+        for seconds in (0.001, 0.002, 0.003):
+            histogram.record(seconds)
+        assert histogram.count == 3
+        assert histogram.mean == pytest.approx(0.002)
+        assert histogram.max == 0.003
+
+    def test_percentiles_are_bucket_bounds(self) -> None:
+        """A percentile should be within a factor of two above the true value, capped at max."""
+        histogram = Histogram()
+        for _ in range(99):
+            histogram.record(0.0001)
+        histogram.record(0.5)
+        assert 0.0001 <= histogram.percentile(0.5) < 0.0002
+        assert histogram.percentile(1.0) == 0.5
+        assert Histogram().percentile(0.99) == 0.0
+
+    def test_huge_samples_land_in_last_bucket(self) -> None:
+        """Samples beyond the last bucket should still be counted."""
+        histogram = Histogram()
+        histogram.record(3600.0)
+        assert histogram.buckets[-1] == 1
+
+    def test_snapshot_is_independent(self) -> None:
+        """A snapshot should not change when the original is updated."""
+        metrics = TerminalMetrics()
+        metrics.parse.record(0.001)
+        snapshot = metrics.snapshot()
+        metrics.parse.record(0.001)
+        metrics.bytes_parsed += 10
+        assert snapshot.parse.count == 1
+        assert snapshot.bytes_parsed == 0
+
+
+async def _read_until(emulator: PtyEmulator, marker: bytes) -> bytes:
+    output = bytearray()
+    deadline = asyncio.get_running_loop().time() + 5.0
+    while marker not in output and asyncio.get_running_loop().time() < deadline:
+        try:
+            msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=0.05)
+        except TimeoutError:
+            continue
+        if msg[0] == "stdout":
+            output += msg[1]
+    return bytes(output)
+
+
+class TestEmulatorMetrics:
+    """Test the PTY-side counters."""
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("shared", [False, True])
+    async def test_counts_reads_and_keystroke_latency(self, shared: bool) -> None:
+        """Bytes read, reads and chunks should add up, and a timed write should be measured."""
+        reactor = PtyReactor() if shared else None
+        emulator = PtyEmulator("/bin/sh", 24, 80, reactor=reactor)
+        emulator.open_pty()
+        emulator.start()
+        emulator.write_to_pty("echo METRICS\n", time.monotonic())
+        output = await _read_until(emulator, b"METRICS\r\n")
+        metrics = emulator.metrics
+        emulator.stop()
+        assert metrics.bytes_read >= len(output) > 0
+        assert metrics.reads >= metrics.chunks_queued >= 1
+        assert metrics.peak_queued_bytes > 0
+        assert metrics.write_latency.count == 1
+        assert emulator.metrics.reads >= metrics.reads
+
+
+class TestTerminalMetrics:
+    """Test the widget-side counters and the periodic message."""
+
+    async def test_recv_loop_counts_parse_and_render(self) -> None:
+        """Parsed bytes, feed calls and rendered frames should be counted."""
+        terminal = Terminal(command="/bin/sh", config=TerminalConfig(turn_budget=None))
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        screen = ResponsiveScreen(20, 4, write_callback=lambda _data: None)
+        queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
+        for chunk in (b"hello ", b"world", b"\r\n"):
+            await queue.put(["stdout", chunk])
+        await queue.put(["disconnect", 1])
+        await terminal._pump.run(MagicMock(output_queue=queue), pyte.ByteStream(screen), screen)
+        metrics = terminal.metrics
+        assert metrics.bytes_parsed == 13
+        assert metrics.parse.count == 3
+        assert metrics.frames_rendered == metrics.render.count == 1
+        assert metrics.refreshes == 1
+
+    def test_metrics_interval_must_be_positive(self) -> None:
+        """A non-positive metrics_interval should be rejected."""
+        with pytest.raises(ValueError, match="metrics_interval"):
+            TerminalConfig(metrics_interval=0)
+
+    @pytest.mark.integration
+    async def test_metrics_messages_are_posted(self) -> None:
+        """With metrics_interval set, MetricsUpdated should arrive periodically."""
+        received: list[Terminal.MetricsUpdated] = []
+
+        class MetricsApp(App[None]):
+            def compose(self) -> ComposeResult:
+                yield Terminal(command="/bin/sh", config=TerminalConfig(metrics_interval=0.05))
+
+            def on_mount(self) -> None:
+                self.query_one(Terminal).start()
+
+            def on_terminal_metrics_updated(self, message: Terminal.MetricsUpdated) -> None:
+                received.append(message)
+
+        app = MetricsApp()
+        async with app.run_test() as pilot:
+            await pilot.pause(0.3)
+            terminal = app.query_one(Terminal)
+            terminal.stop()
+        assert len(received) >= 2
+        assert received[-1].metrics.emulator is not None
+        assert received[-1].control is terminal
@@ -0,0 +1,260 @@
+"""Tests for the shared PTY reactor."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Callable
+
+import pytest
+
+import textual_term._pty
+from textual_term._emulator import PtyEmulator
+from textual_term._reactor import LoopPoller, PtyReactor, shared_reactor
+
+
+def _pipe() -> tuple[int, int]:
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.set_blocking(write_fd, False)
+    return read_fd, write_fd
+
+
+async def _until(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.001)
+
+
+class TestPtyReactor:
+    """Test reading and writing through one selector."""
+
+    async def test_reads_are_batched_per_fd(self) -> None:
+        """Everything ready on an fd should arrive as one chunk, separately per fd."""
+        reactor = PtyReactor()
+        pipes = [_pipe() for _ in range(3)]
+        received: dict[int, list[bytes | None]] = {fd: [] for fd, _ in pipes}
+        for read_fd, _ in pipes:
+            reactor.attach(read_fd, received[read_fd].append)
+        for index, (_, write_fd) in enumerate(pipes):
+            for _ in range(5):
+                os.write(write_fd, f"{index}".encode() * 10)
+        await _until(lambda: all(received.values()))
+        assert [received[fd] for fd, _ in pipes] == [[b"0" * 50], [b"1" * 50], [b"2" * 50]]
+        reactor.close()
+        for read_fd, write_fd in pipes:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    async def test_read_budget_caps_a_batch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A single pass should stop reading an fd once read_budget bytes are taken."""
+        monkeypatch.setattr(textual_term._pty, "READ_SIZE", 1000)
+        reactor = PtyReactor(read_budget=4096)
+        read_fd, write_fd = _pipe()
+        chunks: list[bytes | None] = []
+        reactor.attach(read_fd, chunks.append)
+        os.write(write_fd, b"x" * 60_000)
+        await _until(lambda: sum(len(chunk or b"") for chunk in chunks) == 60_000)
+        assert {len(chunk or b"") for chunk in chunks} == {5000}
+        reactor.close()
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_short_reads_do_not_end_a_batch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """An fd should be read until it would block, as PTYs return short reads."""
+        reads = iter([b"ab", b"cd", b"e", b""])
+        monkeypatch.setattr(textual_term._pty, "read_some", lambda _fd: next(reads))
+        reactor = PtyReactor()
+        read_fd, write_fd = _pipe()
+        chunks: list[bytes | None] = []
+        reactor.attach(read_fd, chunks.append)
+        os.write(write_fd, b"x")
+        await _until(lambda: bool(chunks))
+        assert chunks == [b"abcde"]
+        assert reactor.read_count(read_fd) == 4
+        reactor.close()
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_fd_detached_in_a_pass_is_not_read(self) -> None:
+        """An fd detached by another fd's callback should not be read later in that pass."""
+        reactor = PtyReactor()
+        pipes = [_pipe(), _pipe()]
+        received: list[int] = []
+
+        def on_output(fd: int, other: int) -> None:
+            received.append(fd)
+            reactor.detach(other)
+
+        (first, first_w), (second, second_w) = pipes
+        reactor.attach(first, lambda _data: on_output(first, second))
+        reactor.attach(second, lambda _data: on_output(second, first))
+        os.write(first_w, b"1")
+        os.write(second_w, b"2")
+        await _until(lambda: bool(received))
+        await asyncio.sleep(0.01)
+        assert len(received) == 1
+        reactor.close()
+        for read_fd, write_fd in pipes:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    async def test_eof_is_reported_once_as_none(self) -> None:
+        """Pending output should be delivered before the EOF marker."""
+        reactor = PtyReactor()
+        read_fd, write_fd = _pipe()
+        chunks: list[bytes | None] = []
+
+        def on_output(data: bytes | None) -> None:
+            chunks.append(data)
+            if data is None:
+                reactor.detach(read_fd)
+
+        reactor.attach(read_fd, on_output)
+        os.write(write_fd, b"bye")
+        os.close(write_fd)
+        await _until(lambda: None in chunks)
+        assert chunks == [b"bye", None]
+        assert len(reactor) == 0
+        os.close(read_fd)
+
+    async def test_paused_fd_is_not_read(self) -> None:
+        """pause_reading should leave data in the fd until resume_reading."""
+        reactor = PtyReactor()
+        read_fd, write_fd = _pipe()
+        chunks: list[bytes | None] = []
+        reactor.attach(read_fd, chunks.append)
+        reactor.pause_reading(read_fd)
+        os.write(write_fd, b"held")
+        await asyncio.sleep(0.02)
+        assert chunks == []
+        reactor.resume_reading(read_fd)
+        await _until(lambda: bool(chunks))
+        assert chunks == [b"held"]
+        reactor.close()
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_writer_called_when_writable(self) -> None:
+        """add_writer should call back from the reactor pass until removed."""
+        reactor = PtyReactor()
+        read_fd, write_fd = _pipe()
+        calls: list[int] = []
+        reactor.attach(write_fd, lambda _data: None)
+        reactor.pause_reading(write_fd)
+
+        def on_writable() -> None:
+            calls.append(1)
+            reactor.remove_writer(write_fd)
+
+        reactor.add_writer(write_fd, on_writable)
+        await _until(lambda: bool(calls))
+        await asyncio.sleep(0.01)
+        assert calls == [1]
+        reactor.close()
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_loop_registration_follows_attached_fds(self) -> None:
+        """The selector fd should be watched only while something is attached."""
+        loop = asyncio.get_running_loop()
+        reactor = PtyReactor()
+        read_fd, write_fd = _pipe()
+        reactor.attach(read_fd, lambda _data: None)
+        assert loop.remove_reader(reactor._selector.fileno())
+        loop.add_reader(reactor._selector.fileno(), reactor._poll)
+        reactor.detach(read_fd)
+        assert not loop.remove_reader(reactor._selector.fileno())
+        reactor.close()
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_shared_reactor_is_per_loop(self) -> None:
+        """shared_reactor should return the same reactor on one loop."""
+        assert shared_reactor() is shared_reactor()
+
+
+class TestLoopPoller:
+    """Test the per-fd poller over the loop's own callbacks."""
+
+    async def test_reads_pause_and_detach(self) -> None:
+        """Each read should be delivered and counted, and nothing read while paused."""
+        poller = LoopPoller()
+        read_fd, write_fd = _pipe()
+        chunks: list[bytes | None] = []
+        poller.attach(read_fd, chunks.append)
+        os.write(write_fd, b"one")
+        await _until(lambda: bool(chunks))
+        poller.pause_reading(read_fd)
+        os.write(write_fd, b"two")
+        await asyncio.sleep(0.02)
+        assert chunks == [b"one"]
+        poller.resume_reading(read_fd)
+        await _until(lambda: len(chunks) == 2)
+        assert chunks == [b"one", b"two"]
+        assert poller.read_count(read_fd) == 2
+        poller.detach(read_fd)
+        assert not asyncio.get_running_loop().remove_reader(read_fd)
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+class TestEmulatorOnReactor:
+    """Test PtyEmulator with a shared reactor."""
+
+    @pytest.mark.integration
+    async def test_many_terminals_share_one_reactor(self) -> None:
+        """Several emulators should all produce output through one reactor."""
+        reactor = PtyReactor()
+        emulators = [PtyEmulator("/bin/sh", 24, 80, reactor=reactor) for _ in range(4)]
+        for index, emulator in enumerate(emulators):
+            emulator.open_pty()
+            emulator.start()
+            emulator.write_to_pty(f"echo REACTOR_{index}_OK\n")
+        assert len(reactor) == 4
+        outputs = [bytearray() for _ in emulators]
+
+        def done() -> bool:
+            for index, emulator in enumerate(emulators):
+                while not emulator.output_queue.empty():
+                    msg = emulator.output_queue.get_nowait()
+                    if msg[0] == "stdout":
+                        outputs[index] += msg[1]
+            return all(f"REACTOR_{i}_OK\r\n".encode() in out for i, out in enumerate(outputs))
+
+        await _until(done, timeout=5.0)
+        assert done()
+        for emulator in emulators:
+            emulator.stop()
+        assert len(reactor) == 0
+        reactor.close()
+
+    @pytest.mark.integration
+    async def test_backpressure_pauses_the_fd(self) -> None:
+        """An emulator over its output budget should stop being read by the reactor."""
+        reactor = PtyReactor()
+        emulator = PtyEmulator("/bin/sh", 24, 80, output_budget=4096, reactor=reactor)
+        emulator.open_pty()
+        emulator.start()
+        emulator.write_to_pty("yes\n")
+        await _until(lambda: emulator.reading_paused)
+        assert emulator.reading_paused
+        while not emulator.output_queue.empty():
+            emulator.output_queue.get_nowait()
+        assert not emulator.reading_paused
+        emulator.stop()
+        reactor.close()
+
+    @pytest.mark.integration
+    async def test_child_exit_disconnects(self) -> None:
+        """A child exiting should put a disconnect message on the output queue."""
+        reactor = PtyReactor()
+        emulator = PtyEmulator("true", 24, 80, reactor=reactor)
+        emulator.open_pty()
+        emulator.start()
+        messages: list[str] = []
+        while "disconnect" not in messages:
+            msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=5.0)
+            messages.append(msg[0])
+        emulator.stop()
+        reactor.close()
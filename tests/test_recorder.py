@@ -0,0 +1,148 @@
+"""Tests for asciicast session recording."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from textual_term._config import TerminalConfig
+from textual_term._connection import TerminalConnection
+from textual_term._emulator import PtyEmulator
+from textual_term._recorder import AsciicastRecorder
+from textual_term._widget import Terminal
+
+
+def _read_cast(path: Path) -> tuple[dict, list[list]]:  # pyright: ignore[reportMissingTypeArgument]
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return json.loads(lines[0]), [json.loads(line) for line in lines[1:]]
+
+
+class TestAsciicastRecorder:
+    """Test the asciicast file format, batching and rotation."""
+
+    def test_records_output_input_and_resize(self, tmp_path: Path) -> None:
+        """Events should be written after the v2 header in order, with increasing times."""
+        path = tmp_path / "session.cast"
+        recorder = AsciicastRecorder(str(path), 80, 24, command="/bin/sh")
+        recorder.output(b"$ ")
+        recorder.input("ls\r")
+        recorder.resize(100, 30)
+        recorder.output("é".encode())
+        recorder.close()
+        header, events = _read_cast(path)
+        assert header["version"] == 2
+        assert (header["width"], header["height"], header["command"]) == (80, 24, "/bin/sh")
+        assert [event[1:] for event in events] == [
+            ["o", "$ "],
+            ["i", "ls\r"],
+            ["r", "100x30"],
+            ["o", "é"],
+        ]
+        times = [event[0] for event in events]
+        assert times == sorted(times) and times[0] >= 0
+
+    def test_split_utf8_is_joined(self, tmp_path: Path) -> None:
+        """A character split across two reads should be recorded once, intact."""
+        path = tmp_path / "session.cast"
+        recorder = AsciicastRecorder(str(path), 80, 24)
+        encoded = "中".encode()
+        recorder.output(encoded[:1])
+        recorder.output(encoded[1:])
+        recorder.close()
+        _header, events = _read_cast(path)
+        assert [event[2] for event in events] == ["中"]
+
+    def test_writes_are_batched(self, tmp_path: Path) -> None:
+        """Nothing should reach the file before the flush interval or an explicit flush."""
+        path = tmp_path / "session.cast"
+        recorder = AsciicastRecorder(str(path), 80, 24, flush_interval=60.0)
+        recorder.output(b"buffered")
+        time.sleep(0.05)
+        assert not path.exists()
+        recorder.flush(timeout=5.0)
+        assert _read_cast(path)[1][0][2] == "buffered"
+        recorder.close()
+
+    def test_rotation_and_retention(self, tmp_path: Path) -> None:
+        """Parts should stay under max_bytes and only the newest max_files be kept."""
+        path = tmp_path / "session.cast"
+        recorder = AsciicastRecorder(str(path), 80, 24, max_bytes=1024, max_files=3)
+        for index in range(200):
+            recorder.output(f"line {index:04d}\r\n".encode())
+        recorder.close()
+        parts = [Path(part) for part in recorder.parts]
+        assert len(parts) == 3
+        assert sorted(tmp_path.iterdir()) == sorted(parts)
+        assert all(part.stat().st_size <= 1024 for part in parts)
+        header, events = _read_cast(parts[-1])
+        assert header["version"] == 2
+        assert events[-1][2] == "line 0199\r\n"
+        assert events[0][0] < 1.0
+
+    def test_overflow_is_dropped_not_buffered(self, tmp_path: Path) -> None:
+        """Past buffer_limit, events should be dropped and counted."""
+        recorder = AsciicastRecorder(str(tmp_path / "session.cast"), 80, 24, flush_interval=60.0)
+        recorder.buffer_limit = 100
+        recorder.flush_bytes = 1 << 30
+        for _ in range(10):
+            recorder.output(b"x" * 50)
+        assert recorder.dropped_bytes == 350
+        recorder.close()
+
+    def test_write_error_stops_recording(self, tmp_path: Path) -> None:
+        """A file that cannot be opened should be reported in error, not raised."""
+        recorder = AsciicastRecorder(str(tmp_path / "missing" / "session.cast"), 80, 24)
+        recorder.output(b"lost")
+        recorder.close()
+        assert isinstance(recorder.error, OSError)
+
+
+class TestRecordingSessions:
+    """Test recording through PtyEmulator and Terminal."""
+
+    @pytest.mark.integration
+    async def test_emulator_records_session(self, tmp_path: Path) -> None:
+        """Output, input and resizes of a running PTY should all be recorded."""
+        path = tmp_path / "session.cast"
+        recorder = AsciicastRecorder(str(path), 80, 24)
+        emulator = PtyEmulator("/bin/sh", 24, 80, recorder=recorder)
+        emulator.open_pty()
+        emulator.start()
+        emulator.write_to_pty("echo RECORDED\n")
+        emulator.resize(30, 100)
+        output = bytearray()
+        deadline = asyncio.get_running_loop().time() + 5.0
+        while b"RECORDED\r\n" not in output and asyncio.get_running_loop().time() < deadline:
+            try:
+                msg = await asyncio.wait_for(emulator.output_queue.get(), timeout=0.05)
+            except TimeoutError:
+                continue
+            if msg[0] == "stdout":
+                output += msg[1]
+        emulator.stop()
+        recorder.close()
+        _header, events = _read_cast(path)
+        kinds = {event[1] for event in events}
+        assert kinds == {"o", "i", "r"}
+        assert "RECORDED\r\n" in "".join(event[2] for event in events if event[1] == "o")
+
+    def test_terminal_stop_closes_recorder(self, tmp_path: Path) -> None:
+        """Terminal.stop() should flush and close the recording."""
+        config = TerminalConfig(record_path=str(tmp_path / "session.cast"))
+        terminal = Terminal(command="/bin/sh", config=config)
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        with patch("textual_term._connection.PtyEmulator"):
+            terminal._connection = TerminalConnection(
+                "/bin/sh", 24, 80, config, terminal.scrollback, terminal._pump
+            )
+        recorder = terminal.recorder
+        assert recorder is not None
+        recorder.output(b"bye")
+        terminal.stop()
+        assert terminal.recorder is None
+        assert _read_cast(tmp_path / "session.cast")[1][0][2] == "bye"
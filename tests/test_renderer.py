@@ -4,12 +4,20 @@ from __future__ import annotations
 
 import pyte
 from pyte.screens import Char
-from rich.text import Text
+from rich.segment import Segment
+from rich.style import Style
+from textual.strip import Strip
 
 from textual_term._renderer import (
-    TerminalRenderable,
+    SEARCH_CURRENT_STYLE,
+    SEARCH_MATCH_STYLE,
+    ScreenRenderer,
     _char_to_style,
+    _line_runs,
+    _render_line,
     _resolve_color,
+    highlight_matches,
+    overlay_cursor,
     render_screen,
 )
 
@@ -64,6 +72,52 @@ class TestCharToStyle:
         style = _char_to_style(char)
         assert style.color is not None
 
+    def test_identical_attributes_share_style(self) -> None:
+        """Cells with identical attributes should reuse one interned Style."""
+        first = _char_to_style(Char("a", fg="ff8800", bold=True))
+        second = _char_to_style(Char("b", fg="ff8800", bold=True))
+        assert first is second
+
+
+def _styled_cells(strip: Strip) -> list[tuple[str, Style | None]]:
+    """Return one (character, style) pair per character of a Strip."""
+    return [(char, segment.style) for segment in strip for char in segment.text]
+
+
+class TestLineRuns:
+    """Test run-length coalescing of screen cells."""
+
+    def test_same_style_cells_coalesce(self) -> None:
+        """Adjacent cells with identical attributes should form one run."""
+        line = {x: Char(c, fg="red") for x, c in enumerate("abc")}
+        line.update({x + 3: Char(c, fg="blue") for x, c in enumerate("de")})
+        runs = _line_runs(line, 5)
+        assert [data for data, _ in runs] == ["abc", "de"]
+
+    def test_missing_cells_form_blank_run(self) -> None:
+        """Missing cells should coalesce into one unstyled run of spaces."""
+        runs = _line_runs({0: Char("x", fg="red")}, 6)
+        assert runs[1] == ("     ", None)
+
+    def test_output_matches_per_cell_rendering(self) -> None:
+        """Coalesced rendering should produce the same output as one span per cell."""
+        screen = pyte.Screen(30, 1)
+        stream = pyte.Stream(screen)
+        stream.feed("\x1b[31mred\x1b[1;44m bold \x1b[0m plain \x1b[38;2;1;2;3m中文\x1b[7mrev")
+        cells = []
+        for x in range(screen.columns):
+            char = screen.buffer[0].get(x)
+            if char is None:
+                cells.append(Segment(" "))
+            else:
+                cells.append(Segment(char.data, _char_to_style(char)))
+        reference = Strip(cells)
+        rendered = _render_line(screen.buffer[0], screen.columns)
+        assert rendered.text == reference.text
+        assert rendered.cell_length == screen.columns
+        assert _styled_cells(rendered) == _styled_cells(reference)
+        assert len(list(rendered)) < len(cells)
+
 
 class TestRenderScreen:
     """Test full screen rendering."""
@@ -74,7 +128,8 @@ class TestRenderScreen:
         lines = render_screen(screen, show_cursor=False)
         assert len(lines) == 3
         for line in lines:
-            assert isinstance(line, Text)
+            assert isinstance(line, Strip)
+            assert line.cell_length == 10
 
     def test_screen_with_text(self) -> None:
         """Text written to screen should appear in rendered output."""
@@ -82,28 +137,127 @@ class TestRenderScreen:
         stream = pyte.Stream(screen)
         stream.feed("hello")
         lines = render_screen(screen, show_cursor=False)
-        assert "hello" in lines[0].plain
+        assert "hello" in lines[0].text
 
     def test_cursor_rendering(self) -> None:
         """Cursor position should get reverse style when show_cursor is True."""
         screen = pyte.Screen(10, 3)
         lines = render_screen(screen, show_cursor=True)
-        first_line = lines[0]
-        spans = first_line._spans
-        assert any(span.style.reverse for span in spans if hasattr(span.style, "reverse") and span.style.reverse)
+        assert any(segment.style is not None and segment.style.reverse for segment in lines[0])
+
+
+class TestScreenRenderer:
+    """Test incremental dirty-line rendering."""
+
+    def test_first_render_builds_all_lines(self) -> None:
+        """The first render should produce one line per screen row."""
+        screen = pyte.Screen(10, 3)
+        lines = ScreenRenderer().render(screen)
+        assert len(lines) == 3
+        assert not screen.dirty
+
+    def test_only_dirty_lines_rerendered(self) -> None:
+        """Lines outside screen.dirty should be reused from the cache."""
+        screen = pyte.Screen(20, 3)
+        stream = pyte.Stream(screen)
+        renderer = ScreenRenderer()
+        first = renderer.render(screen)
+        stream.feed("\x1b[3;1Hbottom")
+        second = renderer.render(screen)
+        assert second[0] is first[0]
+        assert second[1] is first[1]
+        assert second[2] is not first[2]
+        assert "bottom" in second[2].text
+
+    def test_cursor_move_rerenders_nothing(self) -> None:
+        """The cursor is drawn as an overlay, so moving it should not rebuild any row."""
+        screen = pyte.Screen(10, 3)
+        stream = pyte.Stream(screen)
+        renderer = ScreenRenderer()
+        first = renderer.render(screen)
+        stream.feed("\x1b[2;1H")
+        second = renderer.render(screen)
+        assert all(new is old for new, old in zip(second, first))
+
+    def test_resize_rebuilds_all_lines(self) -> None:
+        """A screen size change should rebuild every line."""
+        screen = pyte.Screen(10, 3)
+        renderer = ScreenRenderer()
+        renderer.render(screen)
+        screen.resize(5, 12)
+        lines = renderer.render(screen)
+        assert len(lines) == 5
+        assert all(line.cell_length == 12 for line in lines)
+
+    def test_invalidate_forces_full_render(self) -> None:
+        """invalidate() should make the next render rebuild every line."""
+        screen = pyte.Screen(10, 3)
+        renderer = ScreenRenderer()
+        first = renderer.render(screen)
+        renderer.invalidate()
+        second = renderer.render(screen)
+        assert all(new is not old for new, old in zip(second, first))
+
+
+class TestOverlayCursor:
+    """Test drawing the cursor over a rendered strip."""
+
+    def test_cursor_cell_is_split_out_and_reversed(self) -> None:
+        """The cursor cell should become its own reversed segment, keeping its colour."""
+        red = Style(color="red")
+        strip = Strip([Segment("abcde", red)])
+        overlaid = overlay_cursor(strip, 2)
+        assert [segment.text for segment in overlaid] == ["ab", "c", "de"]
+        styles = [segment.style for segment in overlaid]
+        assert styles[0] == styles[2] == red
+        assert styles[1] is not None and styles[1].reverse and styles[1].color == red.color
+
+    def test_blank_cell_gets_cursor_style(self) -> None:
+        """An unstyled cell under the cursor should be drawn reversed."""
+        overlaid = overlay_cursor(Strip([Segment("   ")]), 0)
+        assert [segment.text for segment in overlaid] == [" ", "  "]
+        assert next(iter(overlaid)).style == Style(reverse=True)
+        assert overlaid.cell_length == 3
+
+    def test_reversed_cell_stays_reversed(self) -> None:
+        """The cursor over reverse-video text should not toggle it back."""
+        overlaid = overlay_cursor(Strip([Segment("x", Style(reverse=True))]), 0)
+        assert next(iter(overlaid)).style.reverse is True  # type: ignore[union-attr]
+
+    def test_cursor_past_end_is_not_drawn(self) -> None:
+        """A cursor beyond the last column should leave the strip unchanged."""
+        strip = Strip([Segment("abc")])
+        assert overlay_cursor(strip, 3) is strip
+
 
+class TestHighlightMatches:
+    """Test layering search highlights over rendered strips."""
 
-class TestTerminalRenderable:
-    """Test the TerminalRenderable wrapper."""
+    def test_splits_segments_at_match_boundaries(self) -> None:
+        """Matches should be cut out of their segments and keep the cell style."""
+        red = Style(color="red")
+        strip = Strip([Segment("abc", red), Segment("def")])
+        highlighted = highlight_matches(strip, [(1, 4)], None)
+        assert highlighted.text == "abcdef"
+        assert _styled_cells(highlighted) == [
+            ("a", red),
+            ("b", red + SEARCH_MATCH_STYLE),
+            ("c", red + SEARCH_MATCH_STYLE),
+            ("d", SEARCH_MATCH_STYLE),
+            ("e", None),
+            ("f", None),
+        ]
 
-    def test_rich_console_yields_lines(self) -> None:
-        """__rich_console__ should yield the text lines."""
-        text_lines = [Text("line1"), Text("line2")]
-        renderable = TerminalRenderable(text_lines)
-        from unittest.mock import MagicMock
+    def test_current_match_stands_out(self) -> None:
+        """The current match should use its own style."""
+        strip = Strip([Segment("one two")])
+        highlighted = highlight_matches(strip, [(0, 3), (4, 7)], (4, 7))
+        styles = [segment.style for segment in highlighted]
+        assert styles == [SEARCH_MATCH_STYLE, None, SEARCH_CURRENT_STYLE]
 
-        console = MagicMock()
-        options = MagicMock()
-        result = list(renderable.__rich_console__(console, options))
-        assert len(result) == 2
-        assert result[0].plain == "line1"
+    def test_offsets_count_characters_not_cells(self) -> None:
+        """Match offsets index the line text, so wide characters are not counted twice."""
+        strip = Strip([Segment("中文 ok")])
+        highlighted = highlight_matches(strip, [(3, 5)], None)
+        assert [segment.text for segment in highlighted] == ["中文 ", "ok"]
+        assert highlighted.cell_length == 7
@@ -0,0 +1,132 @@
+"""Tests for session replay and keyframe seeking."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pyte
+from textual.strip import Strip
+
+from textual_term._recorder import AsciicastRecorder
+from textual_term._replay import Recording, ReplayEngine, load_cast
+from textual_term._widget import Terminal
+
+
+def _recording(seconds: int = 100) -> Recording:
+    """One coloured line per second, with a resize half way through."""
+    recording = Recording(40, 10)
+    for second in range(seconds):
+        recording.times.append(float(second))
+        recording.events.append(f"\x1b[3{second % 8}mline {second:03d}\x1b[0m\r\n".encode())
+        if second == seconds // 2:
+            recording.times.append(second + 0.5)
+            recording.events.append((50, 12))
+    return recording
+
+
+def _played_to(recording: Recording, position: float) -> list[str]:
+    engine = ReplayEngine(recording)
+    engine.advance_to(position)
+    return engine.screen.display
+
+
+class TestLoadCast:
+    """Test reading asciicast files."""
+
+    def test_round_trip_with_recorder(self, tmp_path: Path) -> None:
+        """A file written by AsciicastRecorder should load back as output and resizes."""
+        path = tmp_path / "session.cast"
+        recorder = AsciicastRecorder(str(path), 80, 24)
+        recorder.output(b"hello ")
+        recorder.input("typed")
+        recorder.resize(100, 30)
+        recorder.output("wörld".encode())
+        recorder.close()
+        recording = load_cast(str(path))
+        assert (recording.width, recording.height) == (80, 24)
+        assert recording.events == [b"hello ", (100, 30), "wörld".encode()]
+        assert recording.times == sorted(recording.times)
+
+
+class TestReplayEngine:
+    """Test advancing, keyframes and seeking."""
+
+    def test_advance_applies_events_up_to_position(self) -> None:
+        """advance_to should show exactly the output recorded up to that time."""
+        engine = ReplayEngine(_recording())
+        engine.advance_to(2.5)
+        assert [line.rstrip() for line in engine.screen.display[:4]] == [
+            "line 000",
+            "line 001",
+            "line 002",
+            "",
+        ]
+
+    def test_keyframes_taken_at_interval(self) -> None:
+        """Playing through should take a keyframe every keyframe_interval seconds."""
+        engine = ReplayEngine(_recording(), keyframe_interval=10.0)
+        engine.advance_to(99.0)
+        assert engine.keyframe_count == 9
+        assert engine.finished
+
+    def test_seek_matches_sequential_playback(self) -> None:
+        """Seeking forwards and backwards should give the same screen as playing from the start."""
+        recording = _recording()
+        engine = ReplayEngine(recording, keyframe_interval=10.0)
+        engine.build_keyframes()
+        for position in (73.2, 12.0, 50.7, 99.0, 0.0, 49.9):
+            engine.seek(position)
+            assert engine.screen.display == _played_to(recording, position), position
+        assert (engine.screen.columns, engine.screen.lines) == (40, 10)
+
+    def test_seek_parses_from_nearest_keyframe(self) -> None:
+        """A seek should only parse the events after the closest keyframe."""
+        engine = ReplayEngine(_recording(), keyframe_interval=10.0)
+        engine.build_keyframes()
+        engine.seek(80.0)
+        feed = pyte.ByteStream.feed
+        with patch.object(pyte.ByteStream, "feed", autospec=True, side_effect=feed) as spy:
+            engine.seek(5.0)
+            engine.seek(95.0)
+        fed = b"".join(call.args[1] for call in spy.call_args_list)
+        assert fed.count(b"line") == 12
+
+    def test_frame_renders_the_screen(self) -> None:
+        """frame() should return one strip per row and the cursor position."""
+        engine = ReplayEngine(_recording())
+        engine.advance_to(1.0)
+        lines, cursor = engine.frame()
+        assert len(lines) == 10
+        assert lines[1].text.startswith("line 001")
+        assert cursor == (0, 2)
+
+
+class TestPlayback:
+    """Test timed and unthrottled playback."""
+
+    async def test_fast_playback_reaches_the_end(self) -> None:
+        """Playing without a speed should apply everything and post a final frame."""
+        engine = ReplayEngine(_recording())
+        frames: list[list[Strip]] = []
+        await asyncio.wait_for(
+            engine.play(lambda lines, _cursor: frames.append(lines), speed=None), timeout=10.0
+        )
+        assert engine.finished
+        assert frames[-1][-2].text.startswith("line 099")
+
+    async def test_speed_scales_playback(self) -> None:
+        """At 100x, a one-second recording should take about 10 ms."""
+        engine = ReplayEngine(_recording(seconds=2))
+        started = asyncio.get_running_loop().time()
+        await asyncio.wait_for(engine.play(lambda _lines, _cursor: None, speed=100.0), 5.0)
+        elapsed = asyncio.get_running_loop().time() - started
+        assert 0.005 <= elapsed < 0.5
+
+    async def test_terminal_replay(self) -> None:
+        """Terminal.replay should show the recording in the widget."""
+        terminal = Terminal(command="/bin/sh")
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        await terminal.replay(ReplayEngine(_recording(seconds=5)), speed=None)
+        assert terminal.render_line(4).text.startswith("line 004")
@@ -0,0 +1,151 @@
+"""Tests for deficit round-robin output scheduling."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+from unittest.mock import MagicMock
+
+import pyte
+
+from textual_term._config import TerminalConfig
+from textual_term._queue import OutputQueue
+from textual_term._scheduler import OutputScheduler, shared_scheduler
+from textual_term._screen import ResponsiveScreen
+from textual_term._widget import Terminal
+
+
+class TestOutputScheduler:
+    """Test turn order, deficits and statistics."""
+
+    async def test_busy_slots_alternate(self) -> None:
+        """Two backlogged slots should take turns instead of one running to completion."""
+        scheduler = OutputScheduler()
+        order: list[str] = []
+
+        async def worker(name: str, turns: int) -> None:
+            slot = scheduler.register(0.001)
+            for remaining in range(turns - 1, -1, -1):
+                async with slot.turn(lambda remaining=remaining: remaining > 0):
+                    order.append(name)
+                    slot.charge(0.001)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(worker("a", 3), worker("b", 3))
+        assert order == ["a", "b", "a", "b", "a", "b"]
+
+    async def test_overrun_is_paid_back(self) -> None:
+        """A turn that overruns its quantum should leave a debt for the next turn."""
+        scheduler = OutputScheduler()
+        slot = scheduler.register(0.005)
+        async with slot.turn(lambda: True):
+            slot.charge(0.012)
+        assert slot.deficit < 0
+        async with slot.turn(lambda: True):
+            assert slot.deficit < 0
+        assert slot.stats.turns == 2
+        assert slot.stats.deficit == slot.deficit
+
+    async def test_idle_slot_forfeits_credit(self) -> None:
+        """A slot that finishes its work should not bank the rest of its quantum."""
+        scheduler = OutputScheduler()
+        slot = scheduler.register(0.005)
+        async with slot.turn(lambda: False):
+            slot.charge(0.001, 100)
+        assert slot.deficit == 0.0
+        assert slot.stats.bytes_fed == 100
+
+    async def test_waiting_time_is_recorded(self) -> None:
+        """A slot queued behind another should record how long it waited."""
+        scheduler = OutputScheduler()
+        first, second = scheduler.register(), scheduler.register()
+        await scheduler.acquire(first)
+        waiter = asyncio.create_task(scheduler.acquire(second))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        scheduler.release(first, False)
+        await waiter
+        assert second.stats.max_wait_seconds >= 0.009
+        scheduler.release(second, False)
+
+    async def test_cancelled_waiter_does_not_block_others(self) -> None:
+        """Cancelling a queued slot should leave the turn free for the next one."""
+        scheduler = OutputScheduler()
+        first, second, third = (scheduler.register() for _ in range(3))
+        await scheduler.acquire(first)
+        cancelled = asyncio.create_task(scheduler.acquire(second))
+        waiting = asyncio.create_task(scheduler.acquire(third))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        scheduler.release(first, False)
+        await asyncio.wait_for(waiting, timeout=1.0)
+        scheduler.release(third, False)
+        assert third.stats.turns == 1 and second.stats.turns == 0
+
+    async def test_shared_scheduler_is_per_loop(self) -> None:
+        """shared_scheduler should return the same scheduler on one loop."""
+        assert shared_scheduler() is shared_scheduler()
+
+
+class TestTerminalTurns:
+    """Test Terminal parsing output in scheduled turns."""
+
+    @staticmethod
+    def _terminal(
+        config: TerminalConfig,
+    ) -> tuple[Terminal, OutputQueue, Coroutine[Any, Any, None]]:
+        terminal = Terminal(command="/bin/sh", config=config)
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        queue = OutputQueue(config.output_budget)
+        emulator = MagicMock()
+        emulator.output_queue = queue
+        screen = ResponsiveScreen(80, 24, write_callback=lambda _data: None)
+        return terminal, queue, terminal._pump.run(emulator, pyte.ByteStream(screen), screen)
+
+    async def test_flood_yields_to_quiet_terminal(self) -> None:
+        """A quiet terminal should render while a flooding one is still parsing its backlog."""
+        config = TerminalConfig(turn_budget=0.001, catchup_threshold=1 << 30)
+        noisy, noisy_queue, noisy_loop = self._terminal(config)
+        quiet, quiet_queue, quiet_loop = self._terminal(config)
+        noisy_queue.put_nowait(["stdout", b"flood line\r\n" * 20_000])
+        noisy_queue.put_nowait(["disconnect", 1])
+        noisy_task = asyncio.create_task(noisy_loop)
+        await asyncio.sleep(0)
+        quiet_queue.put_nowait(["stdout", b"hello"])
+        quiet_queue.put_nowait(["disconnect", 1])
+        await asyncio.wait_for(quiet_loop, timeout=5.0)
+        assert not noisy_task.done()
+        assert quiet.render_line(0).text.startswith("hello")
+        await asyncio.wait_for(noisy_task, timeout=30.0)
+        stats = noisy.turn_stats
+        assert stats is not None
+        assert stats.bytes_fed == len(b"flood line\r\n") * 20_000
+        assert stats.turns > 10
+
+    async def test_unparsed_slices_count_against_output_budget(self) -> None:
+        """Output taken off the queue but still waiting for a turn should stay buffered."""
+        config = TerminalConfig(turn_budget=0.001, catchup_threshold=1 << 30)
+        terminal, queue, loop = self._terminal(config)
+        flood = b"flood line\r\n" * 20_000
+        queue.put_nowait(["stdout", flood])
+        queue.put_nowait(["disconnect", 1])
+        task = asyncio.create_task(loop)
+        await asyncio.sleep(0.01)
+        assert queue.empty()
+        assert 0 < queue.buffered_bytes < len(flood)
+        await asyncio.wait_for(task, timeout=30.0)
+        assert queue.buffered_bytes == 0
+
+    def test_scheduling_is_opt_in(self) -> None:
+        """The default config should parse without the scheduler."""
+        assert TerminalConfig().turn_budget is None
+
+    async def test_no_budget_means_no_turns(self) -> None:
+        """With turn_budget=None output should be parsed without the scheduler."""
+        terminal, queue, loop = self._terminal(TerminalConfig(turn_budget=None))
+        queue.put_nowait(["stdout", b"plain"])
+        queue.put_nowait(["disconnect", 1])
+        await loop
+        assert terminal.turn_stats is None
+        assert terminal.render_line(0).text.startswith("plain")
@@ -0,0 +1,137 @@
+"""Tests for scrollback capture and storage."""
+
+from __future__ import annotations
+
+import tracemalloc
+
+import pyte
+import pytest
+
+from textual_term._renderer import render_frozen_line
+from textual_term._screen import CompactScreen, ResponsiveScreen
+from textual_term._scrollback import Scrollback
+
+DEFAULT = ("default", "default", False, False, False, False, False, False)
+RED = ("red", "default", False, False, False, False, False, False)
+
+
+def _screen(
+    screen_class: type[ResponsiveScreen], scrollback: Scrollback, lines: int = 3
+) -> tuple[ResponsiveScreen, pyte.ByteStream]:
+    screen = screen_class(20, lines, write_callback=lambda _data: None, scrollback=scrollback)
+    return screen, pyte.ByteStream(screen)
+
+
+def _texts(scrollback: Scrollback) -> list[str]:
+    return [line.text for line in scrollback.lines(0, len(scrollback))]
+
+
+class TestScrollback:
+    """Test frozen line storage and eviction."""
+
+    def test_trailing_blanks_and_default_runs_are_not_stored(self) -> None:
+        """A plain line should be stored as stripped text without runs."""
+        scrollback = Scrollback()
+        scrollback.append("plain     ", [(10, DEFAULT)], DEFAULT)
+        line = scrollback.lines(0, 1)[0]
+        assert line.text == "plain"
+        assert line.runs == ()
+
+    def test_styled_runs_are_kept(self) -> None:
+        """Styled runs should be stored as (length, attributes) pairs."""
+        scrollback = Scrollback()
+        scrollback.append("red plain   ", [(3, RED), (9, DEFAULT)], DEFAULT)
+        line = scrollback.lines(0, 1)[0]
+        assert line.text == "red plain"
+        assert line.spans() == [(0, 3, RED)]
+
+    def test_attribute_tuples_are_shared(self) -> None:
+        """Equal attribute tuples from different lines should be one object."""
+        scrollback = Scrollback()
+        scrollback.append("a", [(1, tuple(RED))], DEFAULT)  # type: ignore[list-item]
+        scrollback.append("b", [(1, tuple(RED))], DEFAULT)  # type: ignore[list-item]
+        first, second = scrollback.lines(0, 2)
+        assert first.runs[1] is second.runs[1]
+
+    def test_line_budget_evicts_oldest(self) -> None:
+        """Only the newest max_lines lines should be kept."""
+        scrollback = Scrollback(max_lines=3)
+        for index in range(5):
+            scrollback.append(f"line {index}", [], DEFAULT)
+        assert _texts(scrollback) == ["line 2", "line 3", "line 4"]
+        assert scrollback.appended == 5
+
+    def test_byte_budget_evicts_oldest(self) -> None:
+        """Lines should be evicted once the approximate size exceeds max_bytes."""
+        scrollback = Scrollback(max_lines=100, max_bytes=20)
+        for index in range(5):
+            scrollback.append(f"line {index}!!", [], DEFAULT)
+        assert _texts(scrollback) == ["line 3!!", "line 4!!"]
+        assert scrollback.nbytes <= 20
+
+    def test_zero_lines_disables(self) -> None:
+        """max_lines=0 should store nothing."""
+        scrollback = Scrollback(max_lines=0)
+        scrollback.append("x", [], DEFAULT)
+        assert len(scrollback) == 0
+
+    def test_renders_to_strip(self) -> None:
+        """A frozen line should render with a segment per run, styling only the red one."""
+        scrollback = Scrollback()
+        scrollback.append("red plain", [(3, RED), (6, DEFAULT)], DEFAULT)
+        strip = render_frozen_line(scrollback.lines(0, 1)[0])
+        assert strip.text == "red plain"
+        assert [(segment.text, segment.style is None) for segment in strip] == [
+            ("red", False),
+            (" plain", True),
+        ]
+
+    def test_100k_lines_stay_small(self) -> None:
+        """100k lines of coloured 80-column output should take well under 40 MB."""
+        tracemalloc.start()
+        scrollback = Scrollback(max_lines=100_000)
+        for index in range(100_000):
+            text = f"{index:06d} " + "x" * 60 + " tail"
+            scrollback.append(text, [(6, RED), (61, DEFAULT), (5, RED)], DEFAULT)
+        current, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(scrollback) == 100_000
+        assert current < 40 * 1024 * 1024
+
+
+@pytest.mark.parametrize("screen_class", [ResponsiveScreen, CompactScreen])
+class TestScreenCapture:
+    """Test that screens save lines that scroll off the top."""
+
+    def test_scrolled_lines_are_saved(self, screen_class: type[ResponsiveScreen]) -> None:
+        """Lines pushed off the top by linefeeds should be appended in order."""
+        scrollback = Scrollback()
+        _screen_obj, stream = _screen(screen_class, scrollback)
+        stream.feed(b"".join(f"\x1b[31mline {i}\x1b[0m\r\n".encode() for i in range(6)))
+        assert _texts(scrollback) == ["line 0", "line 1", "line 2", "line 3"]
+        assert scrollback.lines(0, 1)[0].spans() == [(0, 6, RED)]
+
+    def test_scroll_region_below_top_not_saved(self, screen_class: type[ResponsiveScreen]) -> None:
+        """Scrolling a region that does not start at the top should not save lines."""
+        scrollback = Scrollback()
+        _screen_obj, stream = _screen(screen_class, scrollback, lines=5)
+        stream.feed(b"\x1b[2;5r\x1b[5;1H" + b"x\n" * 6)
+        assert len(scrollback) == 0
+
+    def test_alternate_screen_not_saved(self, screen_class: type[ResponsiveScreen]) -> None:
+        """Output scrolled while the alternate screen is active should not be saved."""
+        scrollback = Scrollback()
+        _screen_obj, stream = _screen(screen_class, scrollback)
+        stream.feed(b"\x1b[?1049h" + b"y\r\n" * 6)
+        assert len(scrollback) == 0
+        stream.feed(b"\x1b[?1049l" + b"z\r\n")
+        assert len(scrollback) == 1
+
+    def test_resize_saves_dropped_top_lines(self, screen_class: type[ResponsiveScreen]) -> None:
+        """Shrinking the screen should save the lines dropped from the top."""
+        scrollback = Scrollback()
+        screen, stream = _screen(screen_class, scrollback, lines=4)
+        stream.feed(b"a\r\nb\r\nc\r\nd")
+        screen.resize(2, 20)
+        assert _texts(scrollback) == ["a", "b"]
+        assert screen.display[0].rstrip() == "c"
@@ -0,0 +1,152 @@
+"""Tests for scrollback search and its index."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pyte
+
+from textual_term._renderer import SEARCH_CURRENT_STYLE, SEARCH_MATCH_STYLE
+from textual_term._screen import ResponsiveScreen
+from textual_term._scrollback import Scrollback
+from textual_term._search import BLOCK_LINES, SearchIndex, SearchMatch, compile_pattern
+from textual_term._widget import Terminal
+
+DEFAULT = ("default", "default", False, False, False, False, False, False)
+
+
+def _indexed_scrollback(lines: list[str], max_lines: int = 100_000) -> Scrollback:
+    scrollback = Scrollback(max_lines=max_lines, index=SearchIndex())
+    for text in lines:
+        scrollback.append(text, [], DEFAULT)
+    return scrollback
+
+
+class TestSearchIndex:
+    """Test block filtering and incremental indexing."""
+
+    def test_only_blocks_with_the_trigrams_are_candidates(self) -> None:
+        """A literal present in one block should only make that block a candidate."""
+        lines = [f"build step {index}" for index in range(BLOCK_LINES * 8)]
+        lines[BLOCK_LINES * 3 + 5] = "error: linker failed"
+        scrollback = _indexed_scrollback(lines)
+        assert scrollback._index is not None
+        ranges = scrollback._index.candidates("linker", 0, len(lines))
+        assert ranges == [(BLOCK_LINES * 3, BLOCK_LINES * 4)]
+
+    def test_unsealed_block_is_always_scanned(self) -> None:
+        """Lines in the block still being filled should be searchable at once."""
+        scrollback = _indexed_scrollback(["x"] * BLOCK_LINES + ["fresh needle"])
+        pattern = compile_pattern("needle", regex=False, ignore_case=False)
+        assert scrollback.find(pattern, "needle") == [SearchMatch(BLOCK_LINES, 6, 12)]
+
+    def test_short_literal_scans_everything(self) -> None:
+        """Patterns without a trigram cannot be filtered."""
+        index = SearchIndex()
+        assert index.candidates("ab", 0, 10) == [(0, 10)]
+
+    def test_ignore_case_uses_the_index(self) -> None:
+        """The index is case-insensitive, so ignore_case searches still find matches."""
+        lines = ["quiet"] * (BLOCK_LINES * 2)
+        lines[BLOCK_LINES + 1] = "WARNING: disk"
+        scrollback = _indexed_scrollback(lines)
+        pattern = compile_pattern("warning", regex=False, ignore_case=True)
+        assert scrollback.find(pattern, "warning") == [SearchMatch(BLOCK_LINES + 1, 0, 7)]
+
+    def test_line_numbers_survive_eviction(self) -> None:
+        """Matches should keep absolute line numbers after old lines are evicted."""
+        lines = [f"line {index}" for index in range(BLOCK_LINES * 3)]
+        scrollback = _indexed_scrollback(lines, max_lines=BLOCK_LINES)
+        pattern = compile_pattern(r"line 7\d\d$", regex=True, ignore_case=False)
+        matches = scrollback.find(pattern)
+        assert [match.line for match in matches] == list(range(700, BLOCK_LINES * 3))
+        assert scrollback.first_line == BLOCK_LINES * 2
+
+
+class TestTerminalSearch:
+    """Test searching a Terminal, navigation and highlighting."""
+
+    @staticmethod
+    def _terminal(history: int = 40) -> Terminal:
+        terminal = Terminal(command="/bin/sh")
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        screen = ResponsiveScreen(
+            20, 4, write_callback=lambda _data: None, scrollback=terminal.scrollback
+        )
+        terminal.search.attach(screen)
+        stream = pyte.ByteStream(screen)
+        stream.feed(b"".join(f"line {i}\r\n".encode() for i in range(history)))
+        stream.feed(b"line on screen")
+        terminal._pump.render_frame(screen)
+        return terminal
+
+    @staticmethod
+    def _backgrounds(terminal: Terminal, y: int) -> list[object]:
+        return [segment.style.bgcolor for segment in terminal.render_line(y) if segment.style]
+
+    def test_finds_matches_in_scrollback_and_screen(self) -> None:
+        """find() should report history and screen matches in line order."""
+        terminal = self._terminal()
+        matches = terminal.search.find("line 3")
+        assert [match.line for match in matches] == [3] + list(range(30, 40))
+        screen_matches = terminal.search.find("on screen")
+        assert screen_matches == [SearchMatch(terminal.scrollback.appended + 3, 5, 14)]
+
+    def test_navigation_scrolls_to_match(self) -> None:
+        """previous() should start at the newest match and scroll older ones into view."""
+        terminal = self._terminal()
+        terminal.search.find("line 1")
+        newest = terminal.search.previous()
+        assert newest is not None and newest.line == 19
+        oldest = terminal.search.next()
+        assert oldest is not None and oldest.line == 1
+        top = terminal.scrollback.appended - terminal.history.offset
+        assert top <= 1 < top + 4
+
+    def test_matches_are_highlighted(self) -> None:
+        """Visible matches should be highlighted and the current match stand out."""
+        terminal = self._terminal()
+        terminal.search.find("screen")
+        terminal.search.next()
+        assert SEARCH_CURRENT_STYLE.bgcolor in self._backgrounds(terminal, 3)
+        terminal.search.find("line")
+        assert SEARCH_MATCH_STYLE.bgcolor in self._backgrounds(terminal, 3)
+
+    def test_threaded_search_reads_under_worker_lock(self) -> None:
+        """With a lock attached, the scrollback and screen should be read holding it."""
+        terminal = self._terminal()
+        lock = threading.Lock()
+        screen = terminal.search._screen
+        assert screen is not None
+        terminal.search.attach(screen, lock)
+        held: list[bool] = []
+        find = terminal.scrollback.find
+        display = screen.display
+
+        def locked_find(*args: object) -> list[SearchMatch]:
+            held.append(lock.locked())
+            return find(*args)  # type: ignore[arg-type]
+
+        def locked_display() -> list[str]:
+            held.append(lock.locked())
+            return display
+
+        with (
+            patch.object(terminal.scrollback, "find", side_effect=locked_find),
+            patch.object(
+                ResponsiveScreen, "display", new_callable=PropertyMock, side_effect=locked_display
+            ),
+        ):
+            matches = terminal.search.find("line 3")
+        assert held == [True, True]
+        assert len(matches) == 11
+        assert not lock.locked()
+
+    def test_clear_search(self) -> None:
+        """clear() should drop results and highlighting."""
+        terminal = self._terminal()
+        terminal.search.find("line")
+        terminal.search.clear()
+        assert terminal.search.next() is None
+        assert SEARCH_MATCH_STYLE.bgcolor not in self._backgrounds(terminal, 3)
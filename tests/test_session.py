@@ -0,0 +1,63 @@
+"""Tests for the headless TerminalSession."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from textual_term._session import TerminalSession
+
+
+class TestSessionExit:
+    """Test the session once its child has gone, without a PTY."""
+
+    async def test_exit_fails_pending_waits(self) -> None:
+        """Closing the session should raise EOFError in waiters."""
+        session = TerminalSession("/bin/sh")
+        waiting = asyncio.ensure_future(session.wait_for_text("never"))
+        await asyncio.sleep(0)
+        session.stop()
+        with pytest.raises(EOFError):
+            await waiting
+
+
+class TestTerminalSession:
+    """Test driving real commands through the session."""
+
+    @pytest.mark.integration
+    async def test_send_and_wait_for_text(self) -> None:
+        """Text echoed by the shell should be waited for and matched."""
+        async with TerminalSession("/bin/sh") as session:
+            session.send("echo result=$((6 * 7))\n")
+            match = await session.wait_for_text(r"result=(\d+)", timeout=5.0, regex=True)
+            assert match.group(1) == "42"
+
+    @pytest.mark.integration
+    async def test_wait_for_text_times_out(self) -> None:
+        """A pattern that never appears should raise TimeoutError."""
+        async with TerminalSession("/bin/sh") as session:
+            with pytest.raises(TimeoutError, match="absent"):
+                await session.wait_for_text("absent", timeout=0.2)
+            assert session._watch._waiters == []
+
+    @pytest.mark.integration
+    async def test_wait_for_idle(self) -> None:
+        """wait_for_idle should return once the output stops, and time out while it flows."""
+        async with TerminalSession("/bin/sh") as session:
+            session.send("for i in 1 2 3 4 5; do echo tick $i; sleep 0.05; done\n")
+            await session.wait_for_text("tick 1", timeout=5.0)
+            with pytest.raises(TimeoutError):
+                await session.wait_for_idle(idle=0.2, timeout=0.1)
+            await session.wait_for_idle(idle=0.2, timeout=5.0)
+            assert "tick 5" in "\n".join(session.display)
+
+    @pytest.mark.integration
+    async def test_exit_is_reported(self) -> None:
+        """When the child exits, waits for missing text should raise EOFError."""
+        async with TerminalSession("/bin/sh") as session:
+            session.send("echo done; exit\n")
+            with pytest.raises(EOFError):
+                await session.wait_for_text("never printed", timeout=5.0)
+            assert session.exited
+            await session.wait_for_idle()
@@ -0,0 +1,149 @@
+"""Tests for the disk-spilled scrollback tier."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import tracemalloc
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from textual_term._config import TerminalConfig
+from textual_term._scrollback import FrozenLine, Scrollback
+from textual_term._spill import SpillFile
+from textual_term._widget import Terminal
+
+DEFAULT = ("default", "default", False, False, False, False, False, False)
+RED = ("red", "default", True, False, False, False, False, False)
+
+
+def _spilled_scrollback(tmp_path: Path, max_lines: int = 2) -> Scrollback:
+    return Scrollback(max_lines=max_lines, spill=SpillFile(str(tmp_path)))
+
+
+class TestSpillFile:
+    """Test writing lines to disk and reading them back."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Text and styled runs should survive a trip through the files."""
+        spill = SpillFile(str(tmp_path))
+        spill.append(FrozenLine("plain"))
+        spill.append(FrozenLine("red é 中文", (3, RED)))
+        assert spill.line(0).text == "plain"
+        assert spill.line(0).runs == ()
+        assert spill.line(1).text == "red é 中文"
+        assert spill.line(1).spans() == [(0, 3, RED)]
+        spill.close()
+
+    def test_reads_after_more_appends(self, tmp_path: Path) -> None:
+        """Lines appended after a read should be readable once remapped."""
+        spill = SpillFile(str(tmp_path))
+        spill.append(FrozenLine("first"))
+        assert spill.line(0).text == "first"
+        spill.append(FrozenLine("second"))
+        assert spill.line(1).text == "second"
+        spill.close()
+
+    def test_files_created_lazily_and_removed_on_close(self, tmp_path: Path) -> None:
+        """The directory should appear on the first append and vanish on close."""
+        spill = SpillFile(str(tmp_path))
+        assert spill.path is None
+        spill.append(FrozenLine("x"))
+        path = spill.path
+        assert path is not None and os.path.isdir(path)
+        spill.close()
+        assert not os.path.exists(path)
+        assert spill.count == 0
+
+    def test_append_after_close_is_refused(self, tmp_path: Path) -> None:
+        """A closed spill file should not create a new directory on append."""
+        spill = SpillFile(str(tmp_path))
+        spill.append(FrozenLine("x"))
+        spill.close()
+        with pytest.raises(ValueError, match="closed"):
+            spill.append(FrozenLine("late"))
+        assert not list(tmp_path.iterdir())
+
+    def test_clear_allows_new_appends(self, tmp_path: Path) -> None:
+        """clear() should delete the lines but keep the store usable."""
+        spill = SpillFile(str(tmp_path))
+        spill.append(FrozenLine("old"))
+        spill.clear()
+        spill.append(FrozenLine("new"))
+        assert spill.count == 1
+        assert spill.line(0).text == "new"
+        spill.close()
+
+
+class TestSpilledScrollback:
+    """Test Scrollback with an on-disk tier."""
+
+    def test_evicted_lines_are_spilled(self, tmp_path: Path) -> None:
+        """Lines evicted from memory should stay reachable in order."""
+        scrollback = _spilled_scrollback(tmp_path)
+        for index in range(5):
+            scrollback.append(f"line {index}", [(4, RED), (2, DEFAULT)], DEFAULT)
+        assert len(scrollback) == 5
+        assert scrollback.spill is not None and scrollback.spill.count == 3
+        lines = scrollback.lines(1, 4)
+        assert [line.text for line in lines] == ["line 1", "line 2", "line 3"]
+        assert lines[0].spans() == [(0, 4, RED)]
+        scrollback.close()
+
+    def test_history_is_not_held_in_memory(self, tmp_path: Path) -> None:
+        """Spilling 50k lines and reading a few back should not keep them in memory."""
+        scrollback = _spilled_scrollback(tmp_path, max_lines=100)
+        tracemalloc.start()
+        for index in range(50_000):
+            scrollback.append(f"{index:07d} " + "x" * 60, [(7, RED)], DEFAULT)
+        middle = scrollback.lines(25_000, 25_024)
+        current, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert middle[0].text.startswith("0025000")
+        assert current < 2 * 1024 * 1024
+        scrollback.close()
+
+    def test_terminal_stop_removes_files(self, tmp_path: Path) -> None:
+        """Terminal.stop() should delete the spill files."""
+        config = TerminalConfig(
+            scrollback_lines=1, scrollback_spill=True, scrollback_spill_dir=str(tmp_path)
+        )
+        terminal = Terminal(command="/bin/sh", config=config)
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        for index in range(3):
+            terminal.scrollback.append(f"line {index}", [], DEFAULT)
+        assert list(tmp_path.iterdir())
+        terminal.stop()
+        assert not list(tmp_path.iterdir())
+
+    def test_lines_evicted_after_close_are_dropped(self, tmp_path: Path) -> None:
+        """Appending to a closed scrollback should not spill to a new directory."""
+        scrollback = _spilled_scrollback(tmp_path)
+        for index in range(4):
+            scrollback.append(f"line {index}", [], DEFAULT)
+        scrollback.close()
+        for index in range(4):
+            scrollback.append(f"late {index}", [], DEFAULT)
+        assert not list(tmp_path.iterdir())
+        assert [line.text for line in scrollback.lines(0, len(scrollback))] == ["late 2", "late 3"]
+
+    @pytest.mark.integration
+    async def test_threaded_stop_leaves_no_files(self, tmp_path: Path) -> None:
+        """Stopping a threaded terminal mid-flood should not leave a spill directory behind."""
+        config = TerminalConfig(
+            threaded=True,
+            scrollback_lines=10,
+            scrollback_spill=True,
+            scrollback_spill_dir=str(tmp_path),
+        )
+        terminal = Terminal(command="yes", config=config)
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        terminal._terminal_size = MagicMock(return_value=(24, 80))  # type: ignore[method-assign]
+        terminal.start()
+        await asyncio.sleep(0.3)
+        assert list(tmp_path.iterdir())
+        terminal.stop()
+        await asyncio.sleep(0.1)
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,114 @@
+"""Tests for opt-in hot-path tracing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pyte
+import pytest
+
+from textual_term import _trace
+from textual_term._config import TerminalConfig
+from textual_term._emulator import PtyEmulator
+from textual_term._screen import ResponsiveScreen
+from textual_term._trace import Tracer, disable_tracing, dump_trace, enable_tracing
+from textual_term._widget import Terminal
+
+
+@pytest.fixture
+def tracer() -> Iterator[Tracer]:
+    """Tracing switched on for the test, and off again afterwards."""
+    yield enable_tracing()
+    disable_tracing()
+
+
+class TestTracer:
+    """Test the ring buffer and the Chrome trace export."""
+
+    def test_ring_keeps_newest_spans(self) -> None:
+        """Once full, the oldest spans should be overwritten and counted as dropped."""
+        tracer = Tracer(capacity=3)
+        for index in range(5):
+            tracer.record(f"span{index}", index, index + 0.5)
+        assert [event["name"] for event in tracer.events()] == ["span2", "span3", "span4"]
+        assert len(tracer) == 3
+        assert tracer.dropped == 2
+
+    def test_dump_writes_chrome_trace(self, tmp_path: Path) -> None:
+        """dump() should write complete events in microseconds plus track names."""
+        tracer = Tracer()
+        tracer.name_track(7, "Terminal /bin/sh")
+        tracer.record("feed", 1.0, 1.002, track=7, size=4096)
+        tracer.dump(str(tmp_path / "trace.json"))
+        trace = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+        spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert len(spans) == 1
+        assert spans[0]["name"] == "feed"
+        assert spans[0]["ts"] == pytest.approx(1_000_000)
+        assert spans[0]["dur"] == pytest.approx(2000)
+        assert spans[0]["args"] == {"bytes": 4096}
+        names = {
+            event["tid"]: event["args"]["name"]
+            for event in trace["traceEvents"]
+            if event["ph"] == "M"
+        }
+        assert names[7] == "Terminal /bin/sh"
+
+    def test_disabled_by_default(self, tmp_path: Path) -> None:
+        """Without the environment variable nothing is traced or dumped."""
+        assert _trace.tracer is None
+        assert not dump_trace(str(tmp_path / "trace.json"))
+        assert not (tmp_path / "trace.json").exists()
+
+    def test_environment_enables_and_dumps_at_exit(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """TEXTUAL_TERM_TRACE should enable tracing and register a dump at exit."""
+        registered = MagicMock()
+        monkeypatch.setattr(_trace.atexit, "register", registered)
+        monkeypatch.setenv(_trace.TRACE_ENV, str(tmp_path / "trace.json"))
+        monkeypatch.setenv(_trace.TRACE_EVENTS_ENV, "10")
+        _trace._enable_from_environment()
+        try:
+            assert _trace.tracer is not None
+            assert _trace.tracer.capacity == 10
+            callback, *args = registered.call_args.args
+            callback(*args)
+            assert json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+        finally:
+            disable_tracing()
+
+
+class TestTracedHotPath:
+    """Test the spans recorded by the emulator and the widget."""
+
+    async def test_recv_loop_spans(self, tracer: Tracer) -> None:
+        """A batch should record feed, render, refresh and recv_loop spans on the terminal's track."""
+        terminal = Terminal(command="/bin/sh", config=TerminalConfig(turn_budget=None))
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        screen = ResponsiveScreen(20, 4, write_callback=lambda _data: None)
+        queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
+        await queue.put(["stdout", b"hello"])
+        await queue.put(["disconnect", 1])
+        await terminal._pump.run(MagicMock(output_queue=queue), pyte.ByteStream(screen), screen)
+        events = tracer.events()
+        assert [event["name"] for event in events] == ["feed", "render", "refresh", "recv_loop"]
+        assert {event["tid"] for event in events} == {id(terminal)}
+        assert events[0]["args"] == {"bytes": 5}
+
+    @pytest.mark.integration
+    async def test_pty_reads_are_traced(self, tracer: Tracer) -> None:
+        """Each PTY read callback should record a pty.read span."""
+        emulator = PtyEmulator("/bin/sh", 24, 80)
+        emulator.open_pty()
+        emulator.start()
+        emulator.write_to_pty("echo TRACED\n")
+        deadline = asyncio.get_running_loop().time() + 5.0
+        while not tracer.events() and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.01)
+        emulator.stop()
+        assert tracer.events()[0]["name"] == "pty.read"
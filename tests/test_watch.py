@@ -0,0 +1,58 @@
+"""Tests for waiting on screen text with ScreenWatch."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pyte
+import pytest
+
+from textual_term._screen import ResponsiveScreen
+from textual_term._scrollback import Scrollback
+from textual_term._search import compile_pattern
+from textual_term._watch import ScreenWatch
+
+
+def _watch(rows: int, cols: int = 20) -> tuple[ScreenWatch, pyte.ByteStream]:
+    scrollback = Scrollback()
+    screen = ResponsiveScreen(cols, rows, lambda _data: None, scrollback=scrollback)
+    return ScreenWatch(screen, scrollback), pyte.ByteStream(screen)
+
+
+class TestIncrementalMatching:
+    """Test waits checked against dirty rows and scrolled-off lines."""
+
+    async def test_only_dirty_rows_are_read(self) -> None:
+        """After a one-row change, only that row's text should be built."""
+        watch, stream = _watch(rows=10)
+        stream.feed(b"\x1b[5;1Hsomething")
+        assert watch.search(compile_pattern("ready", False, False)) is None
+        waiting = asyncio.ensure_future(watch.wait(compile_pattern("ready", False, False), 5.0))
+        await asyncio.sleep(0)
+        row_text = ResponsiveScreen.row_text
+        with patch.object(ResponsiveScreen, "row_text", autospec=True, side_effect=row_text) as spy:
+            stream.feed(b"\x1b[3;1Hready")
+            watch.output(1.0)
+        assert [call.args[1] for call in spy.call_args_list] == [2]
+        assert (await waiting).group() == "ready"
+        assert watch._waiters == []
+
+    async def test_lines_scrolled_off_are_matched(self) -> None:
+        """Text that scrolls off the screen within one chunk should still be seen."""
+        watch, stream = _watch(rows=3)
+        waiting = asyncio.ensure_future(watch.wait(compile_pattern(r"^step 2\b", True, False), 5.0))
+        await asyncio.sleep(0)
+        stream.feed(b"".join(f"step {index}\r\n".encode() for index in range(10)))
+        watch.output(1.0)
+        assert (await waiting).string.startswith("step 2")
+
+    async def test_close_fails_pending_waits(self) -> None:
+        """Closing the watch should raise EOFError in waiters and end idle waits."""
+        watch, _stream = _watch(rows=3)
+        waiting = asyncio.ensure_future(watch.wait(compile_pattern("never", False, False), 5.0))
+        await asyncio.sleep(0)
+        watch.close("'sh' exited")
+        with pytest.raises(EOFError, match="'sh' exited before 'never' appeared"):
+            await waiting
+        await asyncio.wait_for(watch.idle(10.0, 10.0), timeout=1.0)
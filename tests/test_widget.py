@@ -5,11 +5,26 @@ from __future__ import annotations
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from textual.events import Key, Resize
-from textual.geometry import Size
+import pyte
+import pytest
+from textual.events import Key, MouseScrollDown, MouseScrollUp, Paste, Resize
+from textual.geometry import Region, Size
+from textual.strip import Strip
 
-from textual_term._renderer import TerminalRenderable
-from textual_term._widget import DEFAULT_COLS, DEFAULT_ROWS, Terminal
+from textual_term._config import TerminalConfig
+from textual_term._connection import TerminalConnection
+from textual_term._pump import OutputPush
+from textual_term._queue import OutputQueue
+from textual_term._screen import ResponsiveScreen
+from textual_term._widget import DEFAULT_COLS, DEFAULT_ROWS, MOUSE_SCROLL_LINES, Terminal
+
+
+def _connect(terminal: Terminal) -> MagicMock:
+    """Give terminal a mock connection, as if it had been started."""
+    connection = MagicMock(spec=TerminalConnection)
+    connection.emulator = MagicMock()
+    terminal._connection = connection
+    return connection
 
 
 class TestTerminalWidget:
@@ -21,24 +36,33 @@ class TestTerminalWidget:
         assert terminal._command == "/bin/sh"
 
     def test_initial_state(self) -> None:
-        """Terminal should start with no emulator or screen."""
+        """Terminal should start with no connection."""
         terminal = Terminal(command="/bin/sh")
-        assert terminal._emulator is None
-        assert terminal._screen is None
-        assert terminal._stream is None
+        assert terminal._connection is None
 
-    def test_render_returns_renderable(self) -> None:
-        """render() should return the current TerminalRenderable."""
+    def test_render_line_before_start_is_blank(self) -> None:
+        """render_line() should return a blank Strip until a frame is rendered."""
         terminal = Terminal(command="/bin/sh")
-        result = terminal.render()
-        assert isinstance(result, TerminalRenderable)
+        assert isinstance(terminal.render_line(0), Strip)
+        assert terminal.render_line(0).text.strip() == ""
+
+    def test_render_line_returns_cached_strips(self) -> None:
+        """render_line() should hand out the renderer's strips without rebuilding them."""
+        terminal = Terminal(command="/bin/sh")
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        screen = ResponsiveScreen(10, 3, write_callback=lambda _data: None)
+        pyte.ByteStream(screen).feed(b"hello")
+        terminal._pump.render_frame(screen)
+        first = terminal.render_line(0)
+        assert first.text == "hello     "
+        assert terminal.render_line(0) is first
+        assert terminal.render_line(5).text == ""
 
     def test_stop_without_start(self) -> None:
         """stop() should be safe to call when nothing is running."""
         terminal = Terminal(command="/bin/sh")
         terminal.stop()
-        assert terminal._emulator is None
-        assert terminal._recv_task is None
+        assert terminal._connection is None
 
     def test_default_constants(self) -> None:
         """Default terminal size constants should be defined."""
@@ -49,78 +73,44 @@ class TestTerminalWidget:
 class TestTerminalStart:
     """Test Terminal.start() lifecycle."""
 
-    @patch("textual_term._widget.asyncio.create_task")
-    @patch("textual_term._widget.pyte.Stream")
-    @patch("textual_term._widget.ResponsiveScreen")
-    @patch("textual_term._widget.PtyEmulator")
-    def test_start_creates_emulator_and_screen(
-        self,
-        mock_emulator_cls: MagicMock,
-        mock_screen_cls: MagicMock,
-        mock_stream_cls: MagicMock,
-        mock_create_task: MagicMock,
-    ) -> None:
-        """start() should create emulator, screen, stream and begin recv loop."""
+    @patch("textual_term._widget.TerminalConnection")
+    def test_start_opens_connection(self, mock_connection_cls: MagicMock) -> None:
+        """start() should open a connection sized to the widget and search its screen."""
         terminal = Terminal(command="/bin/sh")
-
-        mock_emulator = MagicMock()
-        mock_emulator_cls.return_value = mock_emulator
-        mock_screen = MagicMock()
-        mock_screen_cls.return_value = mock_screen
-        mock_stream = MagicMock()
-        mock_stream_cls.return_value = mock_stream
-        mock_create_task.return_value = MagicMock()
+        connection = mock_connection_cls.return_value
+        connection.worker = None
 
         with patch.object(Terminal, "size", new=property(lambda self: Size(80, 24))):
             terminal.start()
 
-        mock_emulator_cls.assert_called_once_with("/bin/sh", 24, 80)
-        mock_emulator.open_pty.assert_called_once()
-        mock_emulator.start.assert_called_once()
-        mock_screen_cls.assert_called_once_with(80, 24, write_callback=mock_emulator.write_to_pty)
-        mock_stream_cls.assert_called_once_with(mock_screen)
-        assert terminal._emulator is mock_emulator
-        assert terminal._screen is mock_screen
-        assert terminal._stream is mock_stream
+        mock_connection_cls.assert_called_once_with(
+            "/bin/sh", 24, 80, terminal._config, terminal.scrollback, terminal._pump
+        )
+        connection.start.assert_called_once()
+        assert terminal._connection is connection
+        assert terminal.search._screen is connection.screen
 
 
 class TestTerminalStop:
     """Test Terminal.stop() cleanup."""
 
-    def test_stop_cancels_recv_task(self) -> None:
-        """stop() should cancel the recv task."""
+    def test_stop_closes_connection(self) -> None:
+        """stop() should stop the connection and keep its emulator's metrics."""
         terminal = Terminal(command="/bin/sh")
-        mock_task = MagicMock()
-        terminal._recv_task = mock_task
-        terminal._emulator = MagicMock()
+        connection = _connect(terminal)
 
         terminal.stop()
 
-        mock_task.cancel.assert_called_once()
-        assert terminal._recv_task is None
-
-    def test_stop_stops_emulator(self) -> None:
-        """stop() should stop the emulator."""
-        terminal = Terminal(command="/bin/sh")
-        mock_emulator = MagicMock()
-        terminal._emulator = mock_emulator
-
-        terminal.stop()
-
-        mock_emulator.stop.assert_called_once()
-        assert terminal._emulator is None
+        connection.stop.assert_called_once()
+        assert terminal._connection is None
+        assert terminal._metrics.emulator is connection.emulator.metrics
 
 
 class TestTerminalRecvLoop:
-    """Test the _recv_loop coroutine."""
-
-    async def test_recv_loop_exits_when_no_emulator(self) -> None:
-        """_recv_loop should return immediately if emulator is None."""
-        terminal = Terminal(command="/bin/sh")
-        await terminal._recv_loop()
+    """Test the output pump's receive loop."""
 
     async def test_recv_loop_processes_stdout(self) -> None:
-        """_recv_loop should feed stdout data to the stream and refresh."""
+        """The receive loop should feed stdout data to the stream and refresh."""
         terminal = Terminal(command="/bin/sh")
         mock_emulator = MagicMock()
         mock_stream = MagicMock()
@@ -131,28 +121,32 @@ class TestTerminalRecvLoop:
         mock_screen.buffer = {
             0: {
                 0: MagicMock(
-                    data=" ", fg="default", bg="default", bold=False, italics=False, underscore=False, strikethrough=False, reverse=False
+                    data=" ",
+                    fg="default",
+                    bg="default",
+                    bold=False,
+                    italics=False,
+                    underscore=False,
+                    strikethrough=False,
+                    reverse=False,
                 )
             }
         }
 
         queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
-        await queue.put(["stdout", "hello"])
+        await queue.put(["stdout", b"hello"])
         await queue.put(["disconnect", 1])
         mock_emulator.output_queue = queue
 
-        terminal._emulator = mock_emulator
-        terminal._stream = mock_stream
-        terminal._screen = mock_screen
         terminal.refresh = MagicMock()
 
-        await terminal._recv_loop()
+        await terminal._pump.run(mock_emulator, mock_stream, mock_screen)
 
-        mock_stream.feed.assert_called_once_with("hello")
+        mock_stream.feed.assert_called_once_with(b"hello")
         terminal.refresh.assert_called_once()
 
     async def test_recv_loop_breaks_on_disconnect(self) -> None:
-        """_recv_loop should break when it receives a disconnect message."""
+        """The receive loop should break when it receives a disconnect message."""
         terminal = Terminal(command="/bin/sh")
         mock_emulator = MagicMock()
         mock_stream = MagicMock()
@@ -162,103 +156,421 @@ class TestTerminalRecvLoop:
         await queue.put(["disconnect", 1])
         mock_emulator.output_queue = queue
 
-        terminal._emulator = mock_emulator
-        terminal._stream = mock_stream
-        terminal._screen = mock_screen
-
-        await terminal._recv_loop()
+        await terminal._pump.run(mock_emulator, mock_stream, mock_screen)
         mock_stream.feed.assert_not_called()
 
+    async def test_recv_loop_coalesces_pending_chunks(self) -> None:
+        """All queued chunks should be fed before a single frame is rendered."""
+        terminal = Terminal(command="/bin/sh")
+        mock_emulator = MagicMock()
+        mock_stream = MagicMock()
+        queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
+        for chunk in ("a", "b", "c"):
+            await queue.put(["stdout", chunk])
+        await queue.put(["disconnect", 1])
+        mock_emulator.output_queue = queue
+
+        terminal._pump.render_frame = MagicMock()
+
+        await terminal._pump.run(mock_emulator, mock_stream, MagicMock())
+
+        assert [call.args[0] for call in mock_stream.feed.call_args_list] == ["a", "b", "c"]
+        terminal._pump.render_frame.assert_called_once()
+
+    async def test_recv_loop_caps_frame_rate(self) -> None:
+        """Output arriving within a frame interval should wait for the next frame."""
+        terminal = Terminal(command="/bin/sh", config=TerminalConfig(max_fps=20))
+        mock_emulator = MagicMock()
+        queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
+        await queue.put(["stdout", "first"])
+        mock_emulator.output_queue = queue
+
+        follow_ups = [["stdout", "second"], ["disconnect", 1]]
+
+        def enqueue_more(_screen: object) -> None:
+            queue.put_nowait(follow_ups.pop(0))
+
+        terminal._pump.render_frame = MagicMock(side_effect=enqueue_more)
+
+        with patch("textual_term._pump.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await terminal._pump.run(mock_emulator, MagicMock(), MagicMock())
+
+        assert terminal._pump.render_frame.call_count == 2
+        mock_sleep.assert_awaited_once()
+        assert 0 < mock_sleep.await_args.args[0] <= 0.05
+
+    def test_invalid_max_fps(self) -> None:
+        """A non-positive max_fps should be rejected."""
+        with pytest.raises(ValueError):
+            TerminalConfig(max_fps=0)
+
+    async def test_recv_loop_defers_frames_while_catching_up(self) -> None:
+        """Over the catch-up threshold, frames are skipped while more output is queued."""
+        terminal = Terminal(command="/bin/sh", config=TerminalConfig(catchup_threshold=4))
+        terminal._pump.catchup.max_frame_age = float("inf")
+        mock_emulator = MagicMock()
+        queue: asyncio.Queue[list] = asyncio.Queue()  # pyright: ignore[reportMissingTypeArgument]
+        await queue.put(["stdout", b"backlog!"])
+        mock_emulator.output_queue = queue
+        stream = MagicMock()
+
+        def refill(_data: bytes) -> None:
+            if stream.feed.call_count == 1:
+                queue.put_nowait(["stdout", b"big batch"])
+            elif stream.feed.call_count == 2:
+                queue.put_nowait(["stdout", b"ok"])
+                queue.put_nowait(["disconnect", 1])
+
+        stream.feed.side_effect = refill
+        terminal._pump.render_frame = MagicMock()
+
+        await terminal._pump.run(mock_emulator, stream, MagicMock())
+
+        assert stream.feed.call_count == 3
+        terminal._pump.render_frame.assert_called_once()
+
+
+class TestOutputPush:
+    """Test the pump driven from output callbacks instead of a task."""
+
+    @staticmethod
+    def _push(
+        config: TerminalConfig | None = None,
+    ) -> tuple[Terminal, OutputQueue, MagicMock, OutputPush]:
+        terminal = Terminal(command="/bin/sh", config=config)
+        terminal._pump.render_frame = MagicMock()  # type: ignore[method-assign]
+        queue = OutputQueue(1_000_000)
+        stream = MagicMock()
+        return terminal, queue, stream, terminal._pump.push(queue, stream, MagicMock())
+
+    async def test_wakes_drain_once(self) -> None:
+        """Several wakes before the drain runs should feed all their output as one batch."""
+        terminal, queue, stream, push = self._push()
+        for chunk in (b"a", b"b", b"c"):
+            queue.put_nowait(["stdout", chunk])
+            push.wake()
+        await asyncio.sleep(0)
+        assert [call.args[0] for call in stream.feed.call_args_list] == [b"a", b"b", b"c"]
+        terminal._pump.render_frame.assert_called_once()  # type: ignore[attr-defined]
+        push.close()
+
+    async def test_caps_frame_rate(self) -> None:
+        """Output within a frame interval should be fed and rendered by one timer at the next frame."""
+        terminal, queue, stream, push = self._push(TerminalConfig(max_fps=20))
+        render_frame: MagicMock = terminal._pump.render_frame  # type: ignore[assignment]
+        for chunk in (b"first", b"second", b"third"):
+            queue.put_nowait(["stdout", chunk])
+            push.wake()
+            await asyncio.sleep(0)
+        assert render_frame.call_count == 1
+        assert stream.feed.call_count == 2
+        await asyncio.sleep(0.06)
+        assert stream.feed.call_count == 3
+        assert render_frame.call_count == 2
+        assert terminal._metrics.frames_coalesced == 1
+        push.close()
+
+    async def test_catching_up_defers_frames(self) -> None:
+        """While catching up, a frame should be skipped if more output arrives meanwhile."""
+        terminal, queue, stream, push = self._push(TerminalConfig(catchup_threshold=4))
+        terminal._pump.catchup.max_frame_age = float("inf")
+        queue.put_nowait(["stdout", b"backlog"])
+        push.drain()
+        queue.put_nowait(["stdout", b"more"])
+        await asyncio.sleep(0)
+        terminal._pump.render_frame.assert_not_called()  # type: ignore[attr-defined]
+        assert terminal._metrics.frames_coalesced == 1
+        await asyncio.sleep(0)
+        assert stream.feed.call_count == 2
+        push.close()
+
+    async def test_disconnect_renders_and_closes(self) -> None:
+        """A disconnect should render what is pending at once and stop the push."""
+        terminal, queue, stream, push = self._push(TerminalConfig(max_fps=20))
+        queue.put_nowait(["stdout", b"first"])
+        push.drain()
+        queue.put_nowait(["stdout", b"last"])
+        queue.put_nowait(["disconnect", 1])
+        push.drain()
+        assert terminal._pump.render_frame.call_count == 2  # type: ignore[attr-defined]
+        queue.put_nowait(["stdout", b"after"])
+        push.drain()
+        assert stream.feed.call_count == 2
+
+
+class TestByteIngestion:
+    """Test that raw PTY bytes are decoded incrementally by the stream."""
+
+    SAMPLE = "aé中文😀ñz"
+
+    @staticmethod
+    def _display(chunks: list[bytes]) -> str:
+        terminal = Terminal(command="/bin/sh")
+        screen = ResponsiveScreen(20, 1, write_callback=lambda _data: None)
+        stream = pyte.ByteStream(screen)
+        for chunk in chunks:
+            terminal._pump.feed_chunks(stream, [chunk])
+        return "".join(screen.display)
+
+    def test_every_split_point_decodes_cleanly(self) -> None:
+        """Splitting the byte stream at any offset should not corrupt multibyte characters."""
+        data = self.SAMPLE.encode("utf-8")
+        expected = self._display([data])
+        assert "\ufffd" not in expected
+        for split in range(1, len(data)):
+            assert self._display([data[:split], data[split:]]) == expected
+
+    def test_byte_at_a_time_decodes_cleanly(self) -> None:
+        """Feeding one byte per read should produce the same screen as one read."""
+        data = self.SAMPLE.encode("utf-8")
+        assert self._display([data[i : i + 1] for i in range(len(data))]) == self._display([data])
+
 
 class TestTerminalOnKey:
     """Test the on_key handler."""
 
-    async def test_on_key_no_emulator(self) -> None:
+    def test_on_key_no_emulator(self) -> None:
         """on_key should return early if no emulator is set."""
         terminal = Terminal(command="/bin/sh")
         event = MagicMock(spec=Key)
-        await terminal.on_key(event)
+        terminal.on_key(event)
         event.stop.assert_not_called()
 
-    async def test_on_key_translates_and_sends(self) -> None:
-        """on_key should translate the key and put it on the input queue."""
+    def test_on_key_translates_and_sends(self) -> None:
+        """on_key should translate the key and send it to the connection."""
         terminal = Terminal(command="/bin/sh")
-        mock_emulator = MagicMock()
-        mock_emulator.input_queue = AsyncMock()
-        terminal._emulator = mock_emulator
+        connection = _connect(terminal)
 
         event = MagicMock(spec=Key)
         event.key = "enter"
         event.character = "\r"
 
         with patch("textual_term._widget.translate_key", return_value="\r"):
-            await terminal.on_key(event)
+            terminal.on_key(event)
 
         event.stop.assert_called_once()
-        mock_emulator.input_queue.put.assert_called_once_with(["stdin", "\r"])
+        connection.send.assert_called_once_with("\r", event.time)
 
-    async def test_on_key_untranslatable(self) -> None:
+    def test_on_key_untranslatable(self) -> None:
         """on_key should not send anything if translate_key returns None."""
         terminal = Terminal(command="/bin/sh")
-        mock_emulator = MagicMock()
-        mock_emulator.input_queue = AsyncMock()
-        terminal._emulator = mock_emulator
+        connection = _connect(terminal)
 
         event = MagicMock(spec=Key)
         event.key = "unknown"
         event.character = None
 
         with patch("textual_term._widget.translate_key", return_value=None):
-            await terminal.on_key(event)
+            terminal.on_key(event)
 
         event.stop.assert_called_once()
-        mock_emulator.input_queue.put.assert_not_called()
+        connection.send.assert_not_called()
 
 
-class TestTerminalOnResize:
-    """Test the on_resize handler."""
+class TestTerminalOnPaste:
+    """Test the on_paste handler."""
 
-    async def test_on_resize_updates_screen(self) -> None:
-        """on_resize should resize the screen and notify the emulator."""
+    def test_paste_goes_to_connection(self) -> None:
+        """on_paste should hand the pasted text to the connection and return to live."""
         terminal = Terminal(command="/bin/sh")
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        connection = _connect(terminal)
+        terminal.history.scroll(1)
+        event = MagicMock(spec=Paste)
+        event.text = "echo hi"
+        terminal.on_paste(event)
+        event.stop.assert_called_once()
+        connection.paste.assert_called_once_with("echo hi", event.time)
+        assert terminal.history.offset == 0
 
-        mock_screen = MagicMock()
-        mock_screen.lines = 24
-        mock_screen.columns = 80
-        mock_emulator = MagicMock()
-        mock_emulator.input_queue = AsyncMock()
-        terminal._screen = mock_screen
-        terminal._emulator = mock_emulator
+    def test_paste_without_emulator_is_ignored(self) -> None:
+        """on_paste should do nothing before the PTY is started."""
+        terminal = Terminal(command="/bin/sh")
+        event = MagicMock(spec=Paste)
+        terminal.on_paste(event)
+        event.stop.assert_not_called()
 
-        event = MagicMock(spec=Resize)
-        with patch.object(Terminal, "size", new=property(lambda self: Size(120, 40))):
-            await terminal.on_resize(event)
 
-        mock_screen.resize.assert_called_once_with(40, 120)
-        mock_emulator.input_queue.put.assert_called_once_with(["resize", 40, 120])
+class TestTerminalHistory:
+    """Test scrolling the view back into the scrollback."""
 
-    async def test_on_resize_no_change(self) -> None:
-        """on_resize should not resize if dimensions are unchanged."""
+    @staticmethod
+    def _terminal() -> tuple[Terminal, pyte.ByteStream]:
         terminal = Terminal(command="/bin/sh")
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        screen = ResponsiveScreen(
+            10, 3, write_callback=lambda _data: None, scrollback=terminal.scrollback
+        )
+        stream = pyte.ByteStream(screen)
+        stream.feed(b"".join(f"line {i}\r\n".encode() for i in range(6)))
+        terminal._pump.render_frame(screen)
+        return terminal, stream
+
+    @staticmethod
+    def _visible(terminal: Terminal) -> list[str]:
+        return [terminal.render_line(y).text.rstrip() for y in range(3)]
+
+    def test_scrolling_back_shows_saved_lines(self) -> None:
+        """Scrolling back should show scrollback lines above the top of the screen."""
+        terminal, _stream = self._terminal()
+        terminal.history.scroll(2)
+        assert terminal.history.offset == 2
+        assert self._visible(terminal) == ["line 2", "line 3", "line 4"]
+
+    def test_offset_is_clamped(self) -> None:
+        """The offset should stay between 0 and the scrollback length."""
+        terminal, _stream = self._terminal()
+        terminal.history.scroll(100)
+        assert terminal.history.offset == len(terminal.scrollback) == 4
+        assert self._visible(terminal) == ["line 0", "line 1", "line 2"]
+        terminal.history.scroll(-100)
+        assert terminal.history.offset == 0
+
+    def test_view_stays_put_while_output_arrives(self) -> None:
+        """New output should not move a view that is scrolled back."""
+        terminal, stream = self._terminal()
+        terminal.history.scroll(3)
+        before = self._visible(terminal)
+        stream.feed(b"more\r\nmore\r\n")
+        terminal._pump.render_frame(stream.listener)  # type: ignore[arg-type]
+        assert self._visible(terminal) == before
+        assert terminal.history.offset == 5
+
+    def test_shift_page_keys_scroll(self) -> None:
+        """shift+pageup should scroll back a page without writing to the PTY."""
+        terminal, _stream = self._terminal()
+        connection = _connect(terminal)
+        event = MagicMock(spec=Key)
+        event.key = "shift+pageup"
+        terminal.on_key(event)
+        assert terminal.history.offset == 2
+        connection.send.assert_not_called()
+
+    def test_typing_returns_to_live_screen(self) -> None:
+        """A key sent to the PTY should return the view to the live screen."""
+        terminal, _stream = self._terminal()
+        _connect(terminal)
+        terminal.history.scroll(2)
+        event = MagicMock(spec=Key)
+        event.key = "a"
+        event.character = "a"
+        terminal.on_key(event)
+        assert terminal.history.offset == 0
 
-        mock_screen = MagicMock()
-        mock_screen.lines = 24
-        mock_screen.columns = 80
-        terminal._screen = mock_screen
+    def test_mouse_wheel_scrolls(self) -> None:
+        """The mouse wheel should scroll the history by a few lines."""
+        terminal, _stream = self._terminal()
+        terminal._scroll_history(MagicMock(spec=MouseScrollUp))
+        assert terminal.history.offset == MOUSE_SCROLL_LINES
+        terminal._scroll_history(MagicMock(spec=MouseScrollDown))
+        assert terminal.history.offset == 0
+
+
+class TestTerminalRefreshRegions:
+    """Test that frames only repaint the rows that changed."""
+
+    @staticmethod
+    def _terminal() -> tuple[Terminal, ResponsiveScreen, pyte.ByteStream]:
+        terminal = Terminal(command="/bin/sh")
+        terminal.refresh = MagicMock()  # type: ignore[method-assign]
+        screen = ResponsiveScreen(
+            10, 4, write_callback=lambda _data: None, scrollback=terminal.scrollback
+        )
+        stream = pyte.ByteStream(screen)
+        terminal._pump.render_frame(screen)
+        terminal.refresh.reset_mock()
+        return terminal, screen, stream
+
+    def test_echo_refreshes_one_row(self) -> None:
+        """A character echoed on one row should refresh only that row."""
+        terminal, screen, stream = self._terminal()
+        stream.feed(b"\x1b[3;1Hx")
+        terminal._pump.render_frame(screen)
+        terminal.refresh.assert_called_once_with(Region(0, 2, terminal.size.width, 1))
+
+    def test_consecutive_rows_merge(self) -> None:
+        """Adjacent changed rows should be refreshed as one region."""
+        terminal, screen, stream = self._terminal()
+        stream.feed(b"a\r\nb\r\n\x1b[4;1Hd")
+        terminal._pump.render_frame(screen)
+        width = terminal.size.width
+        terminal.refresh.assert_called_once_with(Region(0, 0, width, 2), Region(0, 3, width, 1))
+
+    def test_unchanged_frame_does_not_refresh(self) -> None:
+        """A frame with no dirty rows should not repaint anything."""
+        terminal, screen, _stream = self._terminal()
+        terminal._pump.render_frame(screen)
+        terminal.refresh.assert_not_called()
+
+    def test_cursor_move_refreshes_two_rows(self) -> None:
+        """Moving the focused cursor should repaint only the rows it left and entered."""
+        terminal, screen, stream = self._terminal()
+        terminal.has_focus = True
+        terminal._pump.render_frame(screen)
+        terminal.refresh.reset_mock()
+        before = list(terminal._display._live_lines)
+        stream.feed(b"\x1b[3;5H")
+        terminal._pump.render_frame(screen)
+        width = terminal.size.width
+        terminal.refresh.assert_called_once_with(Region(0, 0, width, 1), Region(0, 2, width, 1))
+        assert all(new is old for new, old in zip(terminal._display._live_lines, before))
+        assert terminal.render_line(2).text == terminal._display._live_lines[2].text
+
+    def test_focus_change_redraws_cursor_row_only(self) -> None:
+        """Losing focus should hide the cursor without rebuilding other rows."""
+        terminal, screen, stream = self._terminal()
+        stream.feed(b"\x1b[2;3H")
+        terminal.has_focus = True
+        terminal._pump.render_frame(screen)
+        others = [terminal.render_line(y) for y in (0, 2, 3)]
+        assert any(segment.style and segment.style.reverse for segment in terminal.render_line(1))
+        terminal.refresh.reset_mock()
+        terminal.has_focus = False
+        terminal._show_cursor()
+        terminal.refresh.assert_called_once_with(Region(0, 1, terminal.size.width, 1))
+        assert all(terminal.render_line(y) is old for y, old in zip((0, 2, 3), others))
+        assert terminal.render_line(1) is terminal._display._live_lines[1]
+
+    def test_resize_refreshes_everything(self) -> None:
+        """A change in the number of rows should refresh the whole widget."""
+        terminal, screen, _stream = self._terminal()
+        screen.resize(6, 10)
+        terminal._pump.render_frame(screen)
+        terminal.refresh.assert_called_once_with()
+
+    def test_scrolled_back_view_ignores_output(self) -> None:
+        """Output arriving while the view shows only history should not repaint it."""
+        terminal, screen, stream = self._terminal()
+        stream.feed(b"".join(f"line {i}\r\n".encode() for i in range(10)))
+        terminal._pump.render_frame(screen)
+        terminal.history.scroll(5)
+        terminal.refresh.reset_mock()
+        stream.feed(b"more\r\n")
+        terminal._pump.render_frame(screen)
+        terminal.refresh.assert_not_called()
+
+
+class TestTerminalOnResize:
+    """Test the on_resize handler."""
+
+    def test_on_resize_resizes_connection(self) -> None:
+        """on_resize should resize the connection to the widget's new size."""
+        terminal = Terminal(command="/bin/sh")
+        connection = _connect(terminal)
 
         event = MagicMock(spec=Resize)
-        with patch.object(Terminal, "size", new=property(lambda self: Size(80, 24))):
-            await terminal.on_resize(event)
+        with patch.object(Terminal, "size", new=property(lambda self: Size(120, 40))):
+            terminal.on_resize(event)
 
-        mock_screen.resize.assert_not_called()
+        connection.resize.assert_called_once_with(40, 120)
 
-    async def test_on_resize_no_screen(self) -> None:
-        """on_resize should be safe when no screen exists."""
+    def test_on_resize_no_connection(self) -> None:
+        """on_resize should be safe before the terminal is started."""
         terminal = Terminal(command="/bin/sh")
 
         event = MagicMock(spec=Resize)
         with patch.object(Terminal, "size", new=property(lambda self: Size(120, 40))):
-            await terminal.on_resize(event)
+            terminal.on_resize(event)
 
 
 class TestTerminalSize:
@@ -0,0 +1,117 @@
+"""Tests for the off-loop parser worker."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+import pyte
+from textual.strip import Strip
+
+from textual_term._catchup import CatchUpPolicy
+from textual_term._renderer import ScreenRenderer
+from textual_term._screen import ResponsiveScreen
+from textual_term._worker import ParserWorker
+
+
+def _make_worker(
+    frames: list[list[Strip]],
+    frame_interval: float = 0.0,
+    cursors: list[tuple[int, int]] | None = None,
+) -> tuple[ParserWorker, ResponsiveScreen]:
+    screen = ResponsiveScreen(20, 3, write_callback=lambda _data: None)
+    stream = pyte.ByteStream(screen)
+
+    def on_frame(lines: list[Strip], cursor: tuple[int, int]) -> None:
+        frames.append(lines)
+        if cursors is not None:
+            cursors.append(cursor)
+
+    worker = ParserWorker(
+        stream, screen, ScreenRenderer(), frame_interval, CatchUpPolicy(1 << 20), on_frame
+    )
+    return worker, screen
+
+
+async def _wait_until(condition: Callable[[], object], timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+class TestParserWorker:
+    """Test ParserWorker parsing, framing and resizing."""
+
+    async def test_feed_posts_rendered_frame(self) -> None:
+        """Fed output should be parsed on the worker and posted as rendered lines."""
+        frames: list[list[Strip]] = []
+        worker, _screen = _make_worker(frames)
+        worker.start()
+        worker.feed(b"hello")
+        await _wait_until(lambda: frames and "hello" in frames[-1][0].text)
+        worker.stop()
+        assert worker.backlog.pending == 0
+
+    async def test_frame_carries_cursor_position(self) -> None:
+        """Each frame should be posted with the cursor position it was rendered at."""
+        frames: list[list[Strip]] = []
+        cursors: list[tuple[int, int]] = []
+        worker, _screen = _make_worker(frames, cursors=cursors)
+        worker.start()
+        worker.feed(b"ab\r\ncd")
+        await _wait_until(lambda: cursors and cursors[-1] == (2, 1))
+        worker.stop()
+        assert "cd" in frames[-1][1].text
+
+    async def test_frames_are_rate_limited(self) -> None:
+        """A burst of chunks within one frame interval should post few frames."""
+        frames: list[list[Strip]] = []
+        worker, _screen = _make_worker(frames, frame_interval=0.2)
+        worker.start()
+        for index in range(50):
+            worker.feed(f"{index} ".encode())
+        await _wait_until(lambda: frames and "49" in "".join(line.text for line in frames[-1]))
+        worker.stop()
+        assert len(frames) <= 3
+
+    async def test_resize_applied_on_worker(self) -> None:
+        """Queued resizes should change the screen size and the rendered frame."""
+        frames: list[list[Strip]] = []
+        worker, screen = _make_worker(frames)
+        worker.start()
+        worker.resize(5, 30)
+        worker.feed(b"x")
+        await _wait_until(lambda: frames and len(frames[-1]) == 5)
+        worker.stop()
+        assert screen.columns == 30
+
+    async def test_backlog_wait(self) -> None:
+        """Waiting on the backlog should return once the worker has parsed it."""
+        frames: list[list[Strip]] = []
+        worker, _screen = _make_worker(frames)
+        worker.start()
+        worker.feed(b"y" * 100_000)
+        await asyncio.wait_for(worker.backlog.wait(0), timeout=2.0)
+        worker.stop()
+        assert worker.backlog.pending == 0
+
+    async def test_stop_ends_thread(self) -> None:
+        """stop() should return only once the worker thread has exited."""
+        frames: list[list[Strip]] = []
+        worker, _screen = _make_worker(frames)
+        worker.start()
+        thread = worker._thread
+        assert thread is not None
+        worker.stop()
+        assert not thread.is_alive()
+
+    async def test_stop_drops_unparsed_backlog(self) -> None:
+        """Output still queued when stop() is called should not be parsed."""
+        frames: list[list[Strip]] = []
+        worker, _screen = _make_worker(frames)
+        worker.start()
+        for _ in range(200):
+            worker.feed(b"backlog line\r\n" * 1000)
+        worker.stop()
+        assert worker.backlog.pending > 0
@@ -0,0 +1,106 @@
+"""Tests for the non-blocking buffered PTY writer."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+from textual_term._pty import read_some
+from textual_term._reactor import LoopPoller
+from textual_term._writer import PtyWriter
+
+
+def _pipe() -> tuple[int, int]:
+    """Return a non-blocking pipe to write into instead of a PTY."""
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.set_blocking(write_fd, False)
+    return read_fd, write_fd
+
+
+class TestPtyWriter:
+    """Test the outbound buffer and its writability callback."""
+
+    async def test_short_writes_are_buffered_and_flushed(self) -> None:
+        """Input larger than the pipe should be buffered, then flushed as it is read."""
+        read_fd, write_fd = _pipe()
+        writer = PtyWriter(write_fd, LoopPoller())
+        data = "".join(f"{index:07d}\n" for index in range(40_000)).encode()
+        writer.write(data)
+        assert 0 < writer.pending_bytes < len(data)
+        received = bytearray()
+        for _ in range(500):
+            await asyncio.sleep(0.001)
+            received += read_some(read_fd) or b""
+            if writer.pending_bytes == 0 and len(received) == len(data):
+                break
+        assert received == data
+        assert not writer._writing
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_writes_keep_order_while_buffered(self) -> None:
+        """Writes made while earlier input is still buffered should queue behind it."""
+        read_fd, write_fd = _pipe()
+        writer = PtyWriter(write_fd, LoopPoller())
+        writer.write(b"a" * 100_000)
+        writer.write(b"END")
+        received = bytearray()
+        while writer.pending_bytes:
+            await asyncio.sleep(0.001)
+            received += read_some(read_fd) or b""
+        received += read_some(read_fd) or b""
+        assert received.endswith(b"a" * 10 + b"END")
+        assert len(received) == 100_003
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_outbound_is_bounded_by_chunk_size(self) -> None:
+        """A large write should be moved to the outbound buffer a chunk at a time."""
+        read_fd, write_fd = _pipe()
+        writer = PtyWriter(write_fd, LoopPoller(), chunk_size=16_384)
+        data = b"p" * 1_000_000
+        writer.write(data)
+        received = bytearray()
+        peak = 0
+        for _ in range(5000):
+            peak = max(peak, len(writer._outbound))
+            received += read_some(read_fd) or b""
+            if len(received) == len(data):
+                break
+            await asyncio.sleep(0)
+        assert received == data
+        assert peak <= 16_384
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_latency_is_recorded_once_written(self) -> None:
+        """A timed write should be reported when its last byte reaches the fd, not before."""
+        read_fd, write_fd = _pipe()
+        latencies: list[float] = []
+        writer = PtyWriter(write_fd, LoopPoller(), on_written=latencies.append)
+        writer.write(b"a" * 200_000, time.monotonic())
+        assert latencies == []
+        writer.write(b"untimed")
+        while writer.pending_bytes:
+            await asyncio.sleep(0.001)
+            read_some(read_fd)
+        assert len(latencies) == 1
+        assert latencies[0] > 0
+        os.close(read_fd)
+        os.close(write_fd)
+
+    async def test_close_releases_waiter(self) -> None:
+        """wait() should return when the writer is closed, dropping what is buffered."""
+        read_fd, write_fd = _pipe()
+        writer = PtyWriter(write_fd, LoopPoller())
+        writer.write(b"z" * 200_000)
+        waiter = asyncio.create_task(writer.wait())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        writer.close()
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert writer.pending_bytes == 0
+        os.close(read_fd)
+        os.close(write_fd)